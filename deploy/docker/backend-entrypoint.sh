@@ -2,8 +2,10 @@
 set -eu
 
 python manage.py migrate --noinput
+python manage.py createcachetable
 python manage.py collectstatic --noinput
 
-exec gunicorn nexus.wsgi:application \
+exec gunicorn nexus.asgi:application \
+  --worker-class uvicorn_worker.UvicornWorker \
   --bind 0.0.0.0:8000 \
   --workers "${GUNICORN_WORKERS:-2}"
@@ -108,6 +108,8 @@ done < "${APP_DIR}/.env"
 
 sudo -u "${APP_USER}" env "${ENV_ARGS[@]}" \
     "${APP_DIR}/.venv/bin/python" "${APP_DIR}/manage.py" migrate --noinput
+sudo -u "${APP_USER}" env "${ENV_ARGS[@]}" \
+    "${APP_DIR}/.venv/bin/python" "${APP_DIR}/manage.py" createcachetable
 sudo -u "${APP_USER}" env "${ENV_ARGS[@]}" \
     "${APP_DIR}/.venv/bin/python" "${APP_DIR}/manage.py" collectstatic --noinput
 
@@ -115,6 +117,9 @@ sudo -u "${APP_USER}" env "${ENV_ARGS[@]}" \
 
 info "Installing config files"
 cp "${APP_DIR}/deploy/nexus.service" /etc/systemd/system/nexus.service
+cp "${APP_DIR}/deploy/nexus-worker.service" /etc/systemd/system/nexus-worker.service
+cp "${APP_DIR}/deploy/nexus-catch-up.service" /etc/systemd/system/nexus-catch-up.service
+cp "${APP_DIR}/deploy/nexus-catch-up.timer" /etc/systemd/system/nexus-catch-up.timer
 cp "${APP_DIR}/deploy/litestream.yml" /etc/litestream.yml
 cp "${APP_DIR}/deploy/litestream.service" /etc/systemd/system/litestream.service
 cp "${APP_DIR}/deploy/auto-update.service" /etc/systemd/system/auto-update.service
@@ -139,6 +144,7 @@ ufw --force enable
 info "Enabling and starting services"
 systemctl enable --now litestream
 systemctl enable --now nexus
+systemctl enable --now nexus-worker
 systemctl enable --now caddy
 systemctl enable --now auto-update.timer
 
@@ -152,4 +158,6 @@ echo "  2. Get your hostname: tailscale status"
 echo "  3. Run: bash /opt/nexus/deploy/configure-caddy.sh <hostname>.your-tailnet.ts.net"
 echo "  4. Configure R2 credentials in /opt/nexus/.env for Litestream backups"
 echo "  5. Restart Litestream: systemctl restart litestream"
+echo "  6. Optional: catch up overdue recurring tasks every morning:"
+echo "     systemctl enable --now nexus-catch-up.timer"
 echo ""
@@ -35,11 +35,29 @@ done < "${APP_DIR}/.env"
 
 sudo -u "${APP_USER}" env "${ENV_ARGS[@]}" \
     "${APP_DIR}/.venv/bin/python" "${APP_DIR}/manage.py" migrate --noinput
+sudo -u "${APP_USER}" env "${ENV_ARGS[@]}" \
+    "${APP_DIR}/.venv/bin/python" "${APP_DIR}/manage.py" createcachetable
 sudo -u "${APP_USER}" env "${ENV_ARGS[@]}" \
     "${APP_DIR}/.venv/bin/python" "${APP_DIR}/manage.py" collectstatic --noinput
 
+info "Installing app service"
+# Picks up changes to how the app is served (it runs under ASGI).
+cp "${APP_DIR}/deploy/nexus.service" /etc/systemd/system/nexus.service
+
+info "Installing job worker"
+cp "${APP_DIR}/deploy/nexus-worker.service" /etc/systemd/system/nexus-worker.service
+systemctl daemon-reload
+systemctl enable --now nexus-worker
+
+# The catch-up timer is opt-in; updates refresh its units but never enable it.
+info "Installing timers"
+cp "${APP_DIR}/deploy/nexus-catch-up.service" /etc/systemd/system/nexus-catch-up.service
+cp "${APP_DIR}/deploy/nexus-catch-up.timer" /etc/systemd/system/nexus-catch-up.timer
+systemctl daemon-reload
+
 info "Restarting app"
 systemctl restart nexus
+systemctl restart nexus-worker
 systemctl reload caddy || true
 
 info "Done! App is live."
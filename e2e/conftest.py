@@ -82,6 +82,14 @@ def base_url(tmp_path_factory):
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
     )
+    subprocess.run(
+        [sys.executable, "manage.py", "createcachetable"],
+        cwd=root,
+        env=os.environ.copy(),
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
 
     django_port = _find_free_port()
     django_proc = subprocess.Popen(
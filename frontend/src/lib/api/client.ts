@@ -35,10 +35,7 @@ async function parseResponse(response: Response): Promise<unknown> {
   return response.text();
 }
 
-export async function apiRequest<T>(
-  path: string,
-  init: RequestInit = {}
-): Promise<T> {
+async function send(path: string, init: RequestInit): Promise<Response> {
   const method = (init.method ?? 'GET').toUpperCase();
   const headers = new Headers(init.headers ?? {});
 
@@ -68,10 +65,38 @@ export async function apiRequest<T>(
     const body = await parseResponse(response);
     throw new ApiError(`API request failed: ${response.status}`, response.status, body);
   }
+  return response;
+}
 
+export async function apiRequest<T>(
+  path: string,
+  init: RequestInit = {}
+): Promise<T> {
+  const response = await send(path, init);
   if (response.status === 204) {
     return undefined as T;
   }
 
   return (await parseResponse(response)) as T;
 }
+
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+export type PageParams = Record<string, string | number | null | undefined>;
+
+/** Fetch one keyset page; `nextCursor` is null on the last page. */
+export async function apiPage<T>(path: string, params: PageParams = {}): Promise<Page<T>> {
+  const query = new URLSearchParams();
+  for (const [key, value] of Object.entries(params)) {
+    if (value !== null && value !== undefined && value !== '') query.set(key, String(value));
+  }
+  const search = query.toString();
+  const response = await send(search ? `${path}?${search}` : path, {});
+  return {
+    items: (await parseResponse(response)) as T[],
+    nextCursor: response.headers.get('X-Next-Cursor')
+  };
+}
@@ -0,0 +1,23 @@
+import type { Change } from './types';
+
+export type ChangeEvent = Pick<Change, 'entity_type' | 'id' | 'action'>;
+
+/**
+ * Subscribe to live change events, e.g. `['list:3', 'person']`.
+ * Returns an unsubscribe function. EventSource reconnects on its own and
+ * resumes from the last event it saw.
+ */
+export function subscribeToChanges(
+  topics: string[],
+  onChange: (event: ChangeEvent) => void
+): () => void {
+  if (typeof EventSource === 'undefined') {
+    return () => {};
+  }
+  const query = topics.length ? `?topics=${encodeURIComponent(topics.join(','))}` : '';
+  const source = new EventSource(`/api/events/${query}`, { withCredentials: true });
+  source.addEventListener('change', (message) => {
+    onChange(JSON.parse((message as MessageEvent<string>).data) as ChangeEvent);
+  });
+  return () => source.close();
+}
@@ -1,5 +1,8 @@
-import { apiRequest } from './client';
+import { apiPage, apiRequest, type PageParams } from './client';
 import type {
+  BulkTaskOperation,
+  BulkTaskResult,
+  ChangesResponse,
   ContactDraft,
   ContactDraftMatches,
   CreateInteractionInput,
@@ -18,6 +21,7 @@ import type {
   InteractionMedium,
   InteractionTaskLink,
   InteractionType,
+  Job,
   Lead,
   LeadTaskLink,
   LinkedInteraction,
@@ -40,6 +44,8 @@ import type {
   RelationshipOrganizationOrganization,
   RelationshipOrganizationPerson,
   RelationshipPersonPerson,
+  SearchAllResponse,
+  SearchEntityType,
   SearchResponse,
   Section,
   Tag,
@@ -49,6 +55,7 @@ import type {
   TimeEntry,
   TimesheetResponse,
   TrendsData,
+  ActivityData,
   UpcomingTask,
   UpdateInteractionInput,
   UpdateLeadInput,
@@ -114,14 +121,36 @@ export const api = {
         body: JSON.stringify({ name })
       }),
     removeTag: (taskId: number, tagId: number) =>
-      apiRequest<void>(`/tasks/${taskId}/tags/${tagId}/`, { method: 'DELETE' })
+      apiRequest<void>(`/tasks/${taskId}/tags/${tagId}/`, { method: 'DELETE' }),
+    bulk: (operations: BulkTaskOperation[]) =>
+      apiRequest<BulkTaskResult>('/tasks/bulk/', {
+        method: 'POST',
+        body: JSON.stringify({ operations })
+      })
   },
   tags: {
     list: (excludeTask?: number) =>
       apiRequest<Tag[]>(excludeTask ? `/tags/?exclude_task=${excludeTask}` : '/tags/')
   },
+  changes: {
+    cursor: () => apiRequest<ChangesResponse>('/changes/'),
+    since: (cursor: number, limit?: number) =>
+      apiRequest<ChangesResponse>(`/changes/?since=${cursor}${limit ? `&limit=${limit}` : ''}`)
+  },
   search: {
-    run: (query: string) => apiRequest<SearchResponse>(`/search/?q=${encodeURIComponent(query)}`)
+    run: (query: string, params?: { limit?: number; offset?: number }) => {
+      const search = new URLSearchParams({ q: query });
+      if (params?.limit !== undefined) search.set('limit', String(params.limit));
+      if (params?.offset !== undefined) search.set('offset', String(params.offset));
+      return apiRequest<SearchResponse>(`/search/?${search.toString()}`);
+    },
+    all: (query: string, params?: { types?: SearchEntityType[]; limit?: number; offset?: number }) => {
+      const search = new URLSearchParams({ q: query });
+      if (params?.types?.length) search.set('types', params.types.join(','));
+      if (params?.limit !== undefined) search.set('limit', String(params.limit));
+      if (params?.offset !== undefined) search.set('offset', String(params.offset));
+      return apiRequest<SearchAllResponse>(`/search/all/?${search.toString()}`);
+    }
   },
   export: {
     all: async (format: 'json' | 'csv' | 'markdown'): Promise<Blob> => {
@@ -148,6 +177,16 @@ export const api = {
       return apiRequest<ImportSummary>('/import/', { method: 'POST', body });
     }
   },
+  jobs: {
+    get: (id: number) => apiRequest<Job>(`/jobs/${id}/`),
+    import: (file: File) => {
+      const body = new FormData();
+      body.append('file', file);
+      return apiRequest<Job>('/jobs/import/', { method: 'POST', body });
+    },
+    export: (format: 'json' | 'ndjson' = 'json') =>
+      apiRequest<Job>(`/jobs/export/?format=${format}`, { method: 'POST' })
+  },
   projects: {
     getAll: () => apiRequest<Project[]>('/projects/'),
     create: (payload: CreateProjectInput) =>
@@ -156,6 +195,8 @@ export const api = {
       apiRequest<Project>(`/projects/${id}/`, { method: 'PUT', body: JSON.stringify(payload) }),
     remove: (id: number) => apiRequest<void>(`/projects/${id}/`, { method: 'DELETE' }),
     toggle: (id: number) => apiRequest<Project>(`/projects/${id}/toggle/`, { method: 'POST' }),
+    move: (id: number, payload: MoveInput) =>
+      apiRequest<Project>(`/projects/${id}/move/`, { method: 'PATCH', body: JSON.stringify(payload) }),
     getTasks: (id: number) => apiRequest<Task[]>(`/projects/${id}/tasks/`),
     links: {
       list: (projectId: number) =>
@@ -175,10 +216,16 @@ export const api = {
     }
   },
   upcoming: {
-    get: () => apiRequest<UpcomingTask[]>('/upcoming/')
+    get: (until?: string) =>
+      apiRequest<UpcomingTask[]>(
+        until ? `/upcoming/?until=${encodeURIComponent(until)}` : '/upcoming/'
+      )
   },
   dashboard: {
-    trends: () => apiRequest<TrendsData>('/dashboard/trends/'),
+    trends: (weeks?: number) =>
+      apiRequest<TrendsData>(weeks ? `/dashboard/trends/?weeks=${weeks}` : '/dashboard/trends/'),
+    activity: (period: ActivityData['period'] = 'week', count = 13) =>
+      apiRequest<ActivityData>(`/dashboard/activity/?period=${period}&count=${count}`),
     followUpsDue: () => apiRequest<FollowUpDueItem[]>('/dashboard/follow-ups-due/')
   },
   timesheet: {
@@ -193,6 +240,8 @@ export const api = {
   people: {
     getAll: (tag?: string) =>
       apiRequest<Person[]>(tag ? `/people/?tag=${encodeURIComponent(tag)}` : '/people/'),
+    page: (params?: PageParams & { tag?: string; organization_id?: number }) =>
+      apiPage<Person>('/people/', params),
     get: (id: number) => apiRequest<Person>(`/people/${id}/`),
     create: (payload: CreatePersonInput) =>
       apiRequest<Person>('/people/', { method: 'POST', body: JSON.stringify(payload) }),
@@ -215,6 +264,8 @@ export const api = {
   },
   organizations: {
     getAll: () => apiRequest<Organization[]>('/organizations/'),
+    page: (params?: PageParams & { org_type_id?: number }) =>
+      apiPage<Organization>('/organizations/', params),
     get: (id: number) => apiRequest<Organization>(`/organizations/${id}/`),
     create: (payload: CreateOrganizationInput) =>
       apiRequest<Organization>('/organizations/', { method: 'POST', body: JSON.stringify(payload) }),
@@ -242,6 +293,15 @@ export const api = {
   },
   interactions: {
     getAll: () => apiRequest<Interaction[]>('/interactions/'),
+    page: (
+      params?: PageParams & {
+        person_id?: number;
+        organization_id?: number;
+        interaction_type_id?: number;
+        date_from?: string;
+        date_to?: string;
+      }
+    ) => apiPage<Interaction>('/interactions/', params),
     get: (id: number) => apiRequest<Interaction>(`/interactions/${id}/`),
     create: (payload: CreateInteractionInput) =>
       apiRequest<Interaction>('/interactions/', { method: 'POST', body: JSON.stringify(payload) }),
@@ -347,6 +407,8 @@ export const api = {
   },
   leads: {
     getAll: () => apiRequest<Lead[]>('/leads/'),
+    page: (params?: PageParams & { status?: string; person_id?: number; organization_id?: number }) =>
+      apiPage<Lead>('/leads/', params),
     get: (id: number) => apiRequest<Lead>(`/leads/${id}/`),
     create: (payload: CreateLeadInput) =>
       apiRequest<Lead>('/leads/', { method: 'POST', body: JSON.stringify(payload) }),
@@ -86,6 +86,9 @@ export interface UpcomingTask {
   section_id: number;
   section_name: string;
   tags: string[];
+  is_projected?: boolean;
+  title_highlight: string;
+  snippet: string;
 }
 
 export interface SearchResultTask {
@@ -107,9 +110,34 @@ export interface SearchResultGroup {
 export interface SearchResponse {
   query: string;
   total_count: number;
+  limit: number;
+  offset: number;
+  next_offset: number | null;
   results: SearchResultGroup[];
 }
 
+export type SearchEntityType = 'task' | 'person' | 'organization' | 'interaction' | 'lead' | 'page';
+
+export interface SearchHit {
+  id: number;
+  title: string;
+  title_highlight: string;
+  snippet: string;
+}
+
+export interface SearchAllGroup {
+  entity_type: SearchEntityType;
+  count: number;
+  hits: SearchHit[];
+}
+
+export interface SearchAllResponse {
+  query: string;
+  total_count: number;
+  facets: Partial<Record<SearchEntityType, number>>;
+  groups: SearchAllGroup[];
+}
+
 export interface TimesheetSummaryItem {
   project_id: number;
   project_name: string;
@@ -150,6 +178,20 @@ export interface ImportSummary {
   error_details: string[];
 }
 
+export interface Job {
+  id: number;
+  kind: 'import' | 'export';
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  progress_done: number;
+  progress_total: number;
+  result: Record<string, unknown> | null;
+  error: string;
+  download_url: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 // Network types
 
 export interface PersonTag {
@@ -425,6 +467,19 @@ export interface TrendsData {
   follow_up_compliance: FollowUpCompliance;
 }
 
+export interface ActivityBucket {
+  start: string;
+  tasks_completed: number;
+  tasks_created: number;
+  interactions: number;
+  time_entries: number;
+}
+
+export interface ActivityData {
+  period: 'day' | 'week' | 'month';
+  buckets: ActivityBucket[];
+}
+
 export interface FollowUpDueItem {
   person_id: number;
   first_name: string;
@@ -447,7 +502,9 @@ export interface UpdateListInput {
 }
 
 export interface MoveInput {
-  position: number;
+  position?: number;
+  after_id?: number;
+  before_id?: number;
 }
 
 export interface CreateSectionInput {
@@ -475,8 +532,34 @@ export interface UpdateTaskInput {
   recurrence_rule?: Record<string, unknown>;
 }
 
+export type BulkTaskAction =
+  | 'complete'
+  | 'uncomplete'
+  | 'move'
+  | 'add_tag'
+  | 'remove_tag'
+  | 'pin'
+  | 'unpin'
+  | 'delete';
+
+export interface BulkTaskOperation {
+  action: BulkTaskAction;
+  task_ids: number[];
+  section_id?: number;
+  tag_name?: string;
+  tag_id?: number;
+}
+
+export interface BulkTaskResult {
+  tasks: Task[];
+  deleted_ids: number[];
+  next_occurrence_ids: Record<number, number>;
+}
+
 export interface MoveTaskInput {
   position?: number;
+  after_id?: number;
+  before_id?: number;
   section_id?: number;
   parent_id?: number | null;
   list_id?: number;
@@ -594,3 +677,28 @@ export interface PageUpdateInput {
   content?: string;
   process_checkboxes?: boolean;
 }
+
+export type ChangeEntityType =
+  | 'list'
+  | 'section'
+  | 'task'
+  | 'tag'
+  | 'project'
+  | 'person'
+  | 'organization'
+  | 'interaction'
+  | 'lead'
+  | 'page';
+
+export interface Change {
+  entity_type: ChangeEntityType;
+  id: number;
+  action: 'upsert' | 'delete';
+  data: Record<string, unknown> | null;
+}
+
+export interface ChangesResponse {
+  cursor: number;
+  has_more: boolean;
+  changes: Change[];
+}
@@ -1,12 +1,17 @@
-import { writable } from 'svelte/store';
+import { get, writable } from 'svelte/store';
 
 import { api, type SearchResponse } from '$lib';
 
-export const searchStore = writable<SearchResponse>({
+const EMPTY: SearchResponse = {
   query: '',
   total_count: 0,
+  limit: 0,
+  offset: 0,
+  next_offset: null,
   results: []
-});
+};
+
+export const searchStore = writable<SearchResponse>(EMPTY);
 
 let timer: ReturnType<typeof setTimeout> | null = null;
 
@@ -33,10 +38,36 @@ export async function performSearch(query: string): Promise<void> {
   searchStore.set(result);
 }
 
+/** Fetch the next page of the current search and append it to the results. */
+export async function loadMoreResults(): Promise<void> {
+  const current = get(searchStore);
+  if (current.next_offset === null) {
+    return;
+  }
+  const page = await api.search.run(current.query, {
+    limit: current.limit,
+    offset: current.next_offset
+  });
+  if (get(searchStore) !== current) {
+    // A new search replaced the results while this page loaded.
+    return;
+  }
+  const results = current.results.map((group) => ({ ...group, tasks: [...group.tasks] }));
+  for (const group of page.results) {
+    const existing = results.find((item) => item.list.id === group.list.id);
+    if (existing) {
+      existing.tasks.push(...group.tasks);
+    } else {
+      results.push(group);
+    }
+  }
+  searchStore.set({ ...page, offset: current.offset, results });
+}
+
 export function clearSearch(): void {
   if (timer) {
     clearTimeout(timer);
     timer = null;
   }
-  searchStore.set({ query: '', total_count: 0, results: [] });
+  searchStore.set(EMPTY);
 }
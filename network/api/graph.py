@@ -2,16 +2,33 @@ from ninja import Router
 
 from network.models import (
     Organization,
+    OrgOrgRelationshipType,
+    OrgPersonRelationshipType,
+    OrgType,
     Person,
+    PersonPersonRelationshipType,
     RelationshipOrganizationOrganization,
     RelationshipOrganizationPerson,
     RelationshipPersonPerson,
 )
+from tasks.versioning import conditional_on
 
 router = Router(tags=["network-graph"])
 
 
 @router.get("/graph/")
+@conditional_on(
+    Person,
+    Organization,
+    OrgType,
+    RelationshipPersonPerson,
+    RelationshipOrganizationPerson,
+    RelationshipOrganizationOrganization,
+    PersonPersonRelationshipType,
+    OrgPersonRelationshipType,
+    OrgOrgRelationshipType,
+    cache=True,
+)
 def graph_data(request):
     people = Person.objects.order_by("last_name", "first_name")
     organizations = Organization.objects.select_related("org_type").order_by("name")
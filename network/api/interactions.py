@@ -1,7 +1,11 @@
+from datetime import date
+
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from ninja import Router
 from ninja.errors import HttpError
 
+from network.api.pagination import keyset_page
 from network.api.schemas import (
     InteractionCreateInput,
     InteractionSchema,
@@ -15,8 +19,8 @@ router = Router(tags=["network-interactions"])
 def _serialize_interaction(interaction: Interaction) -> InteractionSchema:
     return InteractionSchema(
         id=interaction.id,
-        person_ids=list(interaction.people.values_list("id", flat=True)),
-        organization_ids=list(interaction.organizations.values_list("id", flat=True)),
+        person_ids=[person.id for person in interaction.people.all()],
+        organization_ids=[org.id for org in interaction.organizations.all()],
         interaction_type_id=interaction.interaction_type_id,
         interaction_medium_id=interaction.medium_id,
         date=interaction.date,
@@ -27,8 +31,31 @@ def _serialize_interaction(interaction: Interaction) -> InteractionSchema:
 
 
 @router.get("/interactions/", response=list[InteractionSchema])
-def list_interactions(request):
-    interactions = Interaction.objects.prefetch_related("people", "organizations").order_by("-date", "-id")
+def list_interactions(
+    request,
+    response: HttpResponse,
+    person_id: int | None = None,
+    organization_id: int | None = None,
+    interaction_type_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+):
+    qs = Interaction.objects.all()
+    if person_id is not None:
+        qs = qs.filter(people__id=person_id)
+    if organization_id is not None:
+        qs = qs.filter(organizations__id=organization_id)
+    if interaction_type_id is not None:
+        qs = qs.filter(interaction_type_id=interaction_type_id)
+    if date_from is not None:
+        qs = qs.filter(date__gte=date_from)
+    if date_to is not None:
+        qs = qs.filter(date__lte=date_to)
+    interactions = keyset_page(
+        qs.prefetch_related("people", "organizations"), ("-date", "-id"), response, cursor=cursor, limit=limit
+    )
     return [_serialize_interaction(interaction) for interaction in interactions]
 
 
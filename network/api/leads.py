@@ -1,9 +1,11 @@
 from django.db.models import F, Value
 from django.db.models.functions import Concat
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from ninja import Router
 from ninja.errors import HttpError
 
+from network.api.pagination import keyset_page
 from network.api.schemas import (
     LeadCreateInput,
     LeadSchema,
@@ -53,8 +55,23 @@ def _serialize_lead_task(link: LeadTask) -> LeadTaskLinkSchema:
 
 
 @router.get("/leads/", response=list[LeadSchema])
-def list_leads(request):
-    leads = _annotate_leads(Lead.objects.order_by("-updated_at"))
+def list_leads(
+    request,
+    response: HttpResponse,
+    status: str | None = None,
+    person_id: int | None = None,
+    organization_id: int | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+):
+    qs = Lead.objects.all()
+    if status:
+        qs = qs.filter(status=status)
+    if person_id is not None:
+        qs = qs.filter(person_id=person_id)
+    if organization_id is not None:
+        qs = qs.filter(organization_id=organization_id)
+    leads = keyset_page(_annotate_leads(qs), ("-updated_at", "-id"), response, cursor=cursor, limit=limit)
     return [_serialize_lead(lead) for lead in leads]
 
 
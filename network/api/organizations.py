@@ -1,7 +1,9 @@
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from ninja import Router
 from ninja.errors import HttpError
 
+from network.api.pagination import keyset_page
 from network.api.schemas import (
     OrganizationCreateInput,
     OrganizationSchema,
@@ -24,8 +26,17 @@ def _serialize_organization(org: Organization) -> OrganizationSchema:
 
 
 @router.get("/organizations/", response=list[OrganizationSchema])
-def list_organizations(request):
-    organizations = Organization.objects.order_by("name", "id")
+def list_organizations(
+    request,
+    response: HttpResponse,
+    org_type_id: int | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+):
+    qs = Organization.objects.all()
+    if org_type_id is not None:
+        qs = qs.filter(org_type_id=org_type_id)
+    organizations = keyset_page(qs, ("name", "id"), response, cursor=cursor, limit=limit)
     return [_serialize_organization(org) for org in organizations]
 
 
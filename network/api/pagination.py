@@ -0,0 +1,65 @@
+import base64
+import binascii
+import datetime as _dt
+import json
+
+from django.db.models import Q
+from ninja.errors import HttpError
+
+MAX_PAGE_SIZE = 500
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_cursor(row, ordering: tuple[str, ...]) -> str:
+    values = []
+    for field in ordering:
+        value = getattr(row, field.lstrip("-"))
+        if isinstance(value, (_dt.date, _dt.datetime)):
+            value = value.isoformat()
+        values.append(value)
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor(cursor: str, ordering: tuple[str, ...]) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HttpError(422, "Invalid cursor.")
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise HttpError(422, "Invalid cursor.")
+    return values
+
+
+def _after(ordering: tuple[str, ...], values: list) -> Q:
+    """Rows strictly after `values` in `ordering`, as a lexicographic OR of ANDs."""
+    condition = Q(pk__in=[])
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def keyset_page(queryset, ordering: tuple[str, ...], response, cursor: str | None = None, limit: int | None = None):
+    """Return one page of `queryset` in `ordering`, resuming after `cursor`.
+
+    `ordering` must end in a unique field so every row has a distinct key.
+    Without a `limit` every remaining row is returned. When rows remain
+    past the page, the cursor for the next page is set on `response` in
+    the X-Next-Cursor header.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        queryset = queryset.filter(_after(ordering, _decode_cursor(cursor, ordering)))
+    if limit is None:
+        return list(queryset)
+
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = list(queryset[: limit + 1])
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response[NEXT_CURSOR_HEADER] = _encode_cursor(rows[-1], ordering)
+    return rows
@@ -1,29 +1,31 @@
-from django.db.models import Max, OuterRef, Subquery
+from django.db.models import Exists, OuterRef
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from ninja import Router
 from ninja.errors import HttpError
 
+from network.api.pagination import keyset_page
 from network.api.schemas import (
     PersonCreateInput,
     PersonSchema,
     PersonTagSchema,
     PersonUpdateInput,
 )
-from network.models import Interaction, InteractionType, Person
+from network.models import (
+    InteractionType,
+    Person,
+    PersonTag,
+    RelationshipOrganizationPerson,
+)
+from tasks.versioning import conditional_on
 
 router = Router(tags=["network-people"])
 
 
-def _annotate_people(qs):
-    latest_type = (
-        Interaction.objects.filter(people=OuterRef("pk"))
-        .order_by("-date")
-        .values("interaction_type__name")[:1]
-    )
-    return qs.annotate(
-        last_interaction_date=Max("interactions__date"),
-        last_interaction_type=Subquery(latest_type),
-    )
+def _people_queryset(qs):
+    """Load what _serialize_person reads. The last-interaction columns are
+    stored on Person by database triggers, so this adds no aggregates."""
+    return qs.select_related("last_interaction_type").prefetch_related("tags")
 
 
 def _serialize_person(person: Person) -> PersonSchema:
@@ -41,19 +43,52 @@ def _serialize_person(person: Person) -> PersonSchema:
         notes=person.notes,
         follow_up_cadence_days=person.follow_up_cadence_days,
         tags=tags,
-        last_interaction_date=getattr(person, "last_interaction_date", None),
-        last_interaction_type=getattr(person, "last_interaction_type", None),
+        last_interaction_date=person.last_interaction_date,
+        last_interaction_type=(
+            person.last_interaction_type.name if person.last_interaction_type else None
+        ),
         created_at=person.created_at,
         updated_at=person.updated_at,
     )
 
 
 @router.get("/people/", response=list[PersonSchema])
-def list_people(request, tag: str | None = None):
-    qs = Person.objects.order_by("last_name", "first_name", "id")
+@conditional_on(
+    Person,
+    Person.tags.through,
+    PersonTag,
+    # Interaction writes reach the list through the Person rows the
+    # triggers update, so only a renamed type needs its own version.
+    InteractionType,
+)
+def list_people(
+    request,
+    response: HttpResponse,
+    tag: str | None = None,
+    organization_id: int | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+):
+    qs = Person.objects.all()
     if tag:
         qs = qs.filter(tags__name=tag)
-    people = _annotate_people(qs).prefetch_related("tags")
+    if organization_id is not None:
+        # Exists rather than a join: a person may have several relationships
+        # with one organization and must still appear once.
+        qs = qs.filter(
+            Exists(
+                RelationshipOrganizationPerson.objects.filter(
+                    person=OuterRef("pk"), organization_id=organization_id
+                )
+            )
+        )
+    people = keyset_page(
+        _people_queryset(qs),
+        ("last_name", "first_name", "id"),
+        response,
+        cursor=cursor,
+        limit=limit,
+    )
     return [_serialize_person(person) for person in people]
 
 
@@ -88,7 +123,7 @@ def create_person(request, payload: PersonCreateInput):
 @router.get("/people/{person_id}/", response=PersonSchema)
 def get_person(request, person_id: int):
     try:
-        person = _annotate_people(Person.objects.all()).prefetch_related("tags").get(pk=person_id)
+        person = _people_queryset(Person.objects.all()).get(pk=person_id)
     except Person.DoesNotExist:
         raise HttpError(404, "Person not found")
     return _serialize_person(person)
@@ -126,8 +161,8 @@ def update_person(request, person_id: int, payload: PersonUpdateInput):
         person.follow_up_cadence_days = payload.follow_up_cadence_days
 
     person.save()
-    # Re-fetch with annotations to include last_interaction fields
-    person = _annotate_people(Person.objects.all()).prefetch_related("tags").get(pk=person.pk)
+    # Re-fetch for the last-interaction fields, which the save may have refreshed
+    person = _people_queryset(Person.objects.all()).get(pk=person.pk)
     return _serialize_person(person)
 
 
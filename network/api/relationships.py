@@ -1,6 +1,9 @@
+from django.db.models import Q
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from ninja import Router
 
+from network.api.pagination import keyset_page
 from network.api.schemas import (
     RelationshipOrganizationPersonCreateInput,
     RelationshipOrganizationPersonSchema,
@@ -53,8 +56,20 @@ def _serialize_org_relationship(rel: RelationshipOrganizationPerson) -> Relation
 
 
 @router.get("/relationships/people/", response=list[RelationshipPersonPersonSchema])
-def list_person_relationships(request):
-    relationships = RelationshipPersonPerson.objects.select_related("relationship_type").order_by("id")
+def list_person_relationships(
+    request,
+    response: HttpResponse,
+    person_id: int | None = None,
+    relationship_type_id: int | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+):
+    qs = RelationshipPersonPerson.objects.select_related("relationship_type")
+    if person_id is not None:
+        qs = qs.filter(Q(person_1_id=person_id) | Q(person_2_id=person_id))
+    if relationship_type_id is not None:
+        qs = qs.filter(relationship_type_id=relationship_type_id)
+    relationships = keyset_page(qs, ("id",), response, cursor=cursor, limit=limit)
     return [_serialize_person_relationship(rel) for rel in relationships]
 
 
@@ -95,8 +110,23 @@ def delete_person_relationship(request, relationship_id: int):
 
 
 @router.get("/relationships/organizations/", response=list[RelationshipOrganizationPersonSchema])
-def list_org_relationships(request):
-    relationships = RelationshipOrganizationPerson.objects.select_related("relationship_type").order_by("id")
+def list_org_relationships(
+    request,
+    response: HttpResponse,
+    person_id: int | None = None,
+    organization_id: int | None = None,
+    relationship_type_id: int | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+):
+    qs = RelationshipOrganizationPerson.objects.select_related("relationship_type")
+    if person_id is not None:
+        qs = qs.filter(person_id=person_id)
+    if organization_id is not None:
+        qs = qs.filter(organization_id=organization_id)
+    if relationship_type_id is not None:
+        qs = qs.filter(relationship_type_id=relationship_type_id)
+    relationships = keyset_page(qs, ("id",), response, cursor=cursor, limit=limit)
     return [_serialize_org_relationship(rel) for rel in relationships]
 
 
@@ -153,8 +183,20 @@ def _serialize_org_org_relationship(rel: RelationshipOrganizationOrganization) -
 
 
 @router.get("/relationships/org-org/", response=list[RelationshipOrganizationOrganizationSchema])
-def list_org_org_relationships(request):
-    relationships = RelationshipOrganizationOrganization.objects.select_related("relationship_type").order_by("id")
+def list_org_org_relationships(
+    request,
+    response: HttpResponse,
+    organization_id: int | None = None,
+    relationship_type_id: int | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+):
+    qs = RelationshipOrganizationOrganization.objects.select_related("relationship_type")
+    if organization_id is not None:
+        qs = qs.filter(Q(org_1_id=organization_id) | Q(org_2_id=organization_id))
+    if relationship_type_id is not None:
+        qs = qs.filter(relationship_type_id=relationship_type_id)
+    relationships = keyset_page(qs, ("id",), response, cursor=cursor, limit=limit)
     return [_serialize_org_org_relationship(rel) for rel in relationships]
 
 
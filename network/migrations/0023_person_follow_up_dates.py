@@ -0,0 +1,113 @@
+# Triggers that keep each person's last interaction and next follow-up dates.
+
+from django.db import migrations, models
+
+
+def _last(person_id):
+    """SQL for the date of the latest interaction with person `person_id`."""
+    return f"""(
+        SELECT MAX(i.date) FROM network_interaction i
+        JOIN network_interaction_people ip ON ip.interaction_id = i.id
+        WHERE ip.person_id = {person_id}
+    )"""
+
+
+def _next(row):
+    """SQL for a person row's next follow-up date; null without a cadence."""
+    return (
+        f"date(COALESCE({_last(f'{row}.id')}, {row}.created_at), "
+        f"{row}.follow_up_cadence_days || ' days')"
+    )
+
+
+def _refresh(where):
+    return f"""
+        UPDATE network_person SET
+            last_interaction_date = {_last("network_person.id")},
+            next_follow_up_due = {_next("network_person")}
+        WHERE {where};
+    """
+
+
+# Saving a Person writes back whatever dates it was loaded with, so person
+# writes recompute them too; the WHEN clause skips rows already correct.
+_STALE = (
+    f"NEW.last_interaction_date IS NOT {_last('NEW.id')} "
+    f"OR NEW.next_follow_up_due IS NOT {_next('NEW')}"
+)
+
+TRIGGERS = {
+    "network_person_follow_up_insert": f"""
+        AFTER INSERT ON network_person WHEN {_STALE} BEGIN
+            {_refresh("id = NEW.id")}
+        END
+    """,
+    "network_person_follow_up_update": f"""
+        AFTER UPDATE OF last_interaction_date, next_follow_up_due,
+            follow_up_cadence_days, created_at ON network_person
+        WHEN {_STALE} BEGIN
+            {_refresh("id = NEW.id")}
+        END
+    """,
+    "network_interaction_people_follow_up_insert": f"""
+        AFTER INSERT ON network_interaction_people BEGIN
+            {_refresh("id = NEW.person_id")}
+        END
+    """,
+    "network_interaction_people_follow_up_delete": f"""
+        AFTER DELETE ON network_interaction_people BEGIN
+            {_refresh("id = OLD.person_id")}
+        END
+    """,
+    "network_interaction_people_follow_up_update": f"""
+        AFTER UPDATE ON network_interaction_people BEGIN
+            {_refresh("id IN (OLD.person_id, NEW.person_id)")}
+        END
+    """,
+    "network_interaction_follow_up_date": f"""
+        AFTER UPDATE OF date ON network_interaction
+        WHEN NEW.date IS NOT OLD.date BEGIN
+            {_refresh(
+                "id IN (SELECT person_id FROM network_interaction_people "
+                "WHERE interaction_id = NEW.id)"
+            )}
+        END
+    """,
+}
+
+
+def _create_sql():
+    statements = [f"CREATE TRIGGER {name} {body}" for name, body in TRIGGERS.items()]
+    statements.append(_refresh("1"))
+    return statements
+
+
+def _drop_sql():
+    return [f"DROP TRIGGER IF EXISTS {name}" for name in TRIGGERS]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0022_interactionpagelink"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="person",
+            name="last_interaction_date",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="person",
+            name="next_follow_up_due",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="person",
+            index=models.Index(
+                fields=["next_follow_up_due"], name="network_per_next_fo_dc74e6_idx"
+            ),
+        ),
+        migrations.RunSQL(_create_sql(), _drop_sql()),
+    ]
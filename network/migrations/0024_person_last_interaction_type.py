@@ -0,0 +1,125 @@
+# Triggers that also keep the type of each person's last interaction.
+
+from importlib import import_module
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Triggers this migration replaces; restored when it is reversed.
+previous = import_module("network.migrations.0023_person_follow_up_dates")
+
+
+def _latest(person_id, column):
+    """SQL for `column` of the latest interaction with person `person_id`."""
+    return f"""(
+        SELECT i.{column} FROM network_interaction i
+        JOIN network_interaction_people ip ON ip.interaction_id = i.id
+        WHERE ip.person_id = {person_id}
+        ORDER BY i.date DESC, i.id DESC LIMIT 1
+    )"""
+
+
+def _next(row):
+    """SQL for a person row's next follow-up date; null without a cadence."""
+    return (
+        f"date(COALESCE({_latest(f'{row}.id', 'date')}, {row}.created_at), "
+        f"{row}.follow_up_cadence_days || ' days')"
+    )
+
+
+def _refresh(where):
+    return f"""
+        UPDATE network_person SET
+            last_interaction_date = {_latest("network_person.id", "date")},
+            last_interaction_type_id = {
+                _latest("network_person.id", "interaction_type_id")
+            },
+            next_follow_up_due = {_next("network_person")}
+        WHERE {where};
+    """
+
+
+# Saving a Person writes back whatever it was loaded with, so person writes
+# recompute the derived columns too; the WHEN clause skips rows already correct.
+_STALE = (
+    f"NEW.last_interaction_date IS NOT {_latest('NEW.id', 'date')} "
+    f"OR NEW.last_interaction_type_id IS NOT "
+    f"{_latest('NEW.id', 'interaction_type_id')} "
+    f"OR NEW.next_follow_up_due IS NOT {_next('NEW')}"
+)
+
+TRIGGERS = {
+    "network_person_follow_up_insert": f"""
+        AFTER INSERT ON network_person WHEN {_STALE} BEGIN
+            {_refresh("id = NEW.id")}
+        END
+    """,
+    "network_person_follow_up_update": f"""
+        AFTER UPDATE OF last_interaction_date, last_interaction_type_id,
+            next_follow_up_due, follow_up_cadence_days, created_at ON network_person
+        WHEN {_STALE} BEGIN
+            {_refresh("id = NEW.id")}
+        END
+    """,
+    "network_interaction_people_follow_up_insert": f"""
+        AFTER INSERT ON network_interaction_people BEGIN
+            {_refresh("id = NEW.person_id")}
+        END
+    """,
+    "network_interaction_people_follow_up_delete": f"""
+        AFTER DELETE ON network_interaction_people BEGIN
+            {_refresh("id = OLD.person_id")}
+        END
+    """,
+    "network_interaction_people_follow_up_update": f"""
+        AFTER UPDATE ON network_interaction_people BEGIN
+            {_refresh("id IN (OLD.person_id, NEW.person_id)")}
+        END
+    """,
+    "network_interaction_follow_up_update": f"""
+        AFTER UPDATE OF date, interaction_type_id ON network_interaction
+        WHEN NEW.date IS NOT OLD.date
+            OR NEW.interaction_type_id IS NOT OLD.interaction_type_id BEGIN
+            {_refresh(
+                "id IN (SELECT person_id FROM network_interaction_people "
+                "WHERE interaction_id = NEW.id)"
+            )}
+        END
+    """,
+}
+
+
+def _create_sql():
+    statements = [f"CREATE TRIGGER {name} {body}" for name, body in TRIGGERS.items()]
+    statements.append(_refresh("1"))
+    return statements
+
+
+def _drop_sql():
+    return [f"DROP TRIGGER IF EXISTS {name}" for name in TRIGGERS]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0023_person_follow_up_dates"),
+    ]
+
+    operations = [
+        # Dropped before the schema change: when it is reversed, SQLite
+        # rebuilds network_person and refuses while triggers reference it.
+        migrations.RunSQL(previous._drop_sql(), previous._create_sql()),
+        migrations.AddField(
+            model_name="person",
+            name="last_interaction_type",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="network.interactiontype",
+            ),
+        ),
+        migrations.RunSQL(_create_sql(), _drop_sql()),
+    ]
@@ -16,6 +16,20 @@ class Person(models.Model):
         null=True,
         blank=True
     )
+    # Maintained by database triggers (migrations 0023 and 0024) from the
+    # person's interactions and cadence; whatever the app writes is replaced.
+    last_interaction_date = models.DateField(null=True, blank=True, editable=False)
+    last_interaction_type = models.ForeignKey(
+        "InteractionType",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+    )
+    # Last interaction (or creation, if none) plus the cadence; null
+    # without a cadence.
+    next_follow_up_due = models.DateField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -28,6 +42,7 @@ class Person(models.Model):
         ]
         indexes = [
             models.Index(fields=["last_name", "first_name", "id"]),
+            models.Index(fields=["next_follow_up_due"]),
         ]
 
     def __str__(self):
@@ -89,3 +89,53 @@ class InteractionOrganizationTests(TestCase):
         self.assertEqual(resp.status_code, 200)
         data = resp.json()
         self.assertCountEqual(data["organization_ids"], [self.org1.id, self.org2.id])
+
+
+class InteractionListPaginationTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.jane = Person.objects.create(first_name="Jane", last_name="Doe")
+        self.john = Person.objects.create(first_name="John", last_name="Roe")
+        self.meeting = InteractionType.objects.create(name="Meeting")
+        self.call = InteractionType.objects.create(name="Call")
+
+    def _create(self, day, person, interaction_type):
+        interaction = Interaction.objects.create(interaction_type=interaction_type, date=f"2026-03-{day:02d}")
+        interaction.people.set([person])
+        return interaction
+
+    def test_cursor_walks_pages_in_index_order(self):
+        created = [self._create(day, self.jane, self.meeting) for day in (1, 2, 2, 3, 4)]
+        expected = sorted(created, key=lambda i: (i.date, i.id), reverse=True)
+
+        seen = []
+        url = "/api/interactions/?limit=2"
+        while True:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            self.assertLessEqual(len(resp.json()), 2)
+            seen.extend(item["id"] for item in resp.json())
+            cursor = resp.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            url = f"/api/interactions/?limit=2&cursor={cursor}"
+
+        self.assertEqual(seen, [i.id for i in expected])
+
+    def test_filters_by_person_type_and_date_range(self):
+        self._create(1, self.jane, self.meeting)
+        match = self._create(5, self.jane, self.call)
+        self._create(5, self.john, self.call)
+        self._create(20, self.jane, self.call)
+
+        resp = self.client.get(
+            f"/api/interactions/?person_id={self.jane.id}&interaction_type_id={self.call.id}"
+            "&date_from=2026-03-02&date_to=2026-03-10"
+        )
+
+        self.assertEqual([item["id"] for item in resp.json()], [match.id])
+        self.assertNotIn("X-Next-Cursor", resp.headers)
+
+    def test_invalid_cursor_returns_422(self):
+        resp = self.client.get("/api/interactions/?limit=2&cursor=not-a-cursor")
+        self.assertEqual(resp.status_code, 422)
@@ -1,9 +1,18 @@
 import json
 from datetime import date
 
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 
-from network.models import Interaction, InteractionType, Person
+from network.models import (
+    Interaction,
+    InteractionType,
+    Organization,
+    OrgType,
+    Person,
+    RelationshipOrganizationPerson,
+)
 
 
 class PeopleLastInteractionTests(TestCase):
@@ -65,6 +74,57 @@ class PeopleLastInteractionTests(TestCase):
         self.assertIsNone(bob["last_interaction_date"])
         self.assertIsNone(bob["last_interaction_type"])
 
+    def test_follows_interaction_edits(self):
+        i1 = Interaction.objects.create(
+            interaction_type=self.email_type,
+            date=date(2026, 1, 10),
+        )
+        i1.people.add(self.person)
+        i2 = Interaction.objects.create(
+            interaction_type=self.dm_type,
+            date=date(2026, 1, 10),
+        )
+        i2.people.add(self.person)
+        # Same day: the later interaction wins
+        self.assertEqual(self._get_person(self.person.id)["last_interaction_type"], "DM")
+
+        Interaction.objects.filter(pk=i2.pk).update(interaction_type=self.email_type)
+        self.assertEqual(self._get_person(self.person.id)["last_interaction_type"], "Email")
+
+        self.dm_type.name = "Direct message"
+        self.dm_type.save()
+        Interaction.objects.filter(pk=i1.pk).update(
+            interaction_type=self.dm_type, date=date(2026, 1, 11)
+        )
+        data = self._get_person(self.person.id)
+        self.assertEqual(data["last_interaction_date"], "2026-01-11")
+        self.assertEqual(data["last_interaction_type"], "Direct message")
+
+        i1.people.remove(self.person)
+        i2.delete()
+        data = self._get_person(self.person.id)
+        self.assertIsNone(data["last_interaction_date"])
+        self.assertIsNone(data["last_interaction_type"])
+
+    def test_list_reads_stored_fields(self):
+        for n in range(20):
+            person = Person.objects.create(first_name=f"P{n}", last_name="X")
+            interaction = Interaction.objects.create(
+                interaction_type=self.dm_type, date=date(2026, 1, n + 1)
+            )
+            interaction.people.add(person)
+        with CaptureQueriesContext(connection) as queries:
+            people = self._list_people()
+        self.assertEqual(len(people), 21)
+        self.assertEqual(
+            next(p for p in people if p["first_name"] == "P19")["last_interaction_date"],
+            "2026-01-20",
+        )
+        # No aggregate or subquery over interactions
+        for query in queries:
+            self.assertNotIn('"network_interaction"', query["sql"])
+            self.assertNotIn('"network_interaction_people"', query["sql"])
+
     def test_create_person_returns_null_interaction_fields(self):
         resp = self.client.get("/api/health/")
         token = resp.cookies["csrftoken"].value
@@ -121,3 +181,36 @@ class PeopleLastInteractionTests(TestCase):
         data = json.loads(resp.content)
         self.assertEqual(data["last_interaction_date"], "2026-02-01")
         self.assertEqual(data["last_interaction_type"], "DM")
+
+
+class PeopleListPaginationTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+
+    def test_pages_follow_name_order(self):
+        for first, last in [("Bea", "Young"), ("Al", "Baker"), ("Cy", "Baker"), ("Di", "Adams")]:
+            Person.objects.create(first_name=first, last_name=last)
+
+        first_page = self.client.get("/api/people/?limit=3")
+        second_page = self.client.get(f"/api/people/?limit=3&cursor={first_page.headers['X-Next-Cursor']}")
+
+        names = [p["first_name"] for p in first_page.json() + second_page.json()]
+        self.assertEqual(names, ["Di", "Al", "Cy", "Bea"])
+        self.assertNotIn("X-Next-Cursor", second_page.headers)
+
+    def test_organization_filter_lists_each_person_once(self):
+        org_type = OrgType.objects.create(name="Company")
+        org = Organization.objects.create(name="Acme", org_type=org_type)
+        other = Organization.objects.create(name="Other", org_type=org_type)
+        al = Person.objects.create(first_name="Al", last_name="Baker")
+        bea = Person.objects.create(first_name="Bea", last_name="Young")
+        Person.objects.create(first_name="Cy", last_name="Zed")
+        for person in (al, al, bea):
+            RelationshipOrganizationPerson.objects.create(organization=org, person=person)
+        RelationshipOrganizationPerson.objects.create(organization=other, person=bea)
+
+        everyone = self.client.get(f"/api/people/?organization_id={org.id}")
+        self.assertEqual([p["first_name"] for p in everyone.json()], ["Al", "Bea"])
+
+        page = self.client.get(f"/api/people/?organization_id={org.id}&limit=2")
+        self.assertEqual([p["first_name"] for p in page.json()], ["Al", "Bea"])
@@ -2,6 +2,9 @@
 ASGI config for nexus project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Production serves through this entry point (gunicorn with uvicorn workers,
+see deploy/), which the /api/events/ live-update stream needs; under WSGI,
+e.g. runserver, that endpoint answers 501 and clients poll /api/changes/.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
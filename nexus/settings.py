@@ -99,6 +99,36 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+#
+# Rendered API responses live in a database table so every gunicorn worker
+# shares them; create it with `manage.py createcachetable`. Entries are keyed
+# on table versions (tasks.versioning), so stale ones are never read and
+# only need to age out.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "responses": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "nexus_response_cache",
+        "TIMEOUT": 60 * 60 * 24,
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    },
+}
+
+
+# Background jobs
+# Uploads waiting to be imported and finished exports, read and written by
+# the `run_jobs` worker. Defaults to a directory next to the database.
+
+JOBS_DIR = Path(
+    os.environ.get("JOBS_DIR", Path(DATABASES["default"]["NAME"]).parent / "jobs")
+)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
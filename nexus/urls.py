@@ -4,9 +4,13 @@ from django.views.static import serve
 
 import nexus.settings as settings
 from tasks.api import api
+from tasks.views.events import stream_events
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    # Plain Django view: the SSE stream is an async generator, which the
+    # Ninja router cannot return.
+    path("api/events/", stream_events, name="events"),
     path("api/", api.urls),
     path(
         "service-worker.js",
@@ -1,6 +1,8 @@
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from ninja import Router
 
+from network.api.pagination import keyset_page
 from notebook.api.schemas import (
     LinkedInteractionOut,
     PageBacklink,
@@ -59,20 +61,28 @@ def _serialize_page(page: Page) -> PageOut:
     )
 
 
-ALLOWED_ORDERINGS = {"-updated_at", "-created_at", "title"}
+# Each ordering ends in a unique field so keyset cursors are unambiguous.
+ALLOWED_ORDERINGS = {
+    "-updated_at": ("-updated_at", "-id"),
+    "-created_at": ("-created_at", "-id"),
+    "title": ("title", "id"),
+}
 
 
 @router.get("/notebook/pages/", response=list[PageListItem])
 def list_pages(
     request,
+    response: HttpResponse,
     search: str | None = None,
     page_type: str | None = None,
     entity_type: str | None = None,
     entity_id: int | None = None,
     ordering: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
 ):
-    order = ordering if ordering in ALLOWED_ORDERINGS else "-updated_at"
-    qs = Page.objects.order_by(order)
+    order = ALLOWED_ORDERINGS.get(ordering, ALLOWED_ORDERINGS["-updated_at"])
+    qs = Page.objects.all()
     if search:
         qs = qs.filter(title__icontains=search)
     if page_type:
@@ -92,7 +102,7 @@ def list_pages(
             created_at=p.created_at,
             updated_at=p.updated_at,
         )
-        for p in qs
+        for p in keyset_page(qs, order, response, cursor=cursor, limit=limit)
     ]
 
 
@@ -63,6 +63,7 @@ def create_tasks_from_checkboxes(page):
     Returns True if content was modified.
     """
     from tasks.models import Task
+    from tasks.views.reorder import POSITION_GAP
 
     inbox_section = get_inbox_section()
     if not inbox_section:
@@ -95,7 +96,7 @@ def create_tasks_from_checkboxes(page):
         task = Task.objects.create(
             section=inbox_section,
             title=title,
-            position=max_pos + 10,
+            position=max_pos + POSITION_GAP,
         )
         modified = True
         return f"{prefix}[[task:{task.id}|{title}]]"
@@ -16,16 +16,19 @@ from network.api import (
     task_links,
 )
 from notebook.api import pages as notebook_pages
-from tasks.api import dashboard, export, import_tasks, lists, project_links, projects, search, sections, tags, tasks, timesheet, upcoming
+from tasks.api import bulk, changes, dashboard, export, import_tasks, jobs, lists, project_links, projects, search, sections, tags, tasks, timesheet, upcoming
 
 api = NinjaAPI(urls_namespace="tasks_api")
 api.add_router("", lists.router)
 api.add_router("", sections.router)
+# Registered before tasks so /tasks/{task_id}/ does not shadow /tasks/bulk/.
+api.add_router("", bulk.router)
 api.add_router("", tasks.router)
 api.add_router("", tags.router)
 api.add_router("", search.router)
 api.add_router("", export.router)
 api.add_router("", import_tasks.router)
+api.add_router("", jobs.router)
 api.add_router("", projects.router)
 api.add_router("", project_links.router)
 api.add_router("", timesheet.router)
@@ -45,6 +48,7 @@ api.add_router("", graph.router)
 api.add_router("", leads.router)
 api.add_router("", contact_drafts.router)
 api.add_router("", notebook_pages.router)
+api.add_router("", changes.router)
 
 
 @api.get("/health/")
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.functions import Substr
+from django.shortcuts import get_object_or_404
+from ninja import Router
+from ninja.errors import HttpError
+
+from tasks.api.schemas import BulkTaskInput, BulkTaskOperation, BulkTaskResult
+from tasks.api.task_tree import build_task_nodes
+from tasks.api.tasks import check_move_pin_limit, check_pin_limit
+from tasks.models import ChangeLogEntry, Section, Tag, Task
+from tasks.views.reorder import POSITION_GAP
+
+router = Router(tags=["tasks"])
+
+
+def _load_tasks(task_ids: list[int]) -> list[Task]:
+    tasks = Task.objects.select_related("section").in_bulk(task_ids)
+    if len(tasks) != len(set(task_ids)):
+        raise HttpError(422, "One or more task IDs are invalid")
+    return [tasks[task_id] for task_id in dict.fromkeys(task_ids)]
+
+
+def _subtrees(tasks: list[Task]) -> Q:
+    return Q(pk__in=[task.id for task in tasks]) | Task.descendants_q(tasks)
+
+
+def _complete(tasks: list[Task], next_occurrences: dict[int, int]) -> None:
+    next_occurrences.update(Task.complete_open(Task.objects.filter(_subtrees(tasks))))
+
+
+def _uncomplete(tasks: list[Task]) -> None:
+    task_ids = [task.id for task in tasks]
+    Task.objects.filter(pk__in=task_ids).update(is_completed=False, completed_at=None)
+    ChangeLogEntry.record(Task, task_ids)
+
+
+def _move(tasks: list[Task], section: Section) -> None:
+    """Append the selected tasks to `section` as top-level tasks, subtrees included."""
+    check_move_pin_limit(tasks, section.list_id)
+    selected = {task.id for task in tasks}
+    # A task nested under another selected task simply follows its ancestor.
+    roots = [
+        task for task in tasks if not any(int(ancestor) in selected for ancestor in task.path.split("/") if ancestor)
+    ]
+
+    descendant_ids = list(Task.objects.filter(Task.descendants_q(roots)).values_list("id", flat=True))
+    Task.objects.filter(pk__in=descendant_ids).update(section=section)
+    # Promoting a root strips its old ancestry from every descendant path;
+    # roots whose ancestry has the same length share one statement.
+    by_prefix_length: dict[int, list[Task]] = defaultdict(list)
+    for root in roots:
+        if root.path:
+            by_prefix_length[len(root.path)].append(root)
+    for length, group in by_prefix_length.items():
+        Task.objects.filter(Task.descendants_q(group)).update(path=Substr("path", length + 1))
+
+    max_position = (
+        Task.objects.filter(section=section, parent=None)
+        .exclude(pk__in=selected)
+        .aggregate(max_position=models.Max("position"))["max_position"]
+        or 0
+    )
+    for i, root in enumerate(roots, start=1):
+        root.section = section
+        root.parent = None
+        root.path = ""
+        root.position = max_position + i * POSITION_GAP
+    Task.objects.bulk_update(roots, ["section", "parent", "path", "position"])
+    ChangeLogEntry.record(Task, [*(root.id for root in roots), *descendant_ids])
+
+
+def _tag_for(operation: BulkTaskOperation, create: bool) -> Tag | None:
+    if operation.tag_id is not None:
+        return get_object_or_404(Tag, pk=operation.tag_id)
+    name = (operation.tag_name or "").strip()
+    if not name:
+        raise HttpError(422, "Tag name may not be blank.")
+    if create:
+        return Tag.objects.get_or_create(name=name)[0]
+    return Tag.objects.filter(name=name).first()
+
+
+def _add_tag(tasks: list[Task], tag: Tag) -> None:
+    Through = Task.tags.through
+    Through.objects.bulk_create(
+        [Through(task_id=task.id, tag_id=tag.id) for task in tasks],
+        ignore_conflicts=True,
+    )
+    ChangeLogEntry.record(Task, [task.id for task in tasks])
+
+
+def _remove_tag(tasks: list[Task], tag: Tag | None) -> None:
+    if tag is not None:
+        task_ids = [task.id for task in tasks]
+        Task.tags.through.objects.filter(tag=tag, task_id__in=task_ids).delete()
+        ChangeLogEntry.record(Task, task_ids)
+
+
+def _pin(tasks: list[Task], pinned: bool) -> None:
+    targets = [task for task in tasks if task.is_pinned != pinned]
+    if pinned:
+        check_pin_limit(Counter(task.section.list_id for task in targets))
+    target_ids = [task.id for task in targets]
+    Task.objects.filter(pk__in=target_ids).update(is_pinned=pinned)
+    ChangeLogEntry.record(Task, target_ids)
+
+
+def _delete(tasks: list[Task]) -> list[int]:
+    deleted_ids = list(Task.objects.filter(_subtrees(tasks)).values_list("id", flat=True))
+    Task.objects.filter(pk__in=[task.id for task in tasks]).delete()
+    return deleted_ids
+
+
+@router.post("/tasks/bulk/", response=BulkTaskResult)
+def bulk_tasks(request, payload: BulkTaskInput):
+    affected: dict[int, None] = {}
+    deleted_ids: list[int] = []
+    next_occurrences: dict[int, int] = {}
+
+    with transaction.atomic():
+        for operation in payload.operations:
+            tasks = _load_tasks(operation.task_ids)
+            if operation.action == "complete":
+                _complete(tasks, next_occurrences)
+            elif operation.action == "uncomplete":
+                _uncomplete(tasks)
+            elif operation.action == "move":
+                if operation.section_id is None:
+                    raise HttpError(422, "Move requires a section_id.")
+                _move(tasks, get_object_or_404(Section, pk=operation.section_id))
+            elif operation.action == "add_tag":
+                _add_tag(tasks, _tag_for(operation, create=True))
+            elif operation.action == "remove_tag":
+                _remove_tag(tasks, _tag_for(operation, create=False))
+            elif operation.action in ("pin", "unpin"):
+                _pin(tasks, operation.action == "pin")
+            elif operation.action == "delete":
+                deleted_ids.extend(_delete(tasks))
+                continue
+            affected.update(dict.fromkeys(task.id for task in tasks))
+
+    deleted = set(deleted_ids)
+    affected.update(dict.fromkeys(next_occurrences.values()))
+    affected_ids = [task_id for task_id in affected if task_id not in deleted]
+    section_ids = Task.objects.filter(pk__in=affected_ids).values("section_id")
+    nodes = build_task_nodes(Task.objects.filter(section_id__in=section_ids).order_by("position", "id"))
+    return BulkTaskResult(
+        tasks=[nodes[task_id] for task_id in affected_ids],
+        deleted_ids=deleted_ids,
+        next_occurrence_ids={
+            task_id: next_id for task_id, next_id in next_occurrences.items() if task_id not in deleted
+        },
+    )
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from django.db.models import Max
+from ninja import Router, Schema
+
+from network.api.interactions import _serialize_interaction
+from network.api.leads import _annotate_leads, _serialize_lead
+from network.api.organizations import _serialize_organization
+from network.api.people import _people_queryset, _serialize_person
+from network.models import Interaction, Lead, Organization, Person
+from notebook.api.schemas import PageListItem
+from notebook.models import Page
+from tasks.api.lists import _serialize_list
+from tasks.api.projects import _project_queryset, _serialize_project
+from tasks.api.schemas import ChangeSchema, ChangesResponse, SectionSchema, TagSchema
+from tasks.api.task_tree import flat_task_nodes
+from tasks.models import ChangeLogEntry, List, Section, Tag, Task
+
+router = Router(tags=["changes"])
+
+DEFAULT_CHANGES_LIMIT = 500
+MAX_CHANGES_LIMIT = 2000
+
+
+def _section(section: Section) -> SectionSchema:
+    return SectionSchema(
+        id=section.id,
+        list_id=section.list_id,
+        name=section.name,
+        emoji=section.emoji,
+        position=section.position,
+    )
+
+
+def _page(page: Page) -> PageListItem:
+    return PageListItem(
+        id=page.id,
+        title=page.title,
+        slug=page.slug,
+        page_type=page.page_type,
+        date=page.date,
+        created_at=page.created_at,
+        updated_at=page.updated_at,
+    )
+
+
+# entity type -> loader returning {id: schema} for the ids that still exist.
+# Each loader runs a fixed number of queries regardless of how many ids it gets.
+_LOADERS = {
+    "list": lambda ids: {obj.id: _serialize_list(obj) for obj in List.objects.filter(pk__in=ids)},
+    "section": lambda ids: {obj.id: _section(obj) for obj in Section.objects.filter(pk__in=ids)},
+    "task": lambda ids: flat_task_nodes(Task.objects.filter(pk__in=ids)),
+    "tag": lambda ids: {obj.id: TagSchema(id=obj.id, name=obj.name) for obj in Tag.objects.filter(pk__in=ids)},
+    "project": lambda ids: {obj.id: _serialize_project(obj) for obj in _project_queryset().filter(pk__in=ids)},
+    "person": lambda ids: {
+        obj.id: _serialize_person(obj)
+        for obj in _people_queryset(Person.objects.filter(pk__in=ids))
+    },
+    "organization": lambda ids: {
+        obj.id: _serialize_organization(obj) for obj in Organization.objects.filter(pk__in=ids)
+    },
+    "interaction": lambda ids: {
+        obj.id: _serialize_interaction(obj)
+        for obj in Interaction.objects.filter(pk__in=ids).prefetch_related("people", "organizations")
+    },
+    "lead": lambda ids: {obj.id: _serialize_lead(obj) for obj in _annotate_leads(Lead.objects.filter(pk__in=ids))},
+    "page": lambda ids: {obj.id: _page(obj) for obj in Page.objects.filter(pk__in=ids)},
+}
+
+
+def _latest_cursor() -> int:
+    return ChangeLogEntry.objects.aggregate(cursor=Max("id"))["cursor"] or 0
+
+
+@router.get("/changes/", response=ChangesResponse)
+def list_changes(request, since: int | None = None, limit: int = DEFAULT_CHANGES_LIMIT):
+    """Return what changed after the `since` cursor, one entry per entity.
+
+    Without `since` only the current cursor is returned: a client reads it
+    before loading full state, then polls with it to receive deltas. Each
+    entity appears once with its latest action; upserts carry the entity's
+    current state, so replaying a delta is idempotent.
+    """
+    if since is None:
+        return ChangesResponse(cursor=_latest_cursor(), has_more=False, changes=[])
+
+    limit = max(1, min(limit, MAX_CHANGES_LIMIT))
+    window = list(
+        ChangeLogEntry.objects.filter(id__gt=since)
+        .order_by("id")
+        .values_list("id", "entity_type", "entity_id", "action")[: limit + 1]
+    )
+    has_more = len(window) > limit
+    window = window[:limit]
+    if not window:
+        return ChangesResponse(cursor=since, has_more=False, changes=[])
+
+    latest: dict[tuple[str, int], str] = {}
+    for _id, entity_type, entity_id, action in window:
+        latest.pop((entity_type, entity_id), None)
+        latest[(entity_type, entity_id)] = action
+
+    upsert_ids: dict[str, list[int]] = defaultdict(list)
+    for (entity_type, entity_id), action in latest.items():
+        if action == ChangeLogEntry.ACTION_UPSERT:
+            upsert_ids[entity_type].append(entity_id)
+    loaded = {entity_type: _LOADERS[entity_type](ids) for entity_type, ids in upsert_ids.items()}
+
+    changes = []
+    for (entity_type, entity_id), action in latest.items():
+        data = loaded.get(entity_type, {}).get(entity_id)
+        if action == ChangeLogEntry.ACTION_UPSERT and data is None:
+            # Deleted after this window; a later delete entry follows.
+            continue
+        changes.append(
+            ChangeSchema(
+                entity_type=entity_type,
+                id=entity_id,
+                action=action,
+                data=data.model_dump() if data is not None else None,
+            )
+        )
+    return ChangesResponse(cursor=window[-1][0], has_more=has_more, changes=changes)
@@ -1,125 +1,141 @@
 from __future__ import annotations
 
-from datetime import date, timedelta
-
-from django.db.models import Count, Max, Q
+from django.db.models import Count, Q
 from django.utils import timezone
 from ninja import Router
+from ninja.errors import HttpError
 
 from tasks.api.schemas import (
-    FollowUpCompliance,
+    ActivityResponse,
     FollowUpDueItem,
     TrendsResponse,
-    WeeklyCount,
 )
 from network.models.interaction import Interaction
 from network.models.person import Person
-from tasks.models import Task
+from tasks.models import ActivityCount, Task, TimeEntry
+from tasks.services.rollups import activity_counts, bucket_starts
+from tasks.versioning import conditional_on
 
 router = Router(tags=["dashboard"])
 
-
-def _monday_of(d: date) -> date:
-    return d - timedelta(days=d.weekday())
+# Longest window a dashboard request may ask for, in buckets.
+MAX_BUCKETS = 520
 
 
 @router.get("/dashboard/trends/", response=TrendsResponse)
-def dashboard_trends(request):
+# Week buckets and overdue follow-ups move with the calendar, so the date is
+# part of the validator.
+@conditional_on(
+    ActivityCount,
+    Interaction,
+    Interaction.people.through,
+    Person,
+    Task,
+    extra=lambda request, **kwargs: timezone.now().date(),
+    cache=True,
+)
+def dashboard_trends(request, weeks: int = 13):
+    """Weekly interaction and completion counts for the last `weeks` weeks."""
+    if not 1 <= weeks <= MAX_BUCKETS:
+        raise HttpError(400, f"weeks must be between 1 and {MAX_BUCKETS}.")
     today = timezone.now().date()
-    current_monday = _monday_of(today)
-    start_monday = current_monday - timedelta(weeks=12)
-
-    # Build list of all week-start Mondays (13 entries: 12 past + current)
-    week_starts = [start_monday + timedelta(weeks=i) for i in range(13)]
-
-    # Interactions per week
-    interactions_qs = (
-        Interaction.objects.filter(date__gte=start_monday)
-        .extra(select={"week_start": "date(date, 'weekday 0', '-6 days')"})
-        .values("week_start")
-        .annotate(count=Count("id"))
+
+    # Week-start Mondays, oldest first, ending with the current week
+    week_starts = bucket_starts(ActivityCount.PERIOD_WEEK, weeks, today)
+    counts = activity_counts(
+        [ActivityCount.METRIC_INTERACTIONS, ActivityCount.METRIC_TASKS_COMPLETED],
+        ActivityCount.PERIOD_WEEK,
+        week_starts,
     )
-    interaction_counts = {row["week_start"]: row["count"] for row in interactions_qs}
 
     interactions_per_week = [
-        {"week_start": ws.isoformat(), "count": interaction_counts.get(ws.isoformat(), 0)}
-        for ws in week_starts
+        {"week_start": ws.isoformat(), "count": count}
+        for ws, count in zip(week_starts, counts[ActivityCount.METRIC_INTERACTIONS])
     ]
-
-    # Tasks completed per week
-    tasks_qs = (
-        Task.objects.filter(completed_at__isnull=False, completed_at__date__gte=start_monday)
-        .extra(select={"week_start": "date(completed_at, 'weekday 0', '-6 days')"})
-        .values("week_start")
-        .annotate(count=Count("id"))
-    )
-    task_counts = {row["week_start"]: row["count"] for row in tasks_qs}
-
     tasks_completed_per_week = [
-        {"week_start": ws.isoformat(), "count": task_counts.get(ws.isoformat(), 0)}
-        for ws in week_starts
+        {"week_start": ws.isoformat(), "count": count}
+        for ws, count in zip(week_starts, counts[ActivityCount.METRIC_TASKS_COMPLETED])
     ]
 
-    # Follow-up compliance
-    people_with_cadence = Person.objects.filter(
-        follow_up_cadence_days__isnull=False
-    ).annotate(
-        last_interaction=Max("interactions__date")
+    # Follow-up compliance: people never interacted with count as overdue.
+    # next_follow_up_due is set exactly when a person has a cadence.
+    compliance = Person.objects.filter(next_follow_up_due__isnull=False).aggregate(
+        total=Count("id"),
+        on_track=Count(
+            "id",
+            filter=Q(
+                last_interaction_date__isnull=False, next_follow_up_due__gte=today
+            ),
+        ),
     )
 
-    total = 0
-    on_track = 0
-    overdue_count = 0
-    for person in people_with_cadence:
-        total += 1
-        if person.last_interaction is None:
-            overdue_count += 1
-        else:
-            days_since = (today - person.last_interaction).days
-            if days_since > person.follow_up_cadence_days:
-                overdue_count += 1
-            else:
-                on_track += 1
-
     return {
         "interactions_per_week": interactions_per_week,
         "tasks_completed_per_week": tasks_completed_per_week,
         "follow_up_compliance": {
-            "on_track": on_track,
-            "total": total,
-            "overdue_count": overdue_count,
+            "on_track": compliance["on_track"],
+            "total": compliance["total"],
+            "overdue_count": compliance["total"] - compliance["on_track"],
         },
     }
 
 
+@router.get("/dashboard/activity/", response=ActivityResponse)
+@conditional_on(
+    ActivityCount,
+    Interaction,
+    Task,
+    TimeEntry,
+    extra=lambda request, **kwargs: timezone.now().date(),
+    cache=True,
+)
+def dashboard_activity(request, period: str = "week", count: int = 13):
+    """Completions, creations, interactions and time entries per bucket.
+
+    `period` is "day", "week" or "month"; the last `count` buckets are
+    returned oldest first, ending with the current one.
+    """
+    if period not in dict(ActivityCount.PERIOD_CHOICES):
+        raise HttpError(400, "period must be day, week or month.")
+    if not 1 <= count <= MAX_BUCKETS:
+        raise HttpError(400, f"count must be between 1 and {MAX_BUCKETS}.")
+
+    starts = bucket_starts(period, count, timezone.now().date())
+    metrics = [metric for metric, _label in ActivityCount.METRIC_CHOICES]
+    counts = activity_counts(metrics, period, starts)
+    return {
+        "period": period,
+        "buckets": [
+            {"start": start, **{metric: counts[metric][i] for metric in metrics}}
+            for i, start in enumerate(starts)
+        ],
+    }
+
+
 @router.get("/dashboard/follow-ups-due/", response=list[FollowUpDueItem])
 def follow_ups_due(request):
+    """People past their follow-up date, most overdue first.
+
+    A range scan of the next_follow_up_due index; people never interacted
+    with are due a cadence after they were added.
+    """
     today = timezone.now().date()
 
-    people_with_cadence = Person.objects.filter(
-        follow_up_cadence_days__isnull=False
-    ).annotate(
-        last_interaction=Max("interactions__date")
+    overdue = Person.objects.filter(next_follow_up_due__lt=today).order_by(
+        "next_follow_up_due", "id"
     )
-
-    results = []
-    for person in people_with_cadence:
-        if person.last_interaction is None:
-            days_since = (today - person.created_at.date()).days
-            days_overdue = days_since - person.follow_up_cadence_days
-        else:
-            days_since = (today - person.last_interaction).days
-            days_overdue = days_since - person.follow_up_cadence_days
-
-        if days_overdue > 0:
-            results.append({
-                "person_id": person.id,
-                "first_name": person.first_name,
-                "last_name": person.last_name,
-                "follow_up_cadence_days": person.follow_up_cadence_days,
-                "last_interaction_date": person.last_interaction.isoformat() if person.last_interaction else None,
-                "days_overdue": days_overdue,
-            })
-
-    results.sort(key=lambda x: x["days_overdue"], reverse=True)
-    return results
+    return [
+        {
+            "person_id": person.id,
+            "first_name": person.first_name,
+            "last_name": person.last_name,
+            "follow_up_cadence_days": person.follow_up_cadence_days,
+            "last_interaction_date": (
+                person.last_interaction_date.isoformat()
+                if person.last_interaction_date
+                else None
+            ),
+            "days_overdue": (today - person.next_follow_up_due).days,
+        }
+        for person in overdue
+    ]
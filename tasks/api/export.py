@@ -2,18 +2,55 @@ from __future__ import annotations
 
 import json
 
-from django.http import Http404, HttpResponse, HttpResponseBadRequest
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    StreamingHttpResponse,
+)
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from ninja import Router
 
 from tasks.models import List
-from tasks.services.full_export import export_full_database
+from tasks.services.full_export import export_full_database, iter_full_export_ndjson
+from tasks.services.snapshot import iter_gzip, open_snapshot
 from tasks.views.export import _export_response
 
 router = Router(tags=["export"])
 
 
 @router.get("/export/full/")
-def export_full(request):
+def export_full(request, format: str = "json", since: str = ""):
+    """Download every table as one JSON document.
+
+    `?format=ndjson` streams the same rows one line at a time instead, so
+    memory use does not grow with the database. `?since=<exported_at of an
+    earlier export>` returns only what changed after it, with tombstones
+    for deleted rows (JSON only).
+    """
+    if since:
+        since_dt = parse_datetime(since)
+        if since_dt is None or format != "json":
+            return HttpResponseBadRequest("Invalid incremental export request")
+        if timezone.is_naive(since_dt):
+            since_dt = timezone.make_aware(since_dt)
+        content = json.dumps(export_full_database(since=since_dt), indent=2)
+        response = HttpResponse(content, content_type="application/json")
+        response["Content-Disposition"] = (
+            'attachment; filename="nexus-backup-increment.json"'
+        )
+        return response
+    if format == "ndjson":
+        response = StreamingHttpResponse(
+            iter_full_export_ndjson(), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = 'attachment; filename="nexus-backup.ndjson"'
+        return response
+    if format != "json":
+        return HttpResponseBadRequest("Unsupported export format")
+
     data = export_full_database()
     content = json.dumps(data, indent=2)
     response = HttpResponse(content, content_type="application/json")
@@ -21,6 +58,34 @@ def export_full(request):
     return response
 
 
+@router.get("/export/snapshot/")
+def export_snapshot(request, compress: str = ""):
+    """Download a consistent copy of the SQLite database file.
+
+    Much faster to produce and restore (`manage.py restore_snapshot`) than
+    the JSON backup, and it carries every table. `?compress=gzip` streams
+    it gzip-compressed.
+    """
+    if compress not in {"", "gzip"}:
+        return HttpResponseBadRequest("Unsupported compression")
+
+    snapshot = open_snapshot()
+    if compress == "gzip":
+        response = StreamingHttpResponse(
+            iter_gzip(snapshot), content_type="application/gzip"
+        )
+        response["Content-Disposition"] = (
+            'attachment; filename="nexus-snapshot.sqlite3.gz"'
+        )
+        return response
+    return FileResponse(
+        snapshot,
+        as_attachment=True,
+        filename="nexus-snapshot.sqlite3",
+        content_type="application/vnd.sqlite3",
+    )
+
+
 def _normalize_format(fmt: str) -> str:
     normalized = fmt.lower()
     if normalized == "markdown":
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from ninja import Router
+from ninja.errors import HttpError
+
+from tasks import jobs
+from tasks.api.schemas import JobSchema
+from tasks.models import Job
+from tasks.services.upload_import import UnsupportedUpload
+
+router = Router(tags=["jobs"])
+
+
+@router.post("/jobs/import/", response={202: JobSchema})
+def create_import_job(request):
+    """Queue an upload for import; poll the returned job for its stats."""
+    uploaded = request.FILES.get("file") or request.FILES.get("csv_file")
+    if not uploaded:
+        raise HttpError(400, "Please provide a file upload.")
+    try:
+        job = jobs.submit_import(uploaded)
+    except UnsupportedUpload as e:
+        raise HttpError(400, str(e))
+    return 202, job
+
+
+@router.post("/jobs/export/", response={202: JobSchema})
+def create_export_job(request, format: str = "json"):
+    """Queue a full export; download it from the job once it succeeds."""
+    if format not in jobs.EXPORT_FORMATS:
+        raise HttpError(400, "Unsupported export format.")
+    return 202, jobs.submit_export(format)
+
+
+@router.get("/jobs/{job_id}/", response=JobSchema)
+def get_job(request, job_id: int):
+    return get_object_or_404(Job, pk=job_id)
+
+
+@router.get("/jobs/{job_id}/download/")
+def download_job_result(request, job_id: int):
+    job = get_object_or_404(Job, pk=job_id)
+    if job.status != Job.STATUS_SUCCEEDED or not job.result_name:
+        raise HttpError(404, "This job has no file to download.")
+    path = jobs.jobs_dir() / job.result_name
+    if not path.exists():
+        raise HttpError(404, "This job has no file to download.")
+    extension = path.suffix
+    return FileResponse(
+        open(path, "rb"),
+        as_attachment=True,
+        filename=f"nexus-backup{extension}",
+        content_type=(
+            "application/x-ndjson" if extension == ".ndjson" else "application/json"
+        ),
+    )
@@ -11,57 +11,28 @@ from tasks.api.schemas import (
     ListUpdateInput,
     MoveInput,
     SectionSchema,
-    TagSchema,
     TaskSchema,
 )
-from tasks.models import List, Project, Section, Task
-from tasks.views.reorder import reorder_siblings
+from tasks.api.task_tree import serialize_section_trees, serialize_task_tree
+from tasks.models import List, Project, Section, Tag, Task
+from tasks.versioning import conditional_on
+from tasks.views.reorder import POSITION_GAP, InvalidAnchorError, move_to
 
 router = Router(tags=["lists"])
 
 
 def _serialize_task(task: Task) -> TaskSchema:
-    subtasks = [
-        _serialize_task(subtask)
-        for subtask in task.subtasks.order_by("position").all()
-    ]
-    return TaskSchema(
-        id=task.id,
-        section_id=task.section_id,
-        parent_id=task.parent_id,
-        title=task.title,
-        notes=task.notes,
-        due_date=task.due_date,
-        due_time=task.due_time,
-        is_completed=task.is_completed,
-        completed_at=task.completed_at,
-        created_at=task.created_at,
-        position=task.position,
-        external_id=task.external_id,
-        is_pinned=task.is_pinned,
-        tags=[TagSchema(id=tag.id, name=tag.name) for tag in task.tags.all()],
-        subtasks=subtasks,
-        recurrence_type=task.recurrence_type,
-        recurrence_rule=task.recurrence_rule,
-    )
+    return serialize_task_tree(task)
 
 
 def _serialize_section(section: Section) -> SectionSchema:
-    top_level_tasks = section.tasks.filter(parent__isnull=True).order_by("position")
-    return SectionSchema(
-        id=section.id,
-        list_id=section.list_id,
-        name=section.name,
-        emoji=section.emoji,
-        position=section.position,
-        tasks=[_serialize_task(task) for task in top_level_tasks],
-    )
+    return serialize_section_trees([section])[0]
 
 
 def _serialize_list(task_list: List, include_sections: bool = False) -> ListSchema:
     sections: list[SectionSchema] = []
     if include_sections:
-        sections = [_serialize_section(section) for section in task_list.sections.order_by("position")]
+        sections = serialize_section_trees(task_list.sections.order_by("position"))
     return ListSchema(
         id=task_list.id,
         name=task_list.name,
@@ -74,6 +45,7 @@ def _serialize_list(task_list: List, include_sections: bool = False) -> ListSche
 
 
 @router.get("/lists/", response=list[ListSchema])
+@conditional_on(List)
 def get_lists(request):
     lists = List.objects.order_by("position")
     return [_serialize_list(task_list) for task_list in lists]
@@ -94,12 +66,13 @@ def create_list(request, payload: ListCreateInput):
         name=name,
         emoji=payload.emoji.strip(),
         project=project,
-        position=max_pos + 10,
+        position=max_pos + POSITION_GAP,
     )
     return 201, _serialize_list(task_list)
 
 
 @router.get("/lists/{list_id}/", response=ListSchema)
+@conditional_on(List, Section, Task, Task.tags.through, Tag, cache=True)
 def get_list_detail(request, list_id: int):
     task_list = get_object_or_404(List.objects.order_by("position"), pk=list_id)
     return _serialize_list(task_list, include_sections=True)
@@ -140,6 +113,8 @@ def delete_list(request, list_id: int):
 @router.patch("/lists/{list_id}/move/", response=ListSchema)
 def move_list(request, list_id: int, payload: MoveInput):
     task_list = get_object_or_404(List, pk=list_id)
-    reorder_siblings(task_list, List.objects.all(), payload.position)
-    task_list.refresh_from_db()
+    try:
+        move_to(task_list, List.objects.all(), payload.position, payload.after_id, payload.before_id)
+    except InvalidAnchorError as e:
+        raise HttpError(422, str(e))
     return _serialize_list(task_list)
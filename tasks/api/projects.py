@@ -1,29 +1,41 @@
 from __future__ import annotations
 
 from django.db import models
-from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from ninja import Router
 from ninja.errors import HttpError
 
-from tasks.api.schemas import ProjectCreateInput, ProjectLinkSchema, ProjectSchema, ProjectUpdateInput, TaskSchema
-from tasks.api.tasks import _serialize_task
-from tasks.models import Project, Task
+from tasks.api.schemas import (
+    MoveInput,
+    ProjectCreateInput,
+    ProjectLinkSchema,
+    ProjectSchema,
+    ProjectUpdateInput,
+    TaskSchema,
+)
+from tasks.api.task_tree import build_task_nodes
+from tasks.models import (
+    List,
+    Project,
+    ProjectLink,
+    ProjectStats,
+    Section,
+    Task,
+    TimeEntry,
+)
+from tasks.versioning import conditional_on
+from tasks.views.reorder import POSITION_GAP, InvalidAnchorError, move_to
 
 router = Router(tags=["projects"])
 
 
 def _project_queryset():
-    return Project.objects.annotate(
-        total_hours=models.Count("time_entries", distinct=True),
-        linked_lists_count=models.Count("lists", distinct=True),
-        total_tasks=models.Count("lists__sections__tasks", distinct=True),
-        completed_tasks=models.Count(
-            "lists__sections__tasks",
-            filter=Q(lists__sections__tasks__is_completed=True),
-            distinct=True,
-        ),
-    ).prefetch_related("links").order_by("position")
+    # The counts come from ProjectStats, which triggers keep current.
+    return (
+        Project.objects.select_related("stats")
+        .prefetch_related("links")
+        .order_by("position")
+    )
 
 
 def _serialize_project(project: Project) -> ProjectSchema:
@@ -37,21 +49,25 @@ def _serialize_project(project: Project) -> ProjectSchema:
         )
         for link in project.links.all()
     ]
+    stats = getattr(project, "stats", None) or ProjectStats(project=project)
     return ProjectSchema(
         id=project.id,
         name=project.name,
         description=project.description,
         is_active=project.is_active,
         position=project.position,
-        total_hours=float(getattr(project, "total_hours", 0)),
-        linked_lists_count=getattr(project, "linked_lists_count", 0),
-        total_tasks=getattr(project, "total_tasks", 0),
-        completed_tasks=getattr(project, "completed_tasks", 0),
+        total_hours=float(stats.time_entry_count),
+        linked_lists_count=stats.list_count,
+        total_tasks=stats.task_count,
+        completed_tasks=stats.completed_task_count,
         links=links,
     )
 
 
 @router.get("/projects/", response=list[ProjectSchema])
+@conditional_on(
+    Project, ProjectLink, ProjectStats, List, Section, Task, TimeEntry, cache=True
+)
 def get_projects(request):
     return [_serialize_project(project) for project in _project_queryset()]
 
@@ -66,7 +82,7 @@ def create_project(request, payload: ProjectCreateInput):
     project = Project.objects.create(
         name=name,
         description=payload.description.strip(),
-        position=max_position + 10,
+        position=max_position + POSITION_GAP,
     )
     project = _project_queryset().get(pk=project.id)
     return 201, _serialize_project(project)
@@ -107,13 +123,21 @@ def toggle_project(request, project_id: int):
     return _serialize_project(project)
 
 
+@router.patch("/projects/{project_id}/move/", response=ProjectSchema)
+def move_project(request, project_id: int, payload: MoveInput):
+    project = get_object_or_404(Project, pk=project_id)
+    try:
+        move_to(project, Project.objects.all(), payload.position, payload.after_id, payload.before_id)
+    except InvalidAnchorError as e:
+        raise HttpError(422, str(e))
+    project = _project_queryset().get(pk=project.id)
+    return _serialize_project(project)
+
+
 @router.get("/projects/{project_id}/tasks/", response=list[TaskSchema])
 def get_project_tasks(request, project_id: int):
     project = get_object_or_404(Project, pk=project_id)
-    tasks = (
-        Task.objects.filter(section__list__project=project, is_completed=False)
-        .select_related("section")
-        .prefetch_related("tags", "subtasks")
-        .order_by("section__position", "position")
+    nodes = build_task_nodes(
+        Task.objects.filter(section__list__project=project).order_by("section__position", "position", "id")
     )
-    return [_serialize_task(task) for task in tasks]
+    return [node for node in nodes.values() if not node.is_completed]
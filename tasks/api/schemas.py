@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import date, datetime, time
+from typing import Literal
 
 from ninja import Schema
 
@@ -95,11 +96,33 @@ class TaskUpdateInput(Schema):
 
 class TaskMoveInput(Schema):
     position: int | None = None
+    after_id: int | None = None
+    before_id: int | None = None
     section_id: int | None = None
     parent_id: int | None = None
     list_id: int | None = None
 
 
+class BulkTaskOperation(Schema):
+    action: Literal[
+        "complete", "uncomplete", "move", "add_tag", "remove_tag", "pin", "unpin", "delete"
+    ]
+    task_ids: list[int]
+    section_id: int | None = None
+    tag_name: str | None = None
+    tag_id: int | None = None
+
+
+class BulkTaskInput(Schema):
+    operations: list[BulkTaskOperation]
+
+
+class BulkTaskResult(Schema):
+    tasks: list[TaskSchema] = []
+    deleted_ids: list[int] = []
+    next_occurrence_ids: dict[int, int] = {}
+
+
 class SectionSchema(Schema):
     id: int
     list_id: int
@@ -142,7 +165,9 @@ class ListUpdateInput(Schema):
 
 
 class MoveInput(Schema):
-    position: int
+    position: int | None = None
+    after_id: int | None = None
+    before_id: int | None = None
 
 
 class UpcomingTaskSchema(Schema):
@@ -157,6 +182,7 @@ class UpcomingTaskSchema(Schema):
     section_id: int
     section_name: str
     tags: list[str] = []
+    is_projected: bool = False
 
 
 class TimeEntrySchema(Schema):
@@ -196,6 +222,19 @@ class TrendsResponse(Schema):
     follow_up_compliance: FollowUpCompliance
 
 
+class ActivityBucket(Schema):
+    start: date
+    tasks_completed: int
+    tasks_created: int
+    interactions: int
+    time_entries: int
+
+
+class ActivityResponse(Schema):
+    period: str
+    buckets: list[ActivityBucket]
+
+
 class FollowUpDueItem(Schema):
     person_id: int
     first_name: str
@@ -203,3 +242,36 @@ class FollowUpDueItem(Schema):
     follow_up_cadence_days: int
     last_interaction_date: str | None
     days_overdue: int
+
+
+class ChangeSchema(Schema):
+    entity_type: str
+    id: int
+    action: str
+    data: dict | None = None
+
+
+class ChangesResponse(Schema):
+    cursor: int
+    has_more: bool
+    changes: list[ChangeSchema]
+
+
+class JobSchema(Schema):
+    id: int
+    kind: str
+    status: str
+    progress_done: int
+    progress_total: int
+    result: dict | None = None
+    error: str
+    download_url: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @staticmethod
+    def resolve_download_url(obj):
+        if obj.status != "succeeded" or not obj.result_name:
+            return None
+        return f"/api/jobs/{obj.id}/download/"
@@ -1,33 +1,94 @@
 from __future__ import annotations
 
-from django.db.models import Q
+import re
+
+from django.db import connection
+from django.utils.html import escape
 from ninja import Router
 
 from tasks.models import Task
 
 router = Router(tags=["search"])
 
+MAX_SEARCH_LIMIT = 200
+MAX_SEARCH_ALL_LIMIT = 50
+
+# Entity types held in the global search_index table.
+SEARCH_KINDS = ("task", "person", "organization", "interaction", "lead", "page")
+
+# bm25 column weights for (title, notes, tags): a hit in the title outranks
+# a tag hit, which outranks a hit buried in the notes.
+_BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+# FTS5 wraps matches in these markers; they are swapped for <mark> tags only
+# after the surrounding text has been HTML-escaped.
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_match_query(query: str) -> str:
+    """Turn free text into an FTS5 query that prefix-matches every word.
+
+    Each word is quoted, so FTS5 operators typed by the user are searched
+    for literally instead of being interpreted.
+    """
+    return " ".join(f'"{term}"*' for term in _TERM_RE.findall(query))
+
+
+def highlight_marks(text: str | None) -> str:
+    return escape(text or "").replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def _ranked_matches(match: str, limit: int, offset: int) -> tuple[int, list[tuple[int, str, str]]]:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM tasks_task_fts WHERE tasks_task_fts MATCH %s", [match])
+        total_count = cursor.fetchone()[0]
+        cursor.execute(
+            f"""
+            SELECT rowid,
+                   highlight(tasks_task_fts, 0, %s, %s),
+                   snippet(tasks_task_fts, 1, %s, %s, '…', 16)
+            FROM tasks_task_fts
+            WHERE tasks_task_fts MATCH %s
+            ORDER BY bm25(tasks_task_fts, {", ".join(map(str, _BM25_WEIGHTS))}), rowid
+            LIMIT %s OFFSET %s
+            """,
+            [_MARK_START, _MARK_END, _MARK_START, _MARK_END, match, limit, offset],
+        )
+        return total_count, cursor.fetchall()
+
 
 @router.get("/search/")
-def search_tasks(request, q: str = ""):
+def search_tasks(request, q: str = "", limit: int = 50, offset: int = 0):
+    """Search tasks, ranked and grouped by list, one page at a time.
+
+    `next_offset` is the offset of the following page, or null on the last.
+    """
     query = q.strip()
-    if not query:
-        return {"query": "", "total_count": 0, "results": []}
-
-    matched_tasks = (
-        Task.objects.filter(
-            Q(title__icontains=query)
-            | Q(notes__icontains=query)
-            | Q(tags__name__icontains=query)
-        )
-        .select_related("section__list")
-        .prefetch_related("tags")
-        .distinct()
-        .order_by("section__list__position", "section__position", "position")
-    )
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    offset = max(0, offset)
+    match = fts_match_query(query)
+    if not match:
+        return {
+            "query": query,
+            "total_count": 0,
+            "limit": limit,
+            "offset": offset,
+            "next_offset": None,
+            "results": [],
+        }
+
+    total_count, rows = _ranked_matches(match, limit, offset)
+    tasks = Task.objects.select_related("section__list").prefetch_related("tags").in_bulk([row[0] for row in rows])
 
+    # Groups follow the rank of their best task; tasks keep their rank within a group.
     grouped: dict[int, dict] = {}
-    for task in matched_tasks:
+    for task_id, title_highlight, notes_snippet in rows:
+        task = tasks.get(task_id)
+        if task is None:
+            continue
         list_obj = task.section.list
         if list_obj.id not in grouped:
             grouped[list_obj.id] = {
@@ -40,11 +101,89 @@ def search_tasks(request, q: str = ""):
                 "title": task.title,
                 "section_name": task.section.name,
                 "tags": [tag.name for tag in task.tags.all()],
+                "title_highlight": highlight_marks(title_highlight),
+                "snippet": highlight_marks(notes_snippet) if _MARK_START in (notes_snippet or "") else "",
             }
         )
 
     return {
         "query": query,
-        "total_count": matched_tasks.count(),
+        "total_count": total_count,
+        "limit": limit,
+        "offset": offset,
+        "next_offset": offset + len(rows) if offset + len(rows) < total_count else None,
         "results": list(grouped.values()),
     }
+
+
+def _kind_facets(match: str, kinds: tuple[str, ...]) -> dict[str, int]:
+    placeholders = ", ".join(["%s"] * len(kinds))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT kind, count(*) FROM search_index
+            WHERE search_index MATCH %s AND kind IN ({placeholders})
+            GROUP BY kind
+            """,
+            [match, *kinds],
+        )
+        return dict(cursor.fetchall())
+
+
+def _kind_hits(match: str, kind: str, limit: int, offset: int) -> list[tuple]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT rowid / 8, title, highlight(search_index, 1, %s, %s),
+                   snippet(search_index, 2, %s, %s, '…', 16), bm25(search_index, 0.0, 10.0, 1.0) AS score
+            FROM search_index
+            WHERE search_index MATCH %s AND kind = %s
+            ORDER BY score, rowid
+            LIMIT %s OFFSET %s
+            """,
+            [_MARK_START, _MARK_END, _MARK_START, _MARK_END, match, kind, limit, offset],
+        )
+        return cursor.fetchall()
+
+
+@router.get("/search/all/")
+def search_all(request, q: str = "", types: str = "", limit: int = 5, offset: int = 0):
+    """Search every indexed entity, returning ranked hits grouped by entity type.
+
+    `types` is a comma-separated subset of SEARCH_KINDS; `limit` and `offset`
+    page within each group, and `facets` counts every match per type.
+    """
+    query = q.strip()
+    limit = max(1, min(limit, MAX_SEARCH_ALL_LIMIT))
+    offset = max(0, offset)
+    kinds = tuple(kind for kind in SEARCH_KINDS if not types or kind in types.split(","))
+    match = fts_match_query(query)
+    if not match or not kinds:
+        return {"query": query, "total_count": 0, "facets": {}, "groups": []}
+
+    facets = _kind_facets(match, kinds)
+    groups = []
+    for kind in kinds:
+        if not facets.get(kind):
+            continue
+        rows = _kind_hits(match, kind, limit, offset)
+        hits = [
+            {
+                "id": entity_id,
+                "title": title,
+                "title_highlight": highlight_marks(title_highlight),
+                "snippet": highlight_marks(body_snippet) if _MARK_START in (body_snippet or "") else "",
+            }
+            for entity_id, title, title_highlight, body_snippet, _score in rows
+        ]
+        best_score = rows[0][4] if rows else 0.0
+        groups.append((best_score, {"entity_type": kind, "count": facets[kind], "hits": hits}))
+    # bm25 scores are negative; the group holding the strongest hit comes first.
+    groups.sort(key=lambda item: item[0])
+
+    return {
+        "query": query,
+        "total_count": sum(facets.values()),
+        "facets": facets,
+        "groups": [group for _score, group in groups],
+    }
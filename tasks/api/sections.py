@@ -8,7 +8,7 @@ from ninja.errors import HttpError
 from tasks.api.lists import _serialize_section
 from tasks.api.schemas import MoveInput, SectionCreateInput, SectionSchema, SectionUpdateInput
 from tasks.models import List, Section
-from tasks.views.reorder import reorder_siblings
+from tasks.views.reorder import POSITION_GAP, InvalidAnchorError, move_to
 
 router = Router(tags=["sections"])
 
@@ -25,7 +25,7 @@ def create_section(request, list_id: int, payload: SectionCreateInput):
         list=task_list,
         name=name,
         emoji=payload.emoji.strip(),
-        position=max_position + 10,
+        position=max_position + POSITION_GAP,
     )
     return 201, _serialize_section(section)
 
@@ -56,6 +56,8 @@ def delete_section(request, section_id: int):
 @router.patch("/sections/{section_id}/move/", response=SectionSchema)
 def move_section(request, section_id: int, payload: MoveInput):
     section = get_object_or_404(Section, pk=section_id)
-    reorder_siblings(section, section.list.sections.all(), payload.position)
-    section.refresh_from_db()
+    try:
+        move_to(section, section.list.sections.all(), payload.position, payload.after_id, payload.before_id)
+    except InvalidAnchorError as e:
+        raise HttpError(422, str(e))
     return _serialize_section(section)
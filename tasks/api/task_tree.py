@@ -0,0 +1,111 @@
+"""Single-pass task tree loading.
+
+Every task in scope is fetched with one flat query and every tag with one
+more; the nested ``TaskSchema``/``SectionSchema`` tree is then assembled in
+memory, so the query count does not grow with the size or depth of a list.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.db.models import Q, QuerySet
+
+from tasks.api.schemas import SectionSchema, TagSchema, TaskSchema
+from tasks.models import Section, Task
+
+
+def _tags_by_task(tasks: QuerySet[Task]) -> dict[int, list[TagSchema]]:
+    rows = (
+        Task.tags.through.objects.filter(task_id__in=tasks.values("id"))
+        .order_by("id")
+        .values_list("task_id", "tag_id", "tag__name")
+    )
+    tags: dict[int, list[TagSchema]] = defaultdict(list)
+    for task_id, tag_id, tag_name in rows:
+        tags[task_id].append(TagSchema(id=tag_id, name=tag_name))
+    return tags
+
+
+def _task_node(task: Task, tags: list[TagSchema]) -> TaskSchema:
+    return TaskSchema(
+        id=task.id,
+        section_id=task.section_id,
+        parent_id=task.parent_id,
+        title=task.title,
+        notes=task.notes,
+        due_date=task.due_date,
+        due_time=task.due_time,
+        is_completed=task.is_completed,
+        completed_at=task.completed_at,
+        created_at=task.created_at,
+        position=task.position,
+        external_id=task.external_id,
+        is_pinned=task.is_pinned,
+        tags=tags,
+        subtasks=[],
+        recurrence_type=task.recurrence_type,
+        recurrence_rule=task.recurrence_rule,
+    )
+
+
+def build_task_nodes(tasks: QuerySet[Task]) -> dict[int, TaskSchema]:
+    """Serialize every task in `tasks` and link each one under its parent.
+
+    Runs exactly two queries. The returned dict follows the queryset's
+    order, and subtasks are attached in that same order, so callers should
+    pass a queryset ordered by position within each sibling group.
+    """
+    tags = _tags_by_task(tasks)
+    rows = list(tasks)
+    nodes = {task.id: _task_node(task, tags.get(task.id, [])) for task in rows}
+    for task in rows:
+        parent = nodes.get(task.parent_id)
+        if parent is not None:
+            parent.subtasks.append(nodes[task.id])
+    return nodes
+
+
+def flat_task_nodes(tasks: QuerySet[Task]) -> dict[int, TaskSchema]:
+    """Serialize every task in `tasks` on its own, without nesting subtasks."""
+    tags = _tags_by_task(tasks)
+    return {task.id: _task_node(task, tags.get(task.id, [])) for task in tasks}
+
+
+def subtree_nodes(task: Task, extra_ids: Iterable[int] = ()) -> dict[int, TaskSchema]:
+    """Load the nodes of `task`, its descendants and the tasks in `extra_ids`.
+
+    Descendants are matched on indexed `path` ranges, so only the subtree is
+    read rather than the whole section.
+    """
+    scope = Q(pk__in=[task.pk, *extra_ids]) | Task.descendants_q([task])
+    return build_task_nodes(Task.objects.filter(scope).order_by("position", "id"))
+
+
+def serialize_task_tree(task: Task) -> TaskSchema:
+    """Serialize `task` with its full subtask tree in a fixed number of queries."""
+    return subtree_nodes(task)[task.id]
+
+
+def serialize_section_trees(sections: Iterable[Section]) -> list[SectionSchema]:
+    """Serialize sections with their nested task trees in two queries."""
+    sections = list(sections)
+    nodes = build_task_nodes(
+        Task.objects.filter(section__in=[section.id for section in sections]).order_by("position", "id")
+    )
+    top_level: dict[int, list[TaskSchema]] = defaultdict(list)
+    for node in nodes.values():
+        if node.parent_id is None:
+            top_level[node.section_id].append(node)
+    return [
+        SectionSchema(
+            id=section.id,
+            list_id=section.list_id,
+            name=section.name,
+            emoji=section.emoji,
+            position=section.position,
+            tasks=top_level.get(section.id, []),
+        )
+        for section in sections
+    ]
@@ -2,32 +2,46 @@ from __future__ import annotations
 
 from html import escape
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from ninja import Router
 from ninja.errors import HttpError
 
 from tasks.api.lists import _serialize_task
 from tasks.api.schemas import TaskCreateInput, TaskMoveInput, TaskSchema, TaskUpdateInput
-from tasks.models import List, Section, Task
-from tasks.views.reorder import reorder_siblings
+from tasks.api.task_tree import subtree_nodes
+from tasks.models import ChangeLogEntry, List, Section, Task
+from tasks.views.reorder import POSITION_GAP, InvalidAnchorError, move_to
 
 router = Router(tags=["tasks"])
 
 MAX_PINNED_PER_LIST = 3
 
 
-def _descendants(task: Task):
-    for child in task.subtasks.all():
-        yield child
-        yield from _descendants(child)
-
-
-def _update_subtask_sections(task: Task, section: Section):
-    for subtask in task.subtasks.all():
-        subtask.section = section
-        subtask.save(update_fields=["section"])
-        _update_subtask_sections(subtask, section)
+def check_pin_limit(new_pins: dict[int, int]) -> None:
+    """Raise 409 if pinning `new_pins` (list id -> open task count) passes the limit."""
+    pinned = dict(
+        Task.objects.filter(section__list_id__in=new_pins, is_pinned=True, is_completed=False)
+        .values("section__list_id")
+        .annotate(count=models.Count("id"))
+        .values_list("section__list_id", "count")
+    )
+    for list_id, count in new_pins.items():
+        if count and pinned.get(list_id, 0) + count > MAX_PINNED_PER_LIST:
+            raise HttpError(409, "Maximum pinned task limit reached for this list.")
+
+
+def check_move_pin_limit(tasks: list[Task], list_id: int) -> None:
+    """Raise 409 if moving the subtrees of `tasks` into list `list_id` passes the pin limit."""
+    moving = (
+        Task.objects.filter(Q(pk__in=[task.pk for task in tasks]) | Task.descendants_q(tasks))
+        .filter(is_pinned=True, is_completed=False)
+        .exclude(section__list_id=list_id)
+        .count()
+    )
+    if moving:
+        check_pin_limit({list_id: moving})
 
 
 @router.post("/sections/{section_id}/tasks/", response={201: TaskSchema})
@@ -53,7 +67,7 @@ def create_task(request, section_id: int, payload: TaskCreateInput):
         section=section,
         parent=parent,
         title=title,
-        position=max_position + 10,
+        position=max_position + POSITION_GAP,
         **({"due_date": payload.due_date} if payload.due_date is not None else {}),
     )
     return 201, _serialize_task(task)
@@ -119,12 +133,12 @@ def delete_task(request, task_id: int):
 def complete_task(request, task_id: int):
     task = get_object_or_404(Task, pk=task_id)
     next_occurrence_id = task.complete()
-    task.refresh_from_db()
-    result = _serialize_task(task)
+    # The next occurrence has no subtasks, so one load covers both trees.
+    nodes = subtree_nodes(task, [next_occurrence_id] if next_occurrence_id else [])
+    result = nodes[task.id]
     result.next_occurrence_id = next_occurrence_id
     if next_occurrence_id is not None:
-        next_task = get_object_or_404(Task, pk=next_occurrence_id)
-        result.next_occurrence = _serialize_task(next_task)
+        result.next_occurrence = nodes[next_occurrence_id]
     return result
 
 
@@ -138,8 +152,11 @@ def uncomplete_task(request, task_id: int):
 
 @router.patch("/tasks/{task_id}/move/", response=TaskSchema)
 def move_task(request, task_id: int, payload: TaskMoveInput):
-    task = get_object_or_404(Task, pk=task_id)
+    task = get_object_or_404(Task.objects.select_related("section"), pk=task_id)
     fields_set = payload.model_fields_set
+    original_list_id = task.section.list_id
+    original_section_id = task.section_id
+    original_parent_id = task.parent_id
 
     if "list_id" in fields_set and payload.list_id is not None:
         target_list = get_object_or_404(List, pk=payload.list_id)
@@ -148,31 +165,36 @@ def move_task(request, task_id: int, payload: TaskMoveInput):
             raise HttpError(400, "Target list has no sections.")
         task.section = target_section
         task.parent = None
-        _update_subtask_sections(task, target_section)
 
     if "section_id" in fields_set and payload.section_id is not None:
-        section = get_object_or_404(Section, pk=payload.section_id)
-        task.section = section
-        _update_subtask_sections(task, section)
+        task.section = get_object_or_404(Section, pk=payload.section_id)
 
     if "parent_id" in fields_set:
         if payload.parent_id is None:
             task.parent = None
         else:
             new_parent = get_object_or_404(Task, pk=payload.parent_id)
-            descendant_ids = {descendant.id for descendant in _descendants(task)}
-            if new_parent.id in descendant_ids:
+            if new_parent.id == task.id or task.is_ancestor_of(new_parent):
                 raise HttpError(409, "Cannot nest a task under its own descendant.")
             task.parent = new_parent
             task.section = new_parent.section
-            _update_subtask_sections(task, new_parent.section)
 
-    task.save()
+    if task.section.list_id != original_list_id:
+        check_move_pin_limit([task], task.section.list_id)
+
+    with transaction.atomic():
+        if task.section_id != original_section_id or task.parent_id != original_parent_id:
+            task.save()
+        if task.section_id != original_section_id:
+            descendant_ids = list(task.descendants().values_list("id", flat=True))
+            Task.objects.filter(pk__in=descendant_ids).update(section=task.section)
+            ChangeLogEntry.record(Task, descendant_ids)
 
-    if "position" in fields_set and payload.position is not None:
         siblings = Task.objects.filter(section=task.section, parent=task.parent)
-        reorder_siblings(task, siblings, payload.position)
-        task.refresh_from_db()
+        try:
+            move_to(task, siblings, payload.position, payload.after_id, payload.before_id)
+        except InvalidAnchorError as e:
+            raise HttpError(422, str(e))
 
     return _serialize_task(task)
 
@@ -187,11 +209,7 @@ def pin_task(request, task_id: int):
         task.save(update_fields=["is_pinned"])
         return _serialize_task(task)
 
-    pinned_count = Task.objects.filter(
-        section__list=task_list, is_pinned=True, is_completed=False
-    ).count()
-    if pinned_count >= MAX_PINNED_PER_LIST:
-        raise HttpError(409, "Maximum pinned task limit reached for this list.")
+    check_pin_limit({task_list.id: 1})
 
     task.is_pinned = True
     task.save(update_fields=["is_pinned"])
@@ -1,16 +1,41 @@
 from __future__ import annotations
 
+from datetime import date, time, timedelta
+
 from django.db.models import F, Q
 from ninja import Router
+from ninja.errors import HttpError
 
 from tasks.api.schemas import UpcomingTaskSchema
 from tasks.models import Task
+from tasks.services.recurrence import project_occurrences
 
 router = Router(tags=["upcoming"])
 
+# A daily task yields one projected row per day, so keep the window bounded.
+MAX_PROJECTION_DAYS = 366
+
+
+def _sort_key(row):
+    return (
+        row["due_date"] is None,
+        row["due_date"] or date.min,
+        row["due_time"] is None,
+        row["due_time"] or time.min,
+    )
+
 
 @router.get("/upcoming/", response=list[UpcomingTaskSchema])
-def upcoming_tasks(request):
+def upcoming_tasks(request, until: date | None = None):
+    """Open tasks with a due date, and pinned ones.
+
+    With `?until=YYYY-MM-DD`, recurring tasks are followed by their future
+    occurrences up to that date, computed from the rule and flagged
+    `is_projected`; they share the id of the task they recur from.
+    """
+    if until is not None and until > date.today() + timedelta(days=MAX_PROJECTION_DAYS):
+        raise HttpError(400, f"until must be within {MAX_PROJECTION_DAYS} days.")
+
     tasks = (
         Task.objects.filter(
             Q(due_date__isnull=False) | Q(is_pinned=True),
@@ -21,8 +46,9 @@ def upcoming_tasks(request):
         .order_by(F("due_date").asc(nulls_last=True), F("due_time").asc(nulls_last=True))
     )
 
-    return [
-        {
+    rows = []
+    for t in tasks:
+        row = {
             "id": t.id,
             "title": t.title,
             "due_date": t.due_date,
@@ -35,5 +61,16 @@ def upcoming_tasks(request):
             "section_name": t.section.name,
             "tags": [tag.name for tag in t.tags.all()],
         }
-        for t in tasks
-    ]
+        rows.append(row)
+        recurring = t.recurrence_type != Task.RECURRENCE_NONE
+        if until is not None and t.due_date and recurring:
+            rows.extend(
+                {**row, "due_date": due_date, "is_projected": True}
+                for due_date in project_occurrences(
+                    t.recurrence_type, t.recurrence_rule, t.due_date, until
+                )
+            )
+
+    if until is not None:
+        rows.sort(key=_sort_key)
+    return rows
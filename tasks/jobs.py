@@ -0,0 +1,176 @@
+"""Background imports and exports, run by `manage.py run_jobs`.
+
+A request only records a Job (and stores its upload under JOBS_DIR), then
+returns. The worker process claims queued jobs one at a time, so a long
+import or export never holds a gunicorn worker. Clients poll the job for
+status, progress and result.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from tasks.models import Job
+from tasks.services.full_export import export_full_database, iter_full_export_ndjson
+from tasks.services.upload_import import check_upload_name, import_upload
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {"json", "ndjson"}
+
+# Finished jobs and their files are removed after this long.
+RETENTION = timedelta(days=7)
+
+
+def jobs_dir() -> Path:
+    path = Path(settings.JOBS_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def submit_import(uploaded) -> Job:
+    """Queue an import of `uploaded`; raises UnsupportedUpload for unknown types."""
+    ext = check_upload_name(uploaded.name)
+    # Written before the row exists, so no transaction is held open while the
+    # upload streams and the worker never sees a job without its file.
+    destination = tempfile.NamedTemporaryFile(
+        dir=jobs_dir(), prefix="input-", suffix=ext, delete=False
+    )
+    path = Path(destination.name)
+    try:
+        with destination:
+            for chunk in uploaded.chunks():
+                destination.write(chunk)
+        return Job.objects.create(
+            kind=Job.KIND_IMPORT,
+            params={"filename": uploaded.name},
+            input_name=path.name,
+        )
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+
+def submit_export(export_format: str) -> Job:
+    """Queue a full-database export as "json" or "ndjson"."""
+    return Job.objects.create(kind=Job.KIND_EXPORT, params={"format": export_format})
+
+
+def _set_progress(job, done, total):
+    job.progress_done, job.progress_total = done, total
+    job.save(update_fields=["progress_done", "progress_total"])
+
+
+def _run_import(job):
+    # The import runs in one transaction, which also hides any progress
+    # written from inside it, so an import reports only its status.
+    path = jobs_dir() / job.input_name
+    if path.suffix == ".ndjson":
+        # Streamed: the reader takes the backup one line at a time.
+        with open(path, "rb") as content:
+            job.result = import_upload(job.params["filename"], content)
+    else:
+        job.result = import_upload(job.params["filename"], path.read_bytes())
+
+
+def _run_export(job):
+    export_format = job.params.get("format", "json")
+    job.result_name = f"{job.pk}-nexus-backup.{export_format}"
+    path = jobs_dir() / job.result_name
+    partial = path.with_suffix(".partial")
+
+    def progress(done, total):
+        _set_progress(job, done, total)
+
+    try:
+        with open(partial, "w", encoding="utf-8") as destination:
+            if export_format == "ndjson":
+                destination.writelines(iter_full_export_ndjson(progress=progress))
+            else:
+                json.dump(export_full_database(), destination, indent=2)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    os.replace(partial, path)
+
+
+HANDLERS = {
+    Job.KIND_IMPORT: _run_import,
+    Job.KIND_EXPORT: _run_export,
+}
+
+
+def claim_next_job() -> Job | None:
+    """Mark the oldest queued job as running and return it."""
+    while True:
+        job_id = (
+            Job.objects.filter(status=Job.STATUS_QUEUED)
+            .order_by("id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if job_id is None:
+            return None
+        claimed = Job.objects.filter(pk=job_id, status=Job.STATUS_QUEUED).update(
+            status=Job.STATUS_RUNNING, started_at=timezone.now()
+        )
+        if claimed:
+            return Job.objects.get(pk=job_id)
+
+
+def run_job(job: Job) -> None:
+    try:
+        HANDLERS[job.kind](job)
+    except Exception as exc:
+        logger.exception("Job %s failed", job.pk)
+        job.status = Job.STATUS_FAILED
+        job.error = str(exc) or type(exc).__name__
+    else:
+        job.status = Job.STATUS_SUCCEEDED
+        job.progress_done = job.progress_total = max(job.progress_total, 1)
+    finally:
+        if job.input_name:
+            (jobs_dir() / job.input_name).unlink(missing_ok=True)
+    job.finished_at = timezone.now()
+    job.save(
+        update_fields=[
+            "status", "error", "result", "result_name",
+            "progress_done", "progress_total", "finished_at",
+        ]
+    )
+
+
+def run_pending() -> int:
+    """Run queued jobs until none are left; return how many ran."""
+    count = 0
+    while (job := claim_next_job()) is not None:
+        run_job(job)
+        count += 1
+    return count
+
+
+def fail_interrupted() -> int:
+    """Fail jobs a previous worker left running when it stopped."""
+    return Job.objects.filter(status=Job.STATUS_RUNNING).update(
+        status=Job.STATUS_FAILED,
+        error="The worker stopped before this job finished.",
+        finished_at=timezone.now(),
+    )
+
+
+def prune_finished() -> int:
+    """Delete finished jobs older than RETENTION, with their files."""
+    expired = Job.objects.filter(
+        status__in=[Job.STATUS_SUCCEEDED, Job.STATUS_FAILED],
+        finished_at__lt=timezone.now() - RETENTION,
+    )
+    for name in expired.exclude(result_name="").values_list("result_name", flat=True):
+        (jobs_dir() / name).unlink(missing_ok=True)
+    deleted, _ = expired.delete()
+    return deleted
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from tasks.services.recurring import catch_up_recurring_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Move every overdue recurring task to its next due date. Meant to run "
+        "daily from a timer (see deploy/nexus-catch-up.timer)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--regenerate",
+            action="store_true",
+            help=(
+                "Complete overdue recurring tasks and create their next "
+                "occurrences, instead of moving their due dates."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        stats = catch_up_recurring_tasks(regenerate=options["regenerate"])
+        if options["regenerate"]:
+            self.stdout.write(
+                f"Completed {stats['overdue']} overdue recurring task(s); "
+                f"created {stats['created']} next occurrence(s)."
+            )
+        else:
+            self.stdout.write(
+                f"Advanced {stats['advanced']} overdue recurring task(s)."
+            )
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.services.rollups import (
+    rebuild_project_stats,
+    rebuild_rollups,
+    stale_rollups,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the dashboard activity rollups and the project statistics "
+        "from tasks, interactions and time entries. Triggers keep them current; "
+        "this repairs them if needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Report rollups that disagree with a fresh count, without writing.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            stale = stale_rollups()
+            if stale["activity"] or stale["projects"]:
+                raise CommandError(
+                    f"{len(stale['activity'])} activity rollup row(s) and "
+                    f"{len(stale['projects'])} project(s) are out of date "
+                    f"(projects: {stale['projects']}). Run without --check to rebuild."
+                )
+            self.stdout.write("Rollups are up to date.")
+            return
+
+        rows = rebuild_rollups()
+        projects = rebuild_project_stats()
+        self.stdout.write(
+            f"Rebuilt {rows} activity rollup row(s) and statistics for "
+            f"{projects} project(s)."
+        )
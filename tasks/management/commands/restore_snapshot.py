@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.services.snapshot import SnapshotError, restore_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Replace the database with a snapshot from `snapshot_db` or "
+        "/api/export/snapshot/ (plain or gzipped), then apply migrations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The snapshot file to restore.")
+
+    def handle(self, *args, **options):
+        try:
+            restore_snapshot(options["path"])
+        except SnapshotError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(f"Restored snapshot from {options['path']}.")
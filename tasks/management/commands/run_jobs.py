@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tasks.jobs import fail_interrupted, prune_finished, run_pending
+
+PRUNE_INTERVAL = 60 * 60
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued import and export jobs. Run exactly one worker: a job "
+        "still marked running when it starts is failed as interrupted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs queued now, then exit.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between checks for new jobs (default 2).",
+        )
+
+    def handle(self, *args, **options):
+        interrupted = fail_interrupted()
+        if interrupted:
+            self.stdout.write(f"Marked {interrupted} interrupted job(s) as failed.")
+
+        last_prune = 0.0
+        while True:
+            close_old_connections()
+            if time.monotonic() - last_prune >= PRUNE_INTERVAL:
+                prune_finished()
+                last_prune = time.monotonic()
+            ran = run_pending()
+            if ran:
+                self.stdout.write(f"Ran {ran} job(s).")
+            if options["once"]:
+                return
+            time.sleep(options["poll_interval"])
@@ -0,0 +1,33 @@
+import gzip
+import os
+import shutil
+
+from django.core.management.base import BaseCommand
+
+from tasks.services.snapshot import CHUNK_SIZE, write_snapshot
+
+
+class Command(BaseCommand):
+    help = "Write a consistent copy of the live SQLite database to a file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Where to write the snapshot.")
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Compress the snapshot with gzip.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not options["gzip"]:
+            write_snapshot(path)
+        else:
+            plain = f"{path}.partial"
+            write_snapshot(plain)
+            try:
+                with open(plain, "rb") as source, gzip.open(path, "wb") as target:
+                    shutil.copyfileobj(source, target, CHUNK_SIZE)
+            finally:
+                os.unlink(plain)
+        self.stdout.write(f"Wrote snapshot to {path}.")
@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+
+def backfill_paths(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    parents = dict(Task.objects.values_list("id", "parent_id"))
+    paths: dict[int, str] = {}
+
+    def path_of(task_id):
+        chain = []
+        current = parents.get(task_id)
+        while current is not None and current not in paths and current not in chain:
+            chain.append(current)
+            current = parents.get(current)
+        prefix = f"{paths[current]}{current}/" if current in paths else ""
+        for ancestor_id in reversed(chain):
+            paths[ancestor_id] = prefix
+            prefix = f"{prefix}{ancestor_id}/"
+        return prefix
+
+    tasks = []
+    for task in Task.objects.only("id", "parent_id"):
+        task.path = paths.setdefault(task.id, path_of(task.id))
+        tasks.append(task)
+    Task.objects.bulk_update(tasks, ["path"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0009_remove_task_priority"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="path",
+            field=models.CharField(blank=True, default="", editable=False, max_length=1000),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["path"], name="tasks_task_path_9925c6_idx"),
+        ),
+    ]
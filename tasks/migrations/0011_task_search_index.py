@@ -0,0 +1,77 @@
+from django.db import migrations
+
+# Tag names of one task, space-separated, for the FTS "tags" column.
+_TAG_NAMES = """(
+    SELECT coalesce(group_concat(tag.name, ' '), '')
+    FROM tasks_tag AS tag
+    JOIN tasks_task_tags AS link ON link.tag_id = tag.id
+    WHERE link.task_id = {task_id}
+)"""
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE tasks_task_fts USING fts5(
+        title, notes, tags, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    INSERT INTO tasks_task_fts (rowid, title, notes, tags)
+    SELECT task.id, task.title, task.notes, {_TAG_NAMES.format(task_id="task.id")}
+    FROM tasks_task AS task
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts (rowid, title, notes, tags)
+        VALUES (new.id, new.title, new.notes, '');
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_update AFTER UPDATE OF title, notes ON tasks_task BEGIN
+        UPDATE tasks_task_fts SET title = new.title, notes = new.notes WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+        DELETE FROM tasks_task_fts WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_task_tags_fts_insert AFTER INSERT ON tasks_task_tags BEGIN
+        UPDATE tasks_task_fts SET tags = {_TAG_NAMES.format(task_id="new.task_id")}
+        WHERE rowid = new.task_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_task_tags_fts_delete AFTER DELETE ON tasks_task_tags BEGIN
+        UPDATE tasks_task_fts SET tags = {_TAG_NAMES.format(task_id="old.task_id")}
+        WHERE rowid = old.task_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_tag_fts_update AFTER UPDATE OF name ON tasks_tag BEGIN
+        UPDATE tasks_task_fts SET tags = {_TAG_NAMES.format(task_id="tasks_task_fts.rowid")}
+        WHERE rowid IN (SELECT task_id FROM tasks_task_tags WHERE tag_id = new.id);
+    END
+    """,
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_tag_fts_update",
+    "DROP TRIGGER IF EXISTS tasks_task_tags_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_task_tags_fts_insert",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_update",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_insert",
+    "DROP TABLE IF EXISTS tasks_task_fts",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0010_task_path"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
@@ -0,0 +1,97 @@
+from django.db import migrations
+
+# One FTS5 table indexes every searchable entity. Rows are keyed by
+# rowid = entity_id * 8 + code so triggers address them without a scan;
+# "kind" carries the entity type for filtering and facets.
+ENTITIES = [
+    # kind, code, table, watched columns, title expression, body expression
+    ("task", 1, "tasks_task", "title, notes", "{row}.title", "{row}.notes"),
+    (
+        "person",
+        2,
+        "network_person",
+        "first_name, middle_name, last_name, email, notes",
+        "{row}.first_name || ' ' || {row}.middle_name || ' ' || {row}.last_name",
+        "{row}.email || ' ' || {row}.notes",
+    ),
+    ("organization", 3, "network_organization", "name, notes", "{row}.name", "{row}.notes"),
+    (
+        "interaction",
+        4,
+        "network_interaction",
+        "interaction_type_id, date, notes",
+        "(SELECT name FROM network_interactiontype WHERE id = {row}.interaction_type_id) || ' ' || {row}.date",
+        "{row}.notes",
+    ),
+    ("lead", 5, "network_lead", "title, notes", "{row}.title", "{row}.notes"),
+    ("page", 6, "notebook_page", "title, content", "{row}.title", "{row}.content"),
+]
+
+
+def _entity_sql(kind, code, table, columns, title, body):
+    def values(row):
+        return f"{row}.id * 8 + {code}, '{kind}', {title.format(row=row)}, {body.format(row=row)}"
+
+    return [
+        f"""
+        INSERT INTO search_index (rowid, kind, title, body)
+        SELECT {values("entity")} FROM {table} AS entity
+        """,
+        f"""
+        CREATE TRIGGER {table}_search_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO search_index (rowid, kind, title, body) VALUES ({values("new")});
+        END
+        """,
+        f"""
+        CREATE TRIGGER {table}_search_update AFTER UPDATE OF {columns} ON {table} BEGIN
+            UPDATE search_index
+            SET title = {title.format(row="new")}, body = {body.format(row="new")}
+            WHERE rowid = new.id * 8 + {code};
+        END
+        """,
+        f"""
+        CREATE TRIGGER {table}_search_delete AFTER DELETE ON {table} BEGIN
+            DELETE FROM search_index WHERE rowid = old.id * 8 + {code};
+        END
+        """,
+    ]
+
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE search_index USING fts5(
+        kind UNINDEXED, title, body, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    *(statement for entity in ENTITIES for statement in _entity_sql(*entity)),
+    """
+    CREATE TRIGGER network_interactiontype_search_update AFTER UPDATE OF name ON network_interactiontype BEGIN
+        UPDATE search_index
+        SET title = new.name || ' ' || (SELECT date FROM network_interaction WHERE id = search_index.rowid / 8)
+        WHERE rowid IN (SELECT id * 8 + 4 FROM network_interaction WHERE interaction_type_id = new.id);
+    END
+    """,
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS network_interactiontype_search_update",
+    *(
+        f"DROP TRIGGER IF EXISTS {table}_search_{event}"
+        for _, _, table, *_ in ENTITIES
+        for event in ("insert", "update", "delete")
+    ),
+    "DROP TABLE IF EXISTS search_index",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0011_task_search_index"),
+        ("network", "0022_interactionpagelink"),
+        ("notebook", "0002_alter_pageentitymention_entity_type"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
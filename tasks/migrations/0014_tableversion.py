@@ -0,0 +1,81 @@
+from django.db import migrations, models
+
+# Every table a read endpoint may derive an ETag from. Tables created by
+# later migrations must add their own triggers.
+VERSIONED_TABLES = [
+    "tasks_project",
+    "tasks_projectlink",
+    "tasks_list",
+    "tasks_section",
+    "tasks_tag",
+    "tasks_task",
+    "tasks_task_tags",
+    "tasks_timeentry",
+    "tasks_timeentry_tasks",
+    "network_person",
+    "network_person_tags",
+    "network_persontag",
+    "network_interaction",
+    "network_interaction_people",
+    "network_interaction_organizations",
+    "network_interactiontype",
+    "network_interactionmedium",
+    "network_orgtype",
+    "network_organization",
+    "network_relationshippersonperson",
+    "network_relationshiporganizationperson",
+    "network_relationshiporganizationorganization",
+    "network_personpersonrelationshiptype",
+    "network_orgpersonrelationshiptype",
+    "network_orgorgrelationshiptype",
+    "network_lead",
+    "notebook_page",
+]
+
+_EVENTS = ("insert", "update", "delete")
+
+
+def _create_sql():
+    statements = [
+        "INSERT INTO tasks_tableversion (\"table\", version) VALUES "
+        + ", ".join(f"('{table}', 0)" for table in VERSIONED_TABLES)
+    ]
+    for table in VERSIONED_TABLES:
+        for event in _EVENTS:
+            statements.append(
+                f"""
+                CREATE TRIGGER {table}_version_{event} AFTER {event.upper()} ON {table} BEGIN
+                    UPDATE tasks_tableversion SET version = version + 1 WHERE "table" = '{table}';
+                END
+                """
+            )
+    return statements
+
+
+def _drop_sql():
+    return [
+        f"DROP TRIGGER IF EXISTS {table}_version_{event}"
+        for table in VERSIONED_TABLES
+        for event in _EVENTS
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0013_changelogentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TableVersion",
+            fields=[
+                (
+                    "table",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(_create_sql(), _drop_sql()),
+    ]
@@ -0,0 +1,166 @@
+# Triggers that stamp updated_at on writes and record deletes as tombstones.
+
+from django.db import migrations, models
+
+# Same text format Django writes for DateTimeField values on SQLite (UTC).
+# SQLite only has milliseconds, so round up: a stamp never precedes the
+# write, and an export's `since` cannot miss a change made just after it.
+NOW = "strftime('%Y-%m-%d %H:%M:%f999', 'now')"
+
+UPDATED_AT_MODELS = ["list", "project", "projectlink", "section", "task", "timeentry"]
+
+# Tables with an updated_at column. auto_now only covers save(); these
+# triggers also stamp queryset update(), bulk_update() and save(update_fields=...).
+TOUCHED_TABLES = [
+    "tasks_project",
+    "tasks_projectlink",
+    "tasks_list",
+    "tasks_section",
+    "tasks_task",
+    "tasks_timeentry",
+    "network_person",
+    "network_organization",
+    "network_interaction",
+    "network_lead",
+    "network_relationshippersonperson",
+    "network_relationshiporganizationperson",
+    "notebook_page",
+]
+
+# m2m table -> (owner table, owner column). Adding or removing a relation
+# counts as a change to the row that declares the field.
+TOUCHED_THROUGH_TABLES = {
+    "tasks_task_tags": ("tasks_task", "task_id"),
+    "tasks_timeentry_tasks": ("tasks_timeentry", "timeentry_id"),
+    "network_interaction_people": ("network_interaction", "interaction_id"),
+}
+
+# Every table in the full export. Tables created by later migrations must
+# add their own triggers.
+TOMBSTONED_TABLES = [
+    "tasks_tag",
+    "tasks_project",
+    "tasks_projectlink",
+    "tasks_list",
+    "tasks_section",
+    "tasks_task",
+    "tasks_timeentry",
+    "network_orgtype",
+    "network_interactiontype",
+    "network_person",
+    "network_organization",
+    "network_interaction",
+    "network_lead",
+    "network_leadtask",
+    "network_relationshippersonperson",
+    "network_relationshiporganizationperson",
+    "network_taskperson",
+    "network_taskorganization",
+    "network_interactiontask",
+    "notebook_page",
+    "notebook_pagelink",
+]
+
+
+def _create_sql():
+    statements = [
+        f"""
+        CREATE TRIGGER {table}_touch AFTER UPDATE ON {table}
+        WHEN NEW.updated_at IS OLD.updated_at BEGIN
+            UPDATE {table} SET updated_at = {NOW} WHERE id = NEW.id;
+        END
+        """
+        for table in TOUCHED_TABLES
+    ]
+    for through, (owner, column) in TOUCHED_THROUGH_TABLES.items():
+        for event, row in (("insert", "NEW"), ("delete", "OLD")):
+            statements.append(
+                f"""
+                CREATE TRIGGER {through}_touch_{event} AFTER {event.upper()} ON {through} BEGIN
+                    UPDATE {owner} SET updated_at = {NOW} WHERE id = {row}.{column};
+                END
+                """
+            )
+    statements += [
+        f"""
+        CREATE TRIGGER {table}_tombstone AFTER DELETE ON {table} BEGIN
+            INSERT INTO tasks_tombstone ("table", row_id, deleted_at)
+            VALUES ('{table}', OLD.id, {NOW});
+        END
+        """
+        for table in TOMBSTONED_TABLES
+    ]
+    return statements
+
+
+def _drop_sql():
+    statements = [f"DROP TRIGGER IF EXISTS {table}_touch" for table in TOUCHED_TABLES]
+    statements += [
+        f"DROP TRIGGER IF EXISTS {through}_touch_{event}"
+        for through in TOUCHED_THROUGH_TABLES
+        for event in ("insert", "delete")
+    ]
+    statements += [
+        f"DROP TRIGGER IF EXISTS {table}_tombstone" for table in TOMBSTONED_TABLES
+    ]
+    return statements
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0015_job"),
+        ("network", "0022_interactionpagelink"),
+        ("notebook", "0002_alter_pageentitymention_entity_type"),
+    ]
+
+    operations = [
+        # Django would rebuild each table to add a NOT NULL column, dropping
+        # the search and version triggers on it; ADD COLUMN keeps them.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name=model_name,
+                    name="updated_at",
+                    field=models.DateTimeField(auto_now=True),
+                )
+                for model_name in UPDATED_AT_MODELS
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    [
+                        f"ALTER TABLE tasks_{model_name} ADD COLUMN updated_at "
+                        "datetime NOT NULL DEFAULT '1970-01-01 00:00:00'",
+                        f"UPDATE tasks_{model_name} SET updated_at = {NOW}",
+                    ],
+                    f"ALTER TABLE tasks_{model_name} DROP COLUMN updated_at",
+                )
+                for model_name in UPDATED_AT_MODELS
+            ],
+        ),
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("table", models.CharField(max_length=100)),
+                ("row_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["deleted_at"], name="tasks_tombs_deleted_d21e1d_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(_create_sql(), _drop_sql()),
+    ]
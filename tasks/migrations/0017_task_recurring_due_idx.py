@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0016_updated_at_and_tombstones"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_completed", False),
+                    models.Q(("recurrence_type", "none"), _negated=True),
+                ),
+                fields=["due_date"],
+                name="tasks_task_recurring_due_idx",
+            ),
+        ),
+    ]
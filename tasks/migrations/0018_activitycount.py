@@ -0,0 +1,135 @@
+# Triggers that keep day, week and month activity counts per metric.
+
+from django.db import migrations, models
+
+# metric -> (table, column) counted into tasks_activitycount.
+SOURCES = {
+    "tasks_completed": ("tasks_task", "completed_at"),
+    "tasks_created": ("tasks_task", "created_at"),
+    "interactions": ("network_interaction", "date"),
+    "time_entries": ("tasks_timeentry", "date"),
+}
+
+# period -> first day of the bucket holding {}; weeks start on Monday.
+BUCKETS = {
+    "day": "date({})",
+    "week": "date({}, 'weekday 0', '-6 days')",
+    "month": "date({}, 'start of month')",
+}
+
+
+def _bump(metric, value, delta):
+    rows = ", ".join(
+        f"('{metric}', '{period}', {expression.format(value)}, {delta})"
+        for period, expression in BUCKETS.items()
+    )
+    return (
+        f'INSERT INTO tasks_activitycount (metric, period, start, "count") VALUES {rows} '
+        'ON CONFLICT (metric, period, start) DO UPDATE SET "count" = "count" + excluded."count";'
+    )
+
+
+def _triggers():
+    for metric, (table, column) in SOURCES.items():
+        changed = f"date(OLD.{column}) IS NOT date(NEW.{column})"
+        yield (
+            f"{metric}_insert",
+            f"AFTER INSERT ON {table} WHEN NEW.{column} IS NOT NULL",
+            _bump(metric, f"NEW.{column}", 1),
+        )
+        yield (
+            f"{metric}_delete",
+            f"AFTER DELETE ON {table} WHEN OLD.{column} IS NOT NULL",
+            _bump(metric, f"OLD.{column}", -1),
+        )
+        yield (
+            f"{metric}_update_old",
+            f"AFTER UPDATE OF {column} ON {table} "
+            f"WHEN OLD.{column} IS NOT NULL AND {changed}",
+            _bump(metric, f"OLD.{column}", -1),
+        )
+        yield (
+            f"{metric}_update_new",
+            f"AFTER UPDATE OF {column} ON {table} "
+            f"WHEN NEW.{column} IS NOT NULL AND {changed}",
+            _bump(metric, f"NEW.{column}", 1),
+        )
+
+
+def _create_sql():
+    statements = [
+        f"CREATE TRIGGER activitycount_{name} {when} BEGIN {body} END"
+        for name, when, body in _triggers()
+    ]
+    # Count what is already there.
+    statements.append(
+        'INSERT INTO tasks_activitycount (metric, period, start, "count") '
+        + " UNION ALL ".join(
+            f"SELECT '{metric}', '{period}', {expression.format(column)}, COUNT(*) "
+            f"FROM {table} WHERE {column} IS NOT NULL GROUP BY 3"
+            for metric, (table, column) in SOURCES.items()
+            for period, expression in BUCKETS.items()
+        )
+    )
+    return statements
+
+
+def _drop_sql():
+    return [
+        f"DROP TRIGGER IF EXISTS activitycount_{name}" for name, _when, _body in _triggers()
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0017_task_recurring_due_idx"),
+        ("network", "0022_interactionpagelink"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActivityCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("tasks_completed", "Tasks completed"),
+                            ("tasks_created", "Tasks created"),
+                            ("interactions", "Interactions"),
+                            ("time_entries", "Time entries"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("day", "Day"), ("week", "Week"), ("month", "Month")],
+                        max_length=10,
+                    ),
+                ),
+                ("start", models.DateField()),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("metric", "period", "start"),
+                        name="unique_activity_count",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(_create_sql(), _drop_sql()),
+    ]
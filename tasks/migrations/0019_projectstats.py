@@ -0,0 +1,187 @@
+# Triggers that keep each project's list, task and time entry counts current.
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+COLUMNS = ("time_entry_count", "list_count", "task_count", "completed_task_count")
+
+
+def _project_of_section(section_id):
+    return (
+        "(SELECT l.project_id FROM tasks_section s "
+        f"JOIN tasks_list l ON l.id = s.list_id WHERE s.id = {section_id})"
+    )
+
+
+def _bump(project_id, **deltas):
+    """SQL adding `deltas` (column -> SQL expression) to a project's stats."""
+    changes = ", ".join(
+        f"{column} = {column} + ({delta})" for column, delta in deltas.items()
+    )
+    return f"UPDATE tasks_projectstats SET {changes} WHERE project_id = {project_id};"
+
+
+def _list_tasks(list_id, sign):
+    return {
+        "task_count": f"{sign}(SELECT COUNT(*) FROM tasks_task t "
+        f"JOIN tasks_section s ON s.id = t.section_id WHERE s.list_id = {list_id})",
+        "completed_task_count": f"{sign}(SELECT COUNT(*) FROM tasks_task t "
+        f"JOIN tasks_section s ON s.id = t.section_id "
+        f"WHERE s.list_id = {list_id} AND t.is_completed)",
+    }
+
+
+def _section_tasks(section_id, sign):
+    return {
+        "task_count": f"{sign}(SELECT COUNT(*) FROM tasks_task "
+        f"WHERE section_id = {section_id})",
+        "completed_task_count": f"{sign}(SELECT COUNT(*) FROM tasks_task "
+        f"WHERE section_id = {section_id} AND is_completed)",
+    }
+
+
+def _list_project(list_id):
+    return f"(SELECT project_id FROM tasks_list WHERE id = {list_id})"
+
+
+# name -> (event, body). Moving a list or section carries its tasks' counts
+# to the new project. Deleting one through the ORM deletes its tasks first.
+TRIGGERS = {
+    "project_insert": (
+        "AFTER INSERT ON tasks_project",
+        f"INSERT INTO tasks_projectstats (project_id, {', '.join(COLUMNS)}) "
+        "VALUES (NEW.id, 0, 0, 0, 0);",
+    ),
+    "timeentry_insert": (
+        "AFTER INSERT ON tasks_timeentry",
+        _bump("NEW.project_id", time_entry_count=1),
+    ),
+    "timeentry_delete": (
+        "AFTER DELETE ON tasks_timeentry",
+        _bump("OLD.project_id", time_entry_count=-1),
+    ),
+    "timeentry_move": (
+        "AFTER UPDATE OF project_id ON tasks_timeentry "
+        "WHEN NEW.project_id IS NOT OLD.project_id",
+        _bump("OLD.project_id", time_entry_count=-1)
+        + _bump("NEW.project_id", time_entry_count=1),
+    ),
+    "list_insert": (
+        "AFTER INSERT ON tasks_list",
+        _bump("NEW.project_id", list_count=1),
+    ),
+    "list_delete": (
+        "AFTER DELETE ON tasks_list",
+        _bump("OLD.project_id", list_count=-1, **_list_tasks("OLD.id", "-")),
+    ),
+    "list_move": (
+        "AFTER UPDATE OF project_id ON tasks_list "
+        "WHEN NEW.project_id IS NOT OLD.project_id",
+        _bump("OLD.project_id", list_count=-1, **_list_tasks("OLD.id", "-"))
+        + _bump("NEW.project_id", list_count=1, **_list_tasks("NEW.id", "+")),
+    ),
+    "section_move": (
+        "AFTER UPDATE OF list_id ON tasks_section WHEN NEW.list_id IS NOT OLD.list_id",
+        _bump(_list_project("OLD.list_id"), **_section_tasks("OLD.id", "-"))
+        + _bump(_list_project("NEW.list_id"), **_section_tasks("NEW.id", "+")),
+    ),
+    "task_insert": (
+        "AFTER INSERT ON tasks_task",
+        _bump(
+            _project_of_section("NEW.section_id"),
+            task_count=1,
+            completed_task_count="NEW.is_completed",
+        ),
+    ),
+    "task_delete": (
+        "AFTER DELETE ON tasks_task",
+        _bump(
+            _project_of_section("OLD.section_id"),
+            task_count=-1,
+            completed_task_count="-OLD.is_completed",
+        ),
+    ),
+    "task_complete": (
+        "AFTER UPDATE OF is_completed ON tasks_task "
+        "WHEN NEW.section_id IS OLD.section_id "
+        "AND NEW.is_completed IS NOT OLD.is_completed",
+        _bump(
+            _project_of_section("NEW.section_id"),
+            completed_task_count="NEW.is_completed - OLD.is_completed",
+        ),
+    ),
+    "task_move": (
+        "AFTER UPDATE OF section_id ON tasks_task "
+        "WHEN NEW.section_id IS NOT OLD.section_id",
+        _bump(
+            _project_of_section("OLD.section_id"),
+            task_count=-1,
+            completed_task_count="-OLD.is_completed",
+        )
+        + _bump(
+            _project_of_section("NEW.section_id"),
+            task_count=1,
+            completed_task_count="NEW.is_completed",
+        ),
+    ),
+}
+
+
+def _create_sql():
+    statements = [
+        f"CREATE TRIGGER projectstats_{name} {event} BEGIN {body} END"
+        for name, (event, body) in TRIGGERS.items()
+    ]
+    # Count what is already there.
+    statements.append(
+        f"INSERT INTO tasks_projectstats (project_id, {', '.join(COLUMNS)}) "
+        """
+        SELECT p.id,
+            (SELECT COUNT(*) FROM tasks_timeentry e WHERE e.project_id = p.id),
+            (SELECT COUNT(*) FROM tasks_list l WHERE l.project_id = p.id),
+            (SELECT COUNT(*) FROM tasks_task t
+                JOIN tasks_section s ON s.id = t.section_id
+                JOIN tasks_list l ON l.id = s.list_id
+                WHERE l.project_id = p.id),
+            (SELECT COUNT(*) FROM tasks_task t
+                JOIN tasks_section s ON s.id = t.section_id
+                JOIN tasks_list l ON l.id = s.list_id
+                WHERE l.project_id = p.id AND t.is_completed)
+        FROM tasks_project p
+        """
+    )
+    return statements
+
+
+def _drop_sql():
+    return [f"DROP TRIGGER IF EXISTS projectstats_{name}" for name in TRIGGERS]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0018_activitycount"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectStats",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="tasks.project",
+                    ),
+                ),
+                ("time_entry_count", models.IntegerField(default=0)),
+                ("list_count", models.IntegerField(default=0)),
+                ("task_count", models.IntegerField(default=0)),
+                ("completed_task_count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(_create_sql(), _drop_sql()),
+    ]
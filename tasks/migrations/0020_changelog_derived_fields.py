@@ -0,0 +1,63 @@
+# Triggers that log people and projects whose trigger-maintained fields change.
+
+from django.db import migrations
+
+# Same stamp as the touch triggers in 0016.
+NOW = "strftime('%Y-%m-%d %H:%M:%f999', 'now')"
+LOG = "tasks_changelogentry (entity_type, entity_id, action, created_at)"
+
+
+def _log(entity_type, entity_id):
+    return (
+        f"INSERT INTO {LOG} "
+        f"VALUES ('{entity_type}', {entity_id}, 'upsert', {NOW});"
+    )
+
+
+# Derived values that the change feed serializes but that triggers, not
+# saves, rewrite: a person's last interaction and follow-up date
+# (network 0023/0024) and a project's counts (0019). Without these the
+# feed would never report the entity as changed.
+TRIGGERS = {
+    "changelog_person_follow_up": f"""
+        AFTER UPDATE OF last_interaction_date, last_interaction_type_id,
+            next_follow_up_due ON network_person
+        WHEN NEW.last_interaction_date IS NOT OLD.last_interaction_date
+            OR NEW.last_interaction_type_id IS NOT OLD.last_interaction_type_id
+            OR NEW.next_follow_up_due IS NOT OLD.next_follow_up_due BEGIN
+            {_log("person", "NEW.id")}
+        END
+    """,
+    "changelog_interactiontype_rename": f"""
+        AFTER UPDATE OF name ON network_interactiontype
+        WHEN NEW.name IS NOT OLD.name BEGIN
+            INSERT INTO {LOG}
+            SELECT 'person', id, 'upsert', {NOW} FROM network_person
+            WHERE last_interaction_type_id = NEW.id;
+        END
+    """,
+    "changelog_projectstats": f"""
+        AFTER UPDATE ON tasks_projectstats
+        WHEN NEW.time_entry_count IS NOT OLD.time_entry_count
+            OR NEW.list_count IS NOT OLD.list_count
+            OR NEW.task_count IS NOT OLD.task_count
+            OR NEW.completed_task_count IS NOT OLD.completed_task_count BEGIN
+            {_log("project", "NEW.project_id")}
+        END
+    """,
+}
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0019_projectstats"),
+        ("network", "0024_person_last_interaction_type"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            [f"CREATE TRIGGER {name} {body}" for name, body in TRIGGERS.items()],
+            [f"DROP TRIGGER IF EXISTS {name}" for name in TRIGGERS],
+        ),
+    ]
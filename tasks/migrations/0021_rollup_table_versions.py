@@ -0,0 +1,48 @@
+# Version-bump triggers for the rollup tables, so cached responses built from
+# them move on when rebuild_rollups rewrites them in bulk.
+
+from django.db import migrations
+
+TABLES = ["tasks_activitycount", "tasks_projectstats"]
+
+_EVENTS = ("insert", "update", "delete")
+
+
+def _create_sql():
+    statements = [
+        "INSERT INTO tasks_tableversion (\"table\", version) VALUES "
+        + ", ".join(f"('{table}', 0)" for table in TABLES)
+    ]
+    for table in TABLES:
+        for event in _EVENTS:
+            statements.append(
+                f"""
+                CREATE TRIGGER {table}_version_{event} AFTER {event.upper()} ON {table} BEGIN
+                    UPDATE tasks_tableversion SET version = version + 1 WHERE "table" = '{table}';
+                END
+                """
+            )
+    return statements
+
+
+def _drop_sql():
+    return [
+        f"DROP TRIGGER IF EXISTS {table}_version_{event}"
+        for table in TABLES
+        for event in _EVENTS
+    ] + [
+        "DELETE FROM tasks_tableversion WHERE \"table\" IN ("
+        + ", ".join(f"'{table}'" for table in TABLES)
+        + ")"
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0020_changelog_derived_fields"),
+    ]
+
+    operations = [
+        migrations.RunSQL(_create_sql(), _drop_sql()),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Concat, Substr
 from django.utils import timezone
 
 
@@ -7,6 +9,7 @@ class Project(models.Model):
     description = models.TextField(blank=True, default="")
     is_active = models.BooleanField(default=True)
     position = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["position"]
@@ -22,6 +25,7 @@ class ProjectLink(models.Model):
     url = models.CharField(max_length=2000)
     descriptor = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["created_at"]
@@ -38,6 +42,7 @@ class List(models.Model):
     project = models.ForeignKey(
         Project, on_delete=models.SET_NULL, null=True, blank=True, related_name="lists"
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["position"]
@@ -54,6 +59,7 @@ class Section(models.Model):
     name = models.CharField(max_length=255)
     emoji = models.CharField(max_length=10, blank=True, default="")
     position = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["position"]
@@ -96,6 +102,9 @@ class Task(models.Model):
         blank=True,
         related_name="subtasks",
     )
+    # Materialized ancestry: the ids of every ancestor from the root down to
+    # the parent, each followed by "/". Root tasks have an empty path.
+    path = models.CharField(max_length=1000, blank=True, default="", editable=False)
     title = models.CharField(max_length=500)
     notes = models.TextField(blank=True, default="")
     due_date = models.DateField(null=True, blank=True)
@@ -103,6 +112,7 @@ class Task(models.Model):
     is_completed = models.BooleanField(default=False)
     completed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
     position = models.IntegerField(default=0)
     external_id = models.CharField(max_length=100, null=True, blank=True, unique=True)
     tags = models.ManyToManyField(Tag, blank=True, related_name="tasks")
@@ -114,10 +124,81 @@ class Task(models.Model):
 
     class Meta:
         ordering = ["position"]
+        indexes = [
+            models.Index(fields=["path"]),
+            # Open recurring tasks by due date, for the overdue catch-up.
+            models.Index(
+                fields=["due_date"],
+                condition=Q(is_completed=False) & ~Q(recurrence_type="none"),
+                name="tasks_task_recurring_due_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_parent_id = instance.__dict__.get("parent_id")
+        return instance
+
+    @property
+    def subtree_prefix(self):
+        """Path prefix shared by every descendant of this task."""
+        return f"{self.path}{self.pk}/"
+
+    @staticmethod
+    def descendants_q(tasks):
+        """Q matching every descendant of any of `tasks` via indexed ranges on `path`."""
+        q = Q(pk__in=[])
+        for task in tasks:
+            prefix = task.subtree_prefix
+            # "0" sorts immediately after "/", so this range is exactly the prefix.
+            q |= Q(path__gte=prefix, path__lt=prefix[:-1] + "0")
+        return q
+
+    def descendants(self):
+        """Return all descendants as a single indexed range query on `path`."""
+        return Task.objects.filter(Task.descendants_q([self]))
+
+    def is_ancestor_of(self, other):
+        return other.path.startswith(self.subtree_prefix)
+
+    def _path_from_parent(self):
+        if self.parent_id is None:
+            return ""
+        if Task.parent.is_cached(self):
+            parent_path = self.parent.path
+        else:
+            parent_path = Task.objects.filter(pk=self.parent_id).values_list("path", flat=True).get()
+        return f"{parent_path}{self.parent_id}/"
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not {"parent", "parent_id"} & set(update_fields):
+            return super().save(*args, **kwargs)
+        if not self._state.adding and self.parent_id == getattr(self, "_loaded_parent_id", object()):
+            return super().save(*args, **kwargs)
+
+        old_prefix = self.subtree_prefix if not self._state.adding else None
+        new_path = self._path_from_parent()
+        # Nesting under itself or a descendant would put this task in its own ancestry.
+        if old_prefix is not None and new_path.startswith(old_prefix):
+            raise ValueError("Cannot nest a task under its own descendant.")
+        self.path = new_path
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "path"}
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            new_prefix = self.subtree_prefix
+            if old_prefix is not None and old_prefix != new_prefix:
+                Task.objects.filter(path__gte=old_prefix, path__lt=old_prefix[:-1] + "0").update(
+                    path=Concat(Value(new_prefix), Substr("path", len(old_prefix) + 1))
+                )
+        self._loaded_parent_id = self.parent_id
+
     @property
     def open_subtask_count(self):
         """Return the number of non-completed direct subtasks."""
@@ -129,34 +210,69 @@ class Task(models.Model):
         If this task has a recurrence rule, creates the next occurrence
         and returns its ID. Otherwise returns None.
         """
+        now = timezone.now()
         self.is_completed = True
-        self.completed_at = timezone.now()
+        self.completed_at = now
         self.save()
-        for subtask in self.subtasks.filter(is_completed=False):
-            subtask.complete()
+        Task.complete_open(self.descendants(), now)
+        return self._create_next_occurrence()
 
-        next_occurrence_id = None
-        if self.recurrence_type != self.RECURRENCE_NONE:
-            from tasks.services.recurrence import compute_next_due_date
+    @classmethod
+    def complete_open(cls, queryset, now=None):
+        """Complete every open task in `queryset`.
 
-            next_due = compute_next_due_date(
-                self.recurrence_type, self.recurrence_rule, self.due_date
-            )
-            next_task = Task.objects.create(
-                section=self.section,
-                parent=self.parent,
-                title=self.title,
-                notes=self.notes,
-                due_date=next_due,
-                due_time=self.due_time,
-                position=self.position,
-                recurrence_type=self.recurrence_type,
-                recurrence_rule=self.recurrence_rule,
+        All of them are completed in one statement, and the recurring ones
+        get their next occurrences in bulk. Returns {task_id:
+        next_occurrence_id} for the recurring tasks.
+        """
+        now = now or timezone.now()
+        open_tasks = queryset.filter(is_completed=False)
+        recurring = list(open_tasks.exclude(recurrence_type=cls.RECURRENCE_NONE))
+        task_ids = list(open_tasks.values_list("id", flat=True))
+        cls.objects.filter(pk__in=task_ids).update(is_completed=True, completed_at=now)
+        ChangeLogEntry.record(cls, task_ids)
+        return cls.create_next_occurrences(recurring)
+
+    @classmethod
+    def create_next_occurrences(cls, tasks):
+        """Create the next occurrence of each recurring task in `tasks`, in bulk.
+
+        Each copy keeps the task's place, tags and rule, due on the date the
+        rule gives after the task's own. Returns {task_id: next_occurrence_id}.
+        """
+        from tasks.services.recurrence import compute_next_due_date
+
+        recurring = [task for task in tasks if task.recurrence_type != cls.RECURRENCE_NONE]
+        next_tasks = [
+            cls(
+                section_id=task.section_id,
+                parent_id=task.parent_id,
+                path=task.path,
+                title=task.title,
+                notes=task.notes,
+                due_date=compute_next_due_date(task.recurrence_type, task.recurrence_rule, task.due_date),
+                due_time=task.due_time,
+                position=task.position,
+                recurrence_type=task.recurrence_type,
+                recurrence_rule=task.recurrence_rule,
             )
-            next_task.tags.set(self.tags.all())
-            next_occurrence_id = next_task.id
-
-        return next_occurrence_id
+            for task in recurring
+        ]
+        cls.objects.bulk_create(next_tasks)
+        ChangeLogEntry.record(cls, [task.id for task in next_tasks])
+
+        next_ids = {task.id: next_task.id for task, next_task in zip(recurring, next_tasks)}
+        tag_links = cls.tags.through.objects.filter(task_id__in=next_ids).order_by("pk")
+        cls.tags.through.objects.bulk_create(
+            [
+                cls.tags.through(task_id=next_ids[task_id], tag_id=tag_id)
+                for task_id, tag_id in tag_links.values_list("task_id", "tag_id")
+            ]
+        )
+        return next_ids
+
+    def _create_next_occurrence(self):
+        return Task.create_next_occurrences([self]).get(self.id)
 
     def uncomplete(self):
         """Mark this task as not completed."""
@@ -173,9 +289,213 @@ class TimeEntry(models.Model):
     description = models.CharField(max_length=500, blank=True, default="")
     date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-date", "-created_at"]
 
     def __str__(self):
         return f"{self.project.name} - {self.date}"
+
+
+class ChangeLogEntry(models.Model):
+    """Append-only log of entity writes; the id doubles as the sync cursor."""
+
+    ACTION_UPSERT = "upsert"
+    ACTION_DELETE = "delete"
+    ACTION_CHOICES = [
+        (ACTION_UPSERT, "Upsert"),
+        (ACTION_DELETE, "Delete"),
+    ]
+
+    # Model label -> entity type reported to sync clients. Writes to any
+    # other model are not logged.
+    ENTITY_TYPES = {
+        "tasks.list": "list",
+        "tasks.section": "section",
+        "tasks.task": "task",
+        "tasks.tag": "tag",
+        "tasks.project": "project",
+        "network.person": "person",
+        "network.organization": "organization",
+        "network.interaction": "interaction",
+        "network.lead": "lead",
+        "notebook.page": "page",
+    }
+
+    entity_type = models.CharField(max_length=20)
+    entity_id = models.IntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES, default=ACTION_UPSERT)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.pk}: {self.action} {self.entity_type}:{self.entity_id}"
+
+    @classmethod
+    def record(cls, model, ids, action=ACTION_UPSERT):
+        """Log `action` for each of `ids` if `model` is tracked.
+
+        Signal receivers cover single-object saves and deletes; callers that
+        write through queryset update() or bulk_update() record their rows here.
+        """
+        # Historical models used by data migrations have their own registry
+        # and may predate this table.
+        if model._meta.apps is not cls._meta.apps:
+            return
+        entity_type = cls.ENTITY_TYPES.get(model._meta.label_lower)
+        if entity_type is None:
+            return
+        cls.objects.bulk_create(
+            [cls(entity_type=entity_type, entity_id=entity_id, action=action) for entity_id in dict.fromkeys(ids)]
+        )
+
+
+class TableVersion(models.Model):
+    """Write counter per database table, bumped by SQLite triggers.
+
+    Every insert, update or delete on a versioned table increments its row
+    here, whichever code path issued it, so read endpoints can derive
+    validators without touching the data they describe.
+    """
+
+    table = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.table}@{self.version}"
+
+    @classmethod
+    def current(cls, tables):
+        """Return {table: version} for `tables` in one query."""
+        return dict(cls.objects.filter(table__in=tables).values_list("table", "version"))
+
+
+class ActivityCount(models.Model):
+    """How many events of one kind fall on a day, week or month.
+
+    SQLite triggers on the source tables keep these in step with every
+    insert, update and delete, so dashboards read a handful of rows instead
+    of scanning tasks and interactions. `manage.py rebuild_rollups`
+    recomputes them from scratch.
+    """
+
+    METRIC_TASKS_COMPLETED = "tasks_completed"
+    METRIC_TASKS_CREATED = "tasks_created"
+    METRIC_INTERACTIONS = "interactions"
+    METRIC_TIME_ENTRIES = "time_entries"
+    METRIC_CHOICES = [
+        (METRIC_TASKS_COMPLETED, "Tasks completed"),
+        (METRIC_TASKS_CREATED, "Tasks created"),
+        (METRIC_INTERACTIONS, "Interactions"),
+        (METRIC_TIME_ENTRIES, "Time entries"),
+    ]
+    PERIOD_DAY = "day"
+    PERIOD_WEEK = "week"  # starting on Monday
+    PERIOD_MONTH = "month"
+    PERIOD_CHOICES = [
+        (PERIOD_DAY, "Day"),
+        (PERIOD_WEEK, "Week"),
+        (PERIOD_MONTH, "Month"),
+    ]
+
+    metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    start = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["metric", "period", "start"], name="unique_activity_count"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.metric} {self.period} {self.start}: {self.count}"
+
+
+class ProjectStats(models.Model):
+    """Counts shown on a project card, one row per project.
+
+    SQLite triggers adjust them as time entries, lists and tasks are
+    created, moved, completed and deleted, so listing projects reads one
+    row each instead of counting across lists, sections and tasks.
+    `manage.py rebuild_rollups` recomputes them from scratch.
+    """
+
+    project = models.OneToOneField(
+        Project, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    time_entry_count = models.IntegerField(default=0)
+    list_count = models.IntegerField(default=0)
+    task_count = models.IntegerField(default=0)
+    completed_task_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.project_id}: {self.completed_task_count}/{self.task_count} tasks"
+
+
+class Tombstone(models.Model):
+    """A deleted row, written by SQLite triggers on every exported table.
+
+    Together with `updated_at`, which triggers also keep current for writes
+    that bypass save(), this lets an incremental export replay deletes.
+    """
+
+    table = models.CharField(max_length=100)
+    row_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["deleted_at"])]
+
+    def __str__(self):
+        return f"{self.table}:{self.row_id}"
+
+
+class Job(models.Model):
+    """An import or export run by the `run_jobs` worker instead of a web worker.
+
+    Files live under settings.JOBS_DIR; `input_name` and `result_name` are
+    relative to it.
+    """
+
+    KIND_IMPORT = "import"
+    KIND_EXPORT = "export"
+    KIND_CHOICES = [
+        (KIND_IMPORT, "Import"),
+        (KIND_EXPORT, "Export"),
+    ]
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    params = models.JSONField(default=dict, blank=True)
+    input_name = models.CharField(max_length=255, blank=True, default="")
+    result_name = models.CharField(max_length=255, blank=True, default="")
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    # Work units done out of total; a total of 0 means progress is unknown.
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} job {self.pk} ({self.status})"
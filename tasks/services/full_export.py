@@ -21,7 +21,16 @@ from network.models import (
     TaskPerson,
 )
 from notebook.models import Page, PageLink
-from tasks.models import List, Project, ProjectLink, Section, Tag, Task, TimeEntry
+from tasks.models import (
+    List,
+    Project,
+    ProjectLink,
+    Section,
+    Tag,
+    Task,
+    TimeEntry,
+    Tombstone,
+)
 
 
 def _serialize_value(val):
@@ -101,7 +110,7 @@ def _serialize_task(task):
         "is_pinned": task.is_pinned,
         "recurrence_type": task.recurrence_type,
         "recurrence_rule": task.recurrence_rule,
-        "tag_ids": list(task.tags.values_list("id", flat=True)),
+        "tag_ids": [tag.id for tag in task.tags.all()],
     }
 
 
@@ -112,7 +121,7 @@ def _serialize_time_entry(entry):
         "description": entry.description,
         "date": _serialize_value(entry.date),
         "created_at": _serialize_value(entry.created_at),
-        "task_ids": list(entry.tasks.values_list("id", flat=True)),
+        "task_ids": [task.id for task in entry.tasks.all()],
     }
 
 
@@ -152,7 +161,7 @@ def _serialize_org_type(ot):
 def _serialize_interaction(interaction):
     return {
         "id": interaction.id,
-        "person_ids": list(interaction.people.values_list("id", flat=True)),
+        "person_ids": [person.id for person in interaction.people.all()],
         "interaction_type_id": interaction.interaction_type_id,
         "date": _serialize_value(interaction.date),
         "notes": interaction.notes,
@@ -262,46 +271,161 @@ def _serialize_page_link(link):
 
 # ── top-level export ──
 
-
-def export_full_database():
-    """Build the complete database export as a dict."""
-    return {
-        "format": "nexus-full-backup",
-        "version": 1,
+FORMAT = "nexus-full-backup"
+VERSION = 1
+
+# Rows are read in chunks of this size; prefetches run once per chunk, so
+# memory stays flat however large a table is.
+CHUNK_SIZE = 2000
+
+# (key, queryset factory, serializer) in dependency order, so an importer can
+# create rows as it reads them.
+TABLES = [
+    # tasks app
+    ("tags", lambda: Tag.objects.all(), _serialize_tag),
+    ("projects", lambda: Project.objects.all(), _serialize_project),
+    ("project_links", lambda: ProjectLink.objects.all(), _serialize_project_link),
+    ("lists", lambda: List.objects.all(), _serialize_list),
+    ("sections", lambda: Section.objects.all(), _serialize_section),
+    ("tasks", lambda: Task.objects.prefetch_related("tags"), _serialize_task),
+    (
+        "time_entries",
+        lambda: TimeEntry.objects.prefetch_related("tasks"),
+        _serialize_time_entry,
+    ),
+    # network app
+    ("org_types", lambda: OrgType.objects.all(), _serialize_org_type),
+    (
+        "interaction_types",
+        lambda: InteractionType.objects.all(),
+        _serialize_interaction_type,
+    ),
+    ("people", lambda: Person.objects.all(), _serialize_person),
+    ("organizations", lambda: Organization.objects.all(), _serialize_organization),
+    (
+        "interactions",
+        lambda: Interaction.objects.prefetch_related("people"),
+        _serialize_interaction,
+    ),
+    ("leads", lambda: Lead.objects.all(), _serialize_lead),
+    ("lead_tasks", lambda: LeadTask.objects.all(), _serialize_lead_task),
+    (
+        "relationships_person_person",
+        lambda: RelationshipPersonPerson.objects.all(),
+        _serialize_relationship_pp,
+    ),
+    (
+        "relationships_organization_person",
+        lambda: RelationshipOrganizationPerson.objects.all(),
+        _serialize_relationship_op,
+    ),
+    ("task_persons", lambda: TaskPerson.objects.all(), _serialize_task_person),
+    (
+        "task_organizations",
+        lambda: TaskOrganization.objects.all(),
+        _serialize_task_organization,
+    ),
+    (
+        "interaction_tasks",
+        lambda: InteractionTask.objects.all(),
+        _serialize_interaction_task,
+    ),
+    # notebook app
+    ("notebook_pages", lambda: Page.objects.all(), _serialize_notebook_page),
+    ("page_links", lambda: PageLink.objects.all(), _serialize_page_link),
+]
+
+
+# key -> lookup whose value marks when a row last changed, for incremental
+# exports. Link tables are only ever created or deleted; the small lookup
+# tables without an entry are always exported whole.
+CHANGED_AT = {
+    "projects": "updated_at",
+    "project_links": "updated_at",
+    "lists": "updated_at",
+    "sections": "updated_at",
+    "tasks": "updated_at",
+    "time_entries": "updated_at",
+    "people": "updated_at",
+    "organizations": "updated_at",
+    "interactions": "updated_at",
+    "leads": "updated_at",
+    "lead_tasks": "created_at",
+    "relationships_person_person": "updated_at",
+    "relationships_organization_person": "updated_at",
+    "task_persons": "created_at",
+    "task_organizations": "created_at",
+    "interaction_tasks": "created_at",
+    "notebook_pages": "updated_at",
+    # Links are rewritten whenever their source page is saved.
+    "page_links": "source_page__updated_at",
+}
+
+
+def _header(since=None):
+    header = {
+        "format": FORMAT,
+        "version": VERSION,
         "exported_at": timezone.now().isoformat(),
-        # tasks app
-        "tags": [_serialize_tag(t) for t in Tag.objects.all()],
-        "projects": [_serialize_project(p) for p in Project.objects.all()],
-        "project_links": [_serialize_project_link(pl) for pl in ProjectLink.objects.all()],
-        "lists": [_serialize_list(l) for l in List.objects.all()],
-        "sections": [_serialize_section(s) for s in Section.objects.all()],
-        "tasks": [_serialize_task(t) for t in Task.objects.all()],
-        "time_entries": [_serialize_time_entry(te) for te in TimeEntry.objects.all()],
-        # network app
-        "org_types": [_serialize_org_type(ot) for ot in OrgType.objects.all()],
-        "interaction_types": [
-            _serialize_interaction_type(it) for it in InteractionType.objects.all()
-        ],
-        "people": [_serialize_person(p) for p in Person.objects.all()],
-        "organizations": [_serialize_organization(o) for o in Organization.objects.all()],
-        "interactions": [_serialize_interaction(i) for i in Interaction.objects.all()],
-        "leads": [_serialize_lead(l) for l in Lead.objects.all()],
-        "lead_tasks": [_serialize_lead_task(lt) for lt in LeadTask.objects.all()],
-        "relationships_person_person": [
-            _serialize_relationship_pp(r) for r in RelationshipPersonPerson.objects.all()
-        ],
-        "relationships_organization_person": [
-            _serialize_relationship_op(r)
-            for r in RelationshipOrganizationPerson.objects.all()
-        ],
-        "task_persons": [_serialize_task_person(tp) for tp in TaskPerson.objects.all()],
-        "task_organizations": [
-            _serialize_task_organization(to) for to in TaskOrganization.objects.all()
-        ],
-        "interaction_tasks": [
-            _serialize_interaction_task(it) for it in InteractionTask.objects.all()
-        ],
-        # notebook app
-        "notebook_pages": [_serialize_notebook_page(p) for p in Page.objects.all()],
-        "page_links": [_serialize_page_link(pl) for pl in PageLink.objects.all()],
     }
+    if since is not None:
+        header["since"] = since.isoformat()
+    return header
+
+
+def _tables(since=None):
+    """Yield (key, queryset, serializer), limited to rows changed since `since`."""
+    for key, queryset, serialize in TABLES:
+        queryset = queryset()
+        if since is not None and key in CHANGED_AT:
+            queryset = queryset.filter(**{f"{CHANGED_AT[key]}__gte": since})
+        yield key, queryset, serialize
+
+
+def _tombstones(since):
+    """Return {key: [deleted ids]} for rows deleted since `since`."""
+    keys = {queryset().model._meta.db_table: key for key, queryset, _ in TABLES}
+    deleted = {}
+    tombstones = Tombstone.objects.filter(deleted_at__gte=since).order_by("id")
+    for table, row_id in tombstones.values_list("table", "row_id"):
+        if table in keys:
+            deleted.setdefault(keys[table], []).append(row_id)
+    return deleted
+
+
+def _rows(queryset, serialize):
+    for obj in queryset.iterator(chunk_size=CHUNK_SIZE):
+        yield serialize(obj)
+
+
+def export_full_database(since=None):
+    """Build the complete database export as a dict.
+
+    With `since` (an aware datetime, normally the previous export's
+    `exported_at`) the export is an increment: only rows changed since then,
+    plus `deleted`, the ids removed from each table. Apply it with
+    full_import.apply_increment() on top of the database it was taken from,
+    or a snapshot of it.
+    """
+    data = _header(since)
+    for key, queryset, serialize in _tables(since):
+        data[key] = list(_rows(queryset, serialize))
+    if since is not None:
+        data["deleted"] = _tombstones(since)
+    return data
+
+
+def iter_full_export_ndjson(progress=None):
+    """Yield the complete database export as NDJSON lines.
+
+    The first line is the header ({"format", "version", "exported_at"});
+    every following line is {"table": <key>, "data": <row>} with the same
+    keys and row shapes as export_full_database(). `progress(done, total)`
+    is called after each table.
+    """
+    yield json.dumps(_header()) + "\n"
+    for done, (key, queryset, serialize) in enumerate(_tables(), start=1):
+        for row in _rows(queryset, serialize):
+            yield json.dumps({"table": key, "data": row}) + "\n"
+        if progress is not None:
+            progress(done, len(TABLES))
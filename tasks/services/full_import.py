@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import json
+from collections import defaultdict
 from datetime import date, time
 
 from django.db import transaction
+from django.utils import timezone
 from django.utils.dateparse import parse_date, parse_datetime, parse_time
 
 from network.models import (
@@ -20,7 +23,17 @@ from network.models import (
     TaskPerson,
 )
 from notebook.models import Page, PageLink
-from tasks.models import List, Project, ProjectLink, Section, Tag, Task, TimeEntry
+from tasks.models import (
+    ChangeLogEntry,
+    List,
+    Project,
+    ProjectLink,
+    Section,
+    Tag,
+    Task,
+    TimeEntry,
+)
+from tasks.services.full_export import FORMAT, TABLES
 
 
 def _make_stats():
@@ -73,8 +86,118 @@ def _parse_time_safe(val):
     return parse_time(val)
 
 
+# Rows per INSERT statement, well under SQLite's bound-variable limit.
+BATCH_SIZE = 500
+
+
+def _existing(queryset, *fields):
+    """Map each key in the database to the id `.first()` would have found.
+
+    Keys are the values of `fields`, as a tuple when there is more than one.
+    """
+    if not queryset.ordered:
+        queryset = queryset.order_by("pk")
+    found = {}
+    for row_id, *key in queryset.values_list("id", *fields).iterator(chunk_size=2000):
+        found.setdefault(key[0] if len(key) == 1 else tuple(key), row_id)
+    return found
+
+
+def _bulk_insert(model, objs, **options):
+    """bulk_create `objs`, keeping the auto_now_add values they were given.
+
+    Inserting runs pre_save, which stamps those fields with the current time,
+    so given values are written back afterwards in one bulk_update pass.
+    """
+    stamped = [
+        f for f in model._meta.concrete_fields if getattr(f, "auto_now_add", False)
+    ]
+    given = [[getattr(obj, f.attname) for f in stamped] for obj in objs]
+    model.objects.bulk_create(objs, batch_size=BATCH_SIZE, **options)
+    restored = []
+    for obj, values in zip(objs, given):
+        kept = [(f, value) for f, value in zip(stamped, values) if value is not None]
+        for f, value in kept:
+            setattr(obj, f.attname, value)
+        if kept:
+            restored.append(obj)
+    if restored:
+        model.objects.bulk_update(
+            restored, [f.name for f in stamped], batch_size=BATCH_SIZE
+        )
+
+
+def _create(objs):
+    """bulk_create `objs` and log them for sync, since no signals fire."""
+    if objs:
+        model = type(objs[0])
+        _bulk_insert(model, objs)
+        ChangeLogEntry.record(model, [obj.pk for obj in objs])
+
+
+def _import_rows(items, stats, stat, existing, key, build, id_map=None, missing=None):
+    """Create the rows of `items` whose key is not in `existing`, in bulk.
+
+    `missing(item)` returns an error message for rows whose references did
+    not import; those rows are counted as errors and dropped. A key seen
+    earlier in the backup resolves to the row created for it, just as when
+    rows were created one at a time. `existing` gains the new keys, and
+    `id_map` maps every imported backup id to its row. Returns the new
+    instances.
+    """
+    pending = {}
+    resolved = []
+    for item in items:
+        if missing is not None:
+            error = missing(item)
+            if error:
+                stats["errors"] += 1
+                stats["error_details"].append(error)
+                continue
+        row_key = key(item)
+        if row_key in existing or row_key in pending:
+            stats[f"{stat}_skipped"] += 1
+        else:
+            pending[row_key] = build(item)
+            stats[f"{stat}_created"] += 1
+        resolved.append((item["id"], row_key))
+
+    created = list(pending.values())
+    _create(created)
+    for row_key, obj in pending.items():
+        existing[row_key] = obj.pk
+    if id_map is not None:
+        for old_id, row_key in resolved:
+            id_map[old_id] = existing[row_key]
+    return created
+
+
+def _task_depths(task_items):
+    parent_lookup = {t["id"]: t.get("parent_id") for t in task_items}
+
+    def _depth(task_id):
+        d = 0
+        current = parent_lookup.get(task_id)
+        while current is not None:
+            d += 1
+            current = parent_lookup.get(current)
+        return d
+
+    levels = defaultdict(list)
+    for item in task_items:
+        levels[_depth(item["id"])].append(item)
+    return [levels[depth] for depth in sorted(levels)]
+
+
 def import_full_database(data: dict) -> dict:
-    """Import a full database backup from the nexus-full-backup JSON format."""
+    """Import a full database backup from the nexus-full-backup JSON format.
+
+    Existing rows are matched on the same natural keys as before (tag name,
+    person name, task section/title/parent, ...) from one preloaded map per
+    table, and new rows are written with bulk_create, so the number of
+    queries grows with the number of tables and task depth levels rather
+    than with the number of rows.
+    """
     stats = _make_stats()
 
     # ID mappings: old_id -> new_id
@@ -95,260 +218,234 @@ def import_full_database(data: dict) -> dict:
     with transaction.atomic():
         # ── 1. Independent entities ──
 
-        # Tags
-        for item in data.get("tags", []):
-            existing = Tag.objects.filter(name=item["name"]).first()
-            if existing:
-                tag_map[item["id"]] = existing.id
-                stats["tags_skipped"] += 1
-            else:
-                obj = Tag.objects.create(name=item["name"])
-                tag_map[item["id"]] = obj.id
-                stats["tags_created"] += 1
-
-        # OrgTypes
-        for item in data.get("org_types", []):
-            existing = OrgType.objects.filter(name=item["name"]).first()
-            if existing:
-                org_type_map[item["id"]] = existing.id
-                stats["org_types_skipped"] += 1
-            else:
-                obj = OrgType.objects.create(name=item["name"])
-                org_type_map[item["id"]] = obj.id
-                stats["org_types_created"] += 1
-
-        # InteractionTypes
-        for item in data.get("interaction_types", []):
-            existing = InteractionType.objects.filter(name=item["name"]).first()
-            if existing:
-                interaction_type_map[item["id"]] = existing.id
-                stats["interaction_types_skipped"] += 1
-            else:
-                obj = InteractionType.objects.create(name=item["name"])
-                interaction_type_map[item["id"]] = obj.id
-                stats["interaction_types_created"] += 1
-
-        # Projects
-        for item in data.get("projects", []):
-            existing = Project.objects.filter(name=item["name"]).first()
-            if existing:
-                project_map[item["id"]] = existing.id
-                stats["projects_skipped"] += 1
-            else:
-                obj = Project.objects.create(
-                    name=item["name"],
-                    description=item.get("description", ""),
-                    is_active=item.get("is_active", True),
-                    position=item.get("position", 0),
-                )
-                project_map[item["id"]] = obj.id
-                stats["projects_created"] += 1
-
-        # People
-        for item in data.get("people", []):
-            existing = Person.objects.filter(
+        _import_rows(
+            data.get("tags", []), stats, "tags",
+            existing=_existing(Tag.objects.all(), "name"),
+            key=lambda item: item["name"],
+            build=lambda item: Tag(name=item["name"]),
+            id_map=tag_map,
+        )
+        _import_rows(
+            data.get("org_types", []), stats, "org_types",
+            existing=_existing(OrgType.objects.all(), "name"),
+            key=lambda item: item["name"],
+            build=lambda item: OrgType(name=item["name"]),
+            id_map=org_type_map,
+        )
+        _import_rows(
+            data.get("interaction_types", []), stats, "interaction_types",
+            existing=_existing(InteractionType.objects.all(), "name"),
+            key=lambda item: item["name"],
+            build=lambda item: InteractionType(name=item["name"]),
+            id_map=interaction_type_map,
+        )
+        _import_rows(
+            data.get("projects", []), stats, "projects",
+            existing=_existing(Project.objects.all(), "name"),
+            key=lambda item: item["name"],
+            build=lambda item: Project(
+                name=item["name"],
+                description=item.get("description", ""),
+                is_active=item.get("is_active", True),
+                position=item.get("position", 0),
+            ),
+            id_map=project_map,
+        )
+        _import_rows(
+            data.get("people", []), stats, "people",
+            existing=_existing(Person.objects.all(), "first_name", "last_name"),
+            key=lambda item: (item["first_name"], item["last_name"]),
+            build=lambda item: Person(
                 first_name=item["first_name"],
+                middle_name=item.get("middle_name", ""),
                 last_name=item["last_name"],
-            ).first()
-            if existing:
-                person_map[item["id"]] = existing.id
-                stats["people_skipped"] += 1
-            else:
-                obj = Person.objects.create(
-                    first_name=item["first_name"],
-                    middle_name=item.get("middle_name", ""),
-                    last_name=item["last_name"],
-                    email=item.get("email", ""),
-                    linkedin_url=item.get("linkedin_url", ""),
-                    notes=item.get("notes", ""),
-                    follow_up_cadence_days=item.get("follow_up_cadence_days"),
-                )
-                person_map[item["id"]] = obj.id
-                stats["people_created"] += 1
+                email=item.get("email", ""),
+                linkedin_url=item.get("linkedin_url", ""),
+                notes=item.get("notes", ""),
+                follow_up_cadence_days=item.get("follow_up_cadence_days"),
+                created_at=_parse_datetime_safe(item.get("created_at")),
+            ),
+            id_map=person_map,
+        )
 
         # ── 2. FK-dependent entities ──
 
-        # Organizations (FK -> OrgType)
-        for item in data.get("organizations", []):
-            existing = Organization.objects.filter(name=item["name"]).first()
-            if existing:
-                organization_map[item["id"]] = existing.id
-                stats["organizations_skipped"] += 1
-            else:
-                obj = Organization.objects.create(
-                    name=item["name"],
-                    org_type_id=org_type_map[item["org_type_id"]],
-                    notes=item.get("notes", ""),
-                )
-                organization_map[item["id"]] = obj.id
-                stats["organizations_created"] += 1
-
-        # Lists (FK -> Project, nullable)
-        for item in data.get("lists", []):
-            existing = List.objects.filter(name=item["name"]).first()
-            if existing:
-                list_map[item["id"]] = existing.id
-                stats["lists_skipped"] += 1
-            else:
-                project_id = None
-                if item.get("project_id") is not None:
-                    project_id = project_map.get(item["project_id"])
-                obj = List.objects.create(
-                    name=item["name"],
-                    emoji=item.get("emoji", ""),
-                    position=item.get("position", 0),
-                    project_id=project_id,
-                )
-                list_map[item["id"]] = obj.id
-                stats["lists_created"] += 1
-
-        # ProjectLinks (FK -> Project)
-        for item in data.get("project_links", []):
-            new_project_id = project_map.get(item["project_id"])
-            if new_project_id is None:
-                stats["errors"] += 1
-                stats["error_details"].append(
-                    f"ProjectLink {item['id']}: project_id {item['project_id']} not found"
-                )
-                continue
-            existing = ProjectLink.objects.filter(
-                project_id=new_project_id,
+        _import_rows(
+            data.get("organizations", []), stats, "organizations",
+            existing=_existing(Organization.objects.all(), "name"),
+            key=lambda item: item["name"],
+            build=lambda item: Organization(
+                name=item["name"],
+                org_type_id=org_type_map[item["org_type_id"]],
+                notes=item.get("notes", ""),
+            ),
+            id_map=organization_map,
+        )
+        _import_rows(
+            data.get("lists", []), stats, "lists",
+            existing=_existing(List.objects.all(), "name"),
+            key=lambda item: item["name"],
+            build=lambda item: List(
+                name=item["name"],
+                emoji=item.get("emoji", ""),
+                position=item.get("position", 0),
+                project_id=(
+                    project_map.get(item["project_id"])
+                    if item.get("project_id") is not None
+                    else None
+                ),
+            ),
+            id_map=list_map,
+        )
+        _import_rows(
+            data.get("project_links", []), stats, "project_links",
+            existing=_existing(ProjectLink.objects.all(), "project_id", "url", "descriptor"),
+            key=lambda item: (project_map[item["project_id"]], item["url"], item["descriptor"]),
+            build=lambda item: ProjectLink(
+                project_id=project_map[item["project_id"]],
                 url=item["url"],
                 descriptor=item["descriptor"],
-            ).first()
-            if existing:
-                stats["project_links_skipped"] += 1
-            else:
-                ProjectLink.objects.create(
-                    project_id=new_project_id,
-                    url=item["url"],
-                    descriptor=item["descriptor"],
-                )
-                stats["project_links_created"] += 1
-
-        # Sections (FK -> List)
-        for item in data.get("sections", []):
-            new_list_id = list_map.get(item["list_id"])
-            if new_list_id is None:
-                stats["errors"] += 1
-                stats["error_details"].append(
-                    f"Section {item['id']}: list_id {item['list_id']} not found"
-                )
-                continue
-            existing = Section.objects.filter(
-                list_id=new_list_id, name=item["name"]
-            ).first()
-            if existing:
-                section_map[item["id"]] = existing.id
-                stats["sections_skipped"] += 1
-            else:
-                obj = Section.objects.create(
-                    list_id=new_list_id,
-                    name=item["name"],
-                    emoji=item.get("emoji", ""),
-                    position=item.get("position", 0),
-                )
-                section_map[item["id"]] = obj.id
-                stats["sections_created"] += 1
-
-        # ── 3. Tasks (tree: root first, then children) ──
-
-        task_items = data.get("tasks", [])
-        # Sort: root tasks (parent_id=None) first, then by parent_id
-        # Build depth map for proper ordering
-        parent_lookup = {t["id"]: t.get("parent_id") for t in task_items}
-
-        def _depth(task_id):
-            d = 0
-            current = parent_lookup.get(task_id)
-            while current is not None:
-                d += 1
-                current = parent_lookup.get(current)
-            return d
-
-        sorted_tasks = sorted(task_items, key=lambda t: _depth(t["id"]))
-
-        for item in sorted_tasks:
-            new_section_id = section_map.get(item["section_id"])
-            if new_section_id is None:
-                stats["errors"] += 1
-                stats["error_details"].append(
-                    f"Task {item['id']}: section_id {item['section_id']} not found"
-                )
-                continue
-
-            new_parent_id = None
-            if item.get("parent_id") is not None:
-                new_parent_id = task_map.get(item["parent_id"])
-
-            existing = Task.objects.filter(
-                section_id=new_section_id,
+            ),
+            missing=lambda item: (
+                f"ProjectLink {item['id']}: project_id {item['project_id']} not found"
+                if item["project_id"] not in project_map
+                else None
+            ),
+        )
+        _import_rows(
+            data.get("sections", []), stats, "sections",
+            existing=_existing(Section.objects.all(), "list_id", "name"),
+            key=lambda item: (list_map[item["list_id"]], item["name"]),
+            build=lambda item: Section(
+                list_id=list_map[item["list_id"]],
+                name=item["name"],
+                emoji=item.get("emoji", ""),
+                position=item.get("position", 0),
+            ),
+            id_map=section_map,
+            missing=lambda item: (
+                f"Section {item['id']}: list_id {item['list_id']} not found"
+                if item["list_id"] not in list_map
+                else None
+            ),
+        )
+
+        # ── 3. Tasks (tree: one bulk insert per depth level) ──
+
+        task_keys = {}
+        task_paths = {}
+        queryset = Task.objects.values_list("id", "section_id", "title", "parent_id", "path")
+        for task_id, section_id, title, parent_id, path in queryset.iterator(chunk_size=2000):
+            task_keys.setdefault((section_id, title, parent_id), task_id)
+            task_paths[task_id] = path
+        task_tags = []
+
+        def _task_parent(item):
+            if item.get("parent_id") is None:
+                return None
+            return task_map.get(item["parent_id"])
+
+        def _build_task(item):
+            parent_id = _task_parent(item)
+            obj = Task(
+                section_id=section_map[item["section_id"]],
+                parent_id=parent_id,
+                # save() would derive this; bulk_create does not call it.
+                path=f"{task_paths[parent_id]}{parent_id}/" if parent_id else "",
                 title=item["title"],
-                parent_id=new_parent_id,
-            ).first()
-            if existing:
-                task_map[item["id"]] = existing.id
-                stats["tasks_skipped"] += 1
-            else:
-                obj = Task.objects.create(
-                    section_id=new_section_id,
-                    parent_id=new_parent_id,
-                    title=item["title"],
-                    notes=item.get("notes", ""),
-                    due_date=_parse_date_safe(item.get("due_date")),
-                    due_time=_parse_time_safe(item.get("due_time")),
-                    is_completed=item.get("is_completed", False),
-                    completed_at=_parse_datetime_safe(item.get("completed_at")),
-                    created_at=_parse_datetime_safe(item.get("created_at")) or None,
-                    position=item.get("position", 0),
-                    external_id=item.get("external_id"),
-                    is_pinned=item.get("is_pinned", False),
-                    recurrence_type=item.get("recurrence_type", "none"),
-                    recurrence_rule=item.get("recurrence_rule", {}),
-                )
-                # M2M: tags
-                for old_tag_id in item.get("tag_ids", []):
-                    new_tag_id = tag_map.get(old_tag_id)
-                    if new_tag_id:
-                        obj.tags.add(new_tag_id)
-                task_map[item["id"]] = obj.id
-                stats["tasks_created"] += 1
+                notes=item.get("notes", ""),
+                due_date=_parse_date_safe(item.get("due_date")),
+                due_time=_parse_time_safe(item.get("due_time")),
+                is_completed=item.get("is_completed", False),
+                completed_at=_parse_datetime_safe(item.get("completed_at")),
+                created_at=_parse_datetime_safe(item.get("created_at")) or timezone.now(),
+                position=item.get("position", 0),
+                external_id=item.get("external_id"),
+                is_pinned=item.get("is_pinned", False),
+                recurrence_type=item.get("recurrence_type", "none"),
+                recurrence_rule=item.get("recurrence_rule", {}),
+            )
+            tag_ids = [tag_map[t] for t in item.get("tag_ids", []) if tag_map.get(t)]
+            task_tags.append((obj, tag_ids))
+            return obj
+
+        for level in _task_depths(data.get("tasks", [])):
+            created = _import_rows(
+                level, stats, "tasks",
+                existing=task_keys,
+                key=lambda item: (section_map[item["section_id"]], item["title"], _task_parent(item)),
+                build=_build_task,
+                id_map=task_map,
+                missing=lambda item: (
+                    f"Task {item['id']}: section_id {item['section_id']} not found"
+                    if item["section_id"] not in section_map
+                    else None
+                ),
+            )
+            for obj in created:
+                task_paths[obj.pk] = obj.path
+
+        Task.tags.through.objects.bulk_create(
+            [
+                Task.tags.through(task_id=obj.pk, tag_id=tag_id)
+                for obj, tag_ids in task_tags
+                for tag_id in dict.fromkeys(tag_ids)
+            ],
+            batch_size=BATCH_SIZE,
+        )
 
         # ── 4. Remaining FK-dependent entities ──
 
         # TimeEntries (FK -> Project, M2M -> Task)
-        for item in data.get("time_entries", []):
-            new_project_id = project_map.get(item["project_id"])
-            if new_project_id is None:
-                stats["errors"] += 1
-                stats["error_details"].append(
-                    f"TimeEntry {item['id']}: project_id {item['project_id']} not found"
-                )
-                continue
-            entry_date = _parse_date_safe(item.get("date"))
-            existing = TimeEntry.objects.filter(
-                project_id=new_project_id,
-                date=entry_date,
+        entry_tasks = []
+
+        def _build_time_entry(item):
+            obj = TimeEntry(
+                project_id=project_map[item["project_id"]],
                 description=item.get("description", ""),
-            ).first()
-            if existing:
-                time_entry_map[item["id"]] = existing.id
-                stats["time_entries_skipped"] += 1
-            else:
-                obj = TimeEntry.objects.create(
-                    project_id=new_project_id,
-                    description=item.get("description", ""),
-                    date=entry_date,
-                )
-                # M2M: tasks
-                for old_task_id in item.get("task_ids", []):
-                    new_task_id = task_map.get(old_task_id)
-                    if new_task_id:
-                        obj.tasks.add(new_task_id)
-                time_entry_map[item["id"]] = obj.id
-                stats["time_entries_created"] += 1
-
-        # Interactions (M2M -> People, FK -> InteractionType)
+                date=_parse_date_safe(item.get("date")),
+            )
+            task_ids = [task_map[t] for t in item.get("task_ids", []) if task_map.get(t)]
+            entry_tasks.append((obj, task_ids))
+            return obj
+
+        _import_rows(
+            data.get("time_entries", []), stats, "time_entries",
+            existing=_existing(TimeEntry.objects.all(), "project_id", "date", "description"),
+            key=lambda item: (
+                project_map[item["project_id"]],
+                _parse_date_safe(item.get("date")),
+                item.get("description", ""),
+            ),
+            build=_build_time_entry,
+            id_map=time_entry_map,
+            missing=lambda item: (
+                f"TimeEntry {item['id']}: project_id {item['project_id']} not found"
+                if item["project_id"] not in project_map
+                else None
+            ),
+        )
+        TimeEntry.tasks.through.objects.bulk_create(
+            [
+                TimeEntry.tasks.through(timeentry_id=obj.pk, task_id=task_id)
+                for obj, task_ids in entry_tasks
+                for task_id in dict.fromkeys(task_ids)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        # Interactions (M2M -> People, FK -> InteractionType). A backup
+        # interaction matches any existing one that shares its first person,
+        # type and date, so every person of a new interaction is a key.
+        interaction_keys = {}
+        queryset = Interaction.people.through.objects.order_by("interaction_id").values_list(
+            "interaction_id", "person_id", "interaction__interaction_type_id", "interaction__date"
+        )
+        for interaction_id, person_id, type_id, i_date in queryset.iterator(chunk_size=2000):
+            interaction_keys.setdefault((person_id, type_id, i_date), interaction_id)
+        pending = {}
+        new_interactions = []
+        resolved = []
         for item in data.get("interactions", []):
             # Support both old format (person_id) and new format (person_ids)
             raw_person_ids = item.get("person_ids", [])
@@ -363,198 +460,185 @@ def import_full_database(data: dict) -> dict:
                 )
                 continue
             i_date = _parse_date_safe(item.get("date"))
-            existing = Interaction.objects.filter(
-                people__id=new_person_ids[0],
-                interaction_type_id=new_it_id,
-                date=i_date,
-            ).first()
-            if existing:
-                interaction_map[item["id"]] = existing.id
+            row_key = (new_person_ids[0], new_it_id, i_date)
+            if row_key in interaction_keys or row_key in pending:
                 stats["interactions_skipped"] += 1
             else:
-                obj = Interaction.objects.create(
+                obj = Interaction(
                     interaction_type_id=new_it_id,
                     date=i_date,
                     notes=item.get("notes", ""),
+                    created_at=_parse_datetime_safe(item.get("created_at")),
                 )
-                obj.people.set(new_person_ids)
-                interaction_map[item["id"]] = obj.id
+                new_interactions.append((obj, new_person_ids))
+                for person_id in new_person_ids:
+                    pending.setdefault((person_id, new_it_id, i_date), obj)
                 stats["interactions_created"] += 1
+            resolved.append((item["id"], row_key))
+        _create([obj for obj, _ in new_interactions])
+        Interaction.people.through.objects.bulk_create(
+            [
+                Interaction.people.through(interaction_id=obj.pk, person_id=person_id)
+                for obj, person_ids in new_interactions
+                for person_id in dict.fromkeys(person_ids)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        for row_key, obj in pending.items():
+            interaction_keys.setdefault(row_key, obj.pk)
+        for old_id, row_key in resolved:
+            interaction_map[old_id] = interaction_keys[row_key]
 
         # Leads (FK -> Person nullable, Organization nullable)
-        for item in data.get("leads", []):
-            new_person_id = None
-            if item.get("person_id") is not None:
-                new_person_id = person_map.get(item["person_id"])
-            new_org_id = None
-            if item.get("organization_id") is not None:
-                new_org_id = organization_map.get(item["organization_id"])
-            existing = Lead.objects.filter(title=item["title"]).first()
-            if existing:
-                lead_map[item["id"]] = existing.id
-                stats["leads_skipped"] += 1
-            else:
-                obj = Lead.objects.create(
-                    title=item["title"],
-                    status=item.get("status", "prospect"),
-                    notes=item.get("notes", ""),
-                    person_id=new_person_id,
-                    organization_id=new_org_id,
-                )
-                lead_map[item["id"]] = obj.id
-                stats["leads_created"] += 1
+        _import_rows(
+            data.get("leads", []), stats, "leads",
+            existing=_existing(Lead.objects.all(), "title"),
+            key=lambda item: item["title"],
+            build=lambda item: Lead(
+                title=item["title"],
+                status=item.get("status", "prospect"),
+                notes=item.get("notes", ""),
+                person_id=(
+                    person_map.get(item["person_id"])
+                    if item.get("person_id") is not None
+                    else None
+                ),
+                organization_id=(
+                    organization_map.get(item["organization_id"])
+                    if item.get("organization_id") is not None
+                    else None
+                ),
+            ),
+            id_map=lead_map,
+        )
 
         # ── 5. Join/link tables ──
 
-        # LeadTasks
-        for item in data.get("lead_tasks", []):
-            new_lead_id = lead_map.get(item["lead_id"])
-            new_task_id = task_map.get(item["task_id"])
-            if new_lead_id is None or new_task_id is None:
-                stats["errors"] += 1
-                stats["error_details"].append(
-                    f"LeadTask {item['id']}: lead or task not found"
-                )
-                continue
-            existing = LeadTask.objects.filter(
-                lead_id=new_lead_id, task_id=new_task_id
-            ).first()
-            if existing:
-                stats["lead_tasks_skipped"] += 1
-            else:
-                LeadTask.objects.create(lead_id=new_lead_id, task_id=new_task_id)
-                stats["lead_tasks_created"] += 1
-
-        # RelationshipPersonPerson
-        for item in data.get("relationships_person_person", []):
-            new_p1 = person_map.get(item["person_1_id"])
-            new_p2 = person_map.get(item["person_2_id"])
-            if new_p1 is None or new_p2 is None:
-                stats["errors"] += 1
-                stats["error_details"].append(
-                    f"RelationshipPP {item['id']}: person not found"
-                )
-                continue
-            existing = RelationshipPersonPerson.objects.filter(
-                person_1_id=min(new_p1, new_p2),
-                person_2_id=max(new_p1, new_p2),
-            ).first()
-            if existing:
-                stats["relationships_pp_skipped"] += 1
-            else:
-                obj = RelationshipPersonPerson(
-                    person_1_id=new_p1,
-                    person_2_id=new_p2,
-                    notes=item.get("notes", ""),
-                )
-                obj.save()  # save() normalizes ordering
-                stats["relationships_pp_created"] += 1
-
-        # RelationshipOrganizationPerson
-        for item in data.get("relationships_organization_person", []):
-            new_org_id = organization_map.get(item["organization_id"])
-            new_person_id = person_map.get(item["person_id"])
-            if new_org_id is None or new_person_id is None:
-                stats["errors"] += 1
-                stats["error_details"].append(
-                    f"RelationshipOP {item['id']}: org or person not found"
-                )
-                continue
-            existing = RelationshipOrganizationPerson.objects.filter(
-                organization_id=new_org_id, person_id=new_person_id
-            ).first()
-            if existing:
-                stats["relationships_op_skipped"] += 1
-            else:
-                RelationshipOrganizationPerson.objects.create(
-                    organization_id=new_org_id,
-                    person_id=new_person_id,
-                    notes=item.get("notes", ""),
-                )
-                stats["relationships_op_created"] += 1
-
-        # TaskPerson
-        for item in data.get("task_persons", []):
-            new_task_id = task_map.get(item["task_id"])
-            new_person_id = person_map.get(item["person_id"])
-            if new_task_id is None or new_person_id is None:
-                stats["errors"] += 1
-                stats["error_details"].append(
-                    f"TaskPerson {item['id']}: task or person not found"
-                )
-                continue
-            existing = TaskPerson.objects.filter(
-                task_id=new_task_id, person_id=new_person_id
-            ).first()
-            if existing:
-                stats["task_persons_skipped"] += 1
-            else:
-                TaskPerson.objects.create(
-                    task_id=new_task_id, person_id=new_person_id
-                )
-                stats["task_persons_created"] += 1
-
-        # TaskOrganization
-        for item in data.get("task_organizations", []):
-            new_task_id = task_map.get(item["task_id"])
-            new_org_id = organization_map.get(item["organization_id"])
-            if new_task_id is None or new_org_id is None:
-                stats["errors"] += 1
-                stats["error_details"].append(
-                    f"TaskOrganization {item['id']}: task or org not found"
-                )
-                continue
-            existing = TaskOrganization.objects.filter(
-                task_id=new_task_id, organization_id=new_org_id
-            ).first()
-            if existing:
-                stats["task_organizations_skipped"] += 1
-            else:
-                TaskOrganization.objects.create(
-                    task_id=new_task_id, organization_id=new_org_id
-                )
-                stats["task_organizations_created"] += 1
-
-        # InteractionTask
-        for item in data.get("interaction_tasks", []):
-            new_interaction_id = interaction_map.get(item["interaction_id"])
-            new_task_id = task_map.get(item["task_id"])
-            if new_interaction_id is None or new_task_id is None:
-                stats["errors"] += 1
-                stats["error_details"].append(
-                    f"InteractionTask {item['id']}: interaction or task not found"
-                )
-                continue
-            existing = InteractionTask.objects.filter(
-                interaction_id=new_interaction_id, task_id=new_task_id
-            ).first()
-            if existing:
-                stats["interaction_tasks_skipped"] += 1
-            else:
-                InteractionTask.objects.create(
-                    interaction_id=new_interaction_id, task_id=new_task_id
-                )
-                stats["interaction_tasks_created"] += 1
+        _import_rows(
+            data.get("lead_tasks", []), stats, "lead_tasks",
+            existing=_existing(LeadTask.objects.all(), "lead_id", "task_id"),
+            key=lambda item: (lead_map[item["lead_id"]], task_map[item["task_id"]]),
+            build=lambda item: LeadTask(
+                lead_id=lead_map[item["lead_id"]], task_id=task_map[item["task_id"]]
+            ),
+            missing=lambda item: (
+                f"LeadTask {item['id']}: lead or task not found"
+                if item["lead_id"] not in lead_map or item["task_id"] not in task_map
+                else None
+            ),
+        )
+
+        def _person_pair(item):
+            new_p1 = person_map[item["person_1_id"]]
+            new_p2 = person_map[item["person_2_id"]]
+            return min(new_p1, new_p2), max(new_p1, new_p2)
+
+        _import_rows(
+            data.get("relationships_person_person", []), stats, "relationships_pp",
+            existing=_existing(
+                RelationshipPersonPerson.objects.all(), "person_1_id", "person_2_id"
+            ),
+            key=_person_pair,
+            # save() normalizes the pair order; bulk_create does not call it.
+            build=lambda item: RelationshipPersonPerson(
+                person_1_id=_person_pair(item)[0],
+                person_2_id=_person_pair(item)[1],
+                notes=item.get("notes", ""),
+            ),
+            missing=lambda item: (
+                f"RelationshipPP {item['id']}: person not found"
+                if item["person_1_id"] not in person_map
+                or item["person_2_id"] not in person_map
+                else None
+            ),
+        )
+        _import_rows(
+            data.get("relationships_organization_person", []), stats, "relationships_op",
+            existing=_existing(
+                RelationshipOrganizationPerson.objects.all(), "organization_id", "person_id"
+            ),
+            key=lambda item: (
+                organization_map[item["organization_id"]],
+                person_map[item["person_id"]],
+            ),
+            build=lambda item: RelationshipOrganizationPerson(
+                organization_id=organization_map[item["organization_id"]],
+                person_id=person_map[item["person_id"]],
+                notes=item.get("notes", ""),
+            ),
+            missing=lambda item: (
+                f"RelationshipOP {item['id']}: org or person not found"
+                if item["organization_id"] not in organization_map
+                or item["person_id"] not in person_map
+                else None
+            ),
+        )
+        _import_rows(
+            data.get("task_persons", []), stats, "task_persons",
+            existing=_existing(TaskPerson.objects.all(), "task_id", "person_id"),
+            key=lambda item: (task_map[item["task_id"]], person_map[item["person_id"]]),
+            build=lambda item: TaskPerson(
+                task_id=task_map[item["task_id"]], person_id=person_map[item["person_id"]]
+            ),
+            missing=lambda item: (
+                f"TaskPerson {item['id']}: task or person not found"
+                if item["task_id"] not in task_map or item["person_id"] not in person_map
+                else None
+            ),
+        )
+        _import_rows(
+            data.get("task_organizations", []), stats, "task_organizations",
+            existing=_existing(TaskOrganization.objects.all(), "task_id", "organization_id"),
+            key=lambda item: (
+                task_map[item["task_id"]],
+                organization_map[item["organization_id"]],
+            ),
+            build=lambda item: TaskOrganization(
+                task_id=task_map[item["task_id"]],
+                organization_id=organization_map[item["organization_id"]],
+            ),
+            missing=lambda item: (
+                f"TaskOrganization {item['id']}: task or org not found"
+                if item["task_id"] not in task_map
+                or item["organization_id"] not in organization_map
+                else None
+            ),
+        )
+        _import_rows(
+            data.get("interaction_tasks", []), stats, "interaction_tasks",
+            existing=_existing(InteractionTask.objects.all(), "interaction_id", "task_id"),
+            key=lambda item: (
+                interaction_map[item["interaction_id"]],
+                task_map[item["task_id"]],
+            ),
+            build=lambda item: InteractionTask(
+                interaction_id=interaction_map[item["interaction_id"]],
+                task_id=task_map[item["task_id"]],
+            ),
+            missing=lambda item: (
+                f"InteractionTask {item['id']}: interaction or task not found"
+                if item["interaction_id"] not in interaction_map
+                or item["task_id"] not in task_map
+                else None
+            ),
+        )
 
         # ── 6. Notebook ──
 
         # Pages (independent — no FK to other apps)
-        for item in data.get("notebook_pages", []):
-            existing = Page.objects.filter(slug=item["slug"]).first()
-            if existing:
-                page_map[item["id"]] = existing.id
-                stats["notebook_pages_skipped"] += 1
-            else:
-                obj = Page(
-                    title=item["title"],
-                    slug=item["slug"],
-                    content=item.get("content", ""),
-                    page_type=item.get("page_type", "wiki"),
-                    date=_parse_date_safe(item.get("date")),
-                )
-                obj.save()
-                page_map[item["id"]] = obj.id
-                stats["notebook_pages_created"] += 1
+        _import_rows(
+            data.get("notebook_pages", []), stats, "notebook_pages",
+            existing=_existing(Page.objects.all(), "slug"),
+            key=lambda item: item["slug"],
+            build=lambda item: Page(
+                title=item["title"],
+                slug=item["slug"],
+                content=item.get("content", ""),
+                page_type=item.get("page_type", "wiki"),
+                date=_parse_date_safe(item.get("date")),
+            ),
+            id_map=page_map,
+        )
 
         # Reconcile entity mentions from content (rebuilds from parsed text)
         if data.get("notebook_pages"):
@@ -564,24 +648,149 @@ def import_full_database(data: dict) -> dict:
                 reconcile_mentions(page)
 
         # PageLinks (FK -> Page, FK -> Page)
-        for item in data.get("page_links", []):
-            new_source = page_map.get(item["source_page_id"])
-            new_target = page_map.get(item["target_page_id"])
-            if new_source is None or new_target is None:
-                stats["errors"] += 1
-                stats["error_details"].append(
-                    f"PageLink {item['id']}: source or target page not found"
-                )
-                continue
-            existing = PageLink.objects.filter(
-                source_page_id=new_source, target_page_id=new_target
-            ).first()
-            if existing:
-                stats["page_links_skipped"] += 1
-            else:
-                PageLink.objects.create(
-                    source_page_id=new_source, target_page_id=new_target
-                )
-                stats["page_links_created"] += 1
+        _import_rows(
+            data.get("page_links", []), stats, "page_links",
+            existing=_existing(PageLink.objects.all(), "source_page_id", "target_page_id"),
+            key=lambda item: (page_map[item["source_page_id"]], page_map[item["target_page_id"]]),
+            build=lambda item: PageLink(
+                source_page_id=page_map[item["source_page_id"]],
+                target_page_id=page_map[item["target_page_id"]],
+            ),
+            missing=lambda item: (
+                f"PageLink {item['id']}: source or target page not found"
+                if item["source_page_id"] not in page_map
+                or item["target_page_id"] not in page_map
+                else None
+            ),
+        )
+
+    return stats
+
+
+# Export keys of m2m relations embedded in their owner's rows -> field name.
+M2M_KEYS = {"tag_ids": "tags", "task_ids": "tasks", "person_ids": "people"}
+
+
+def _upsert_rows(model, rows):
+    """Insert or overwrite `rows` by primary key; returns the ids written.
+
+    Relations listed in M2M_KEYS replace the row's current set. Fields an
+    export does not carry keep their value, and auto_now_add fields take the
+    exported value rather than the time of the import.
+    """
+    if not rows:
+        return []
+    m2m = {key: model._meta.get_field(name) for key, name in M2M_KEYS.items() if key in rows[0]}
+    columns = [key for key in rows[0] if key not in m2m]
+    update_fields = [
+        key for key in columns
+        if key != "id" and not getattr(model._meta.get_field(key), "auto_now_add", False)
+    ]
+    _bulk_insert(
+        model,
+        [model(**{key: row[key] for key in columns}) for row in rows],
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=update_fields,
+    )
+    ids = [row["id"] for row in rows]
+    for key, field in m2m.items():
+        through = field.remote_field.through
+        owner, target = f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id"
+        through.objects.filter(**{f"{owner}__in": ids}).delete()
+        through.objects.bulk_create(
+            [through(**{owner: row["id"], target: target_id}) for row in rows for target_id in row[key]],
+            batch_size=BATCH_SIZE,
+        )
+    ChangeLogEntry.record(model, ids)
+    return ids
+
+
+def _repair_task_paths(task_ids):
+    """Recompute `path` for upserted tasks; exports do not carry it.
+
+    A move rewrites the path of every descendant, which marks them changed
+    too, so each task whose ancestry moved is in the increment itself.
+    """
+    parents = dict(Task.objects.filter(pk__in=task_ids).values_list("id", "parent_id"))
+    outside = set(parents.values()) - set(parents) - {None}
+    known = dict(Task.objects.filter(pk__in=outside).values_list("id", "path"))
+
+    def path_of(task_id):
+        if task_id not in known:
+            parent_id = parents[task_id]
+            known[task_id] = "" if parent_id is None else f"{path_of(parent_id)}{parent_id}/"
+        return known[task_id]
+
+    Task.objects.bulk_update(
+        [Task(pk=task_id, path=path_of(task_id)) for task_id in parents],
+        ["path"],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def apply_increment(data: dict) -> dict:
+    """Apply an incremental export (export_full_database(since=...)).
+
+    Rows are written by primary key, so the base must be the database the
+    increment was taken from or a restored snapshot of it; increments apply
+    in order, each on top of the last. Deletes run after upserts, children
+    first. Returns per-table upsert and delete counts.
+    """
+    if data.get("format") != FORMAT or "since" not in data:
+        raise ValueError("Not an incremental nexus-full-backup export.")
+
+    stats = {}
+    upserted = {}
+    with transaction.atomic():
+        for key, queryset, _serialize in TABLES:
+            model = queryset().model
+            upserted[key] = _upsert_rows(model, data.get(key, []))
+            stats[f"{key}_upserted"] = len(upserted[key])
+        if upserted["tasks"]:
+            _repair_task_paths(upserted["tasks"])
+
+        deleted = data.get("deleted", {})
+        for key, queryset, _serialize in reversed(TABLES):
+            ids = deleted.get(key, [])
+            model = queryset().model
+            for start in range(0, len(ids), BATCH_SIZE):
+                model.objects.filter(pk__in=ids[start:start + BATCH_SIZE]).delete()
+            stats[f"{key}_deleted"] = len(ids)
+
+        if upserted["notebook_pages"]:
+            from notebook.mentions import reconcile_mentions
+
+            for page in Page.objects.filter(pk__in=upserted["notebook_pages"]):
+                reconcile_mentions(page, process_checkboxes=False)
 
     return stats
+
+
+def read_full_export_ndjson(lines) -> dict:
+    """Rebuild the export_full_database() dict from full_export NDJSON.
+
+    `lines` is any iterable of lines (bytes or str), such as an open file;
+    each line is parsed on its own, so the raw text is never held whole.
+    Raises ValueError for anything that is not a nexus-full-backup stream.
+    """
+    lines = iter(lines)
+    try:
+        header = json.loads(next(lines))
+    except StopIteration:
+        raise ValueError("Empty NDJSON backup.")
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        raise ValueError("Not a nexus-full-backup NDJSON export.")
+
+    data = dict(header)
+    tables = {key: data.setdefault(key, []) for key, _queryset, _serialize in TABLES}
+    for number, line in enumerate(lines, start=2):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict) or "data" not in record:
+            raise ValueError(f"Line {number}: expected an object.")
+        if record.get("table") not in tables:
+            raise ValueError(f"Line {number}: unknown table {record.get('table')!r}.")
+        tables[record["table"]].append(record["data"])
+    return data
@@ -3,11 +3,13 @@ from __future__ import annotations
 import csv
 import io
 import json
+from collections import defaultdict
 from datetime import date
 
 from django.db import transaction
+from django.utils.dateparse import parse_datetime
 
-from tasks.models import List, Section, Tag, Task
+from tasks.models import ChangeLogEntry, List, Section, Tag, Task
 
 
 def _make_stats() -> dict:
@@ -23,47 +25,177 @@ def _make_stats() -> dict:
     }
 
 
-def _get_or_create_list(name: str, emoji: str, position: int, stats: dict) -> List:
-    task_list, created = List.objects.get_or_create(
-        name=name,
-        defaults={"emoji": emoji, "position": position},
-    )
-    if created:
-        stats["lists_created"] += 1
-    return task_list
-
-
-def _get_or_create_section(
-    task_list: List, name: str, emoji: str, position: int, stats: dict
-) -> Section:
-    section, created = Section.objects.get_or_create(
-        list=task_list,
-        name=name,
-        defaults={"emoji": emoji, "position": position},
-    )
-    if created:
-        stats["sections_created"] += 1
-    return section
+# Rows per INSERT statement, well under SQLite's bound-variable limit.
+BATCH_SIZE = 500
 
 
-def _attach_tags(task: Task, tag_names: list[str], stats: dict) -> None:
-    for tag_name in tag_names:
-        if not tag_name:
-            continue
-        tag, created = Tag.objects.get_or_create(name=tag_name)
-        if created:
-            stats["tags_created"] += 1
-        task.tags.add(tag)
+def _create(objs):
+    """bulk_create `objs` and log them for sync, since no signals fire."""
+    if objs:
+        model = type(objs[0])
+        model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+        ChangeLogEntry.record(model, [obj.pk for obj in objs])
+
+
+class _ImportIndex:
+    """Existing lists, sections, tags and tasks, with the rows an import adds.
+
+    Lookups never query per row: lists, sections and tags are loaded up
+    front, and the (section, parent, title) keys of a section's tasks the
+    first time the import touches it. Rows that are not saved yet get
+    negative keys, and `save()` writes them all in bulk.
+    """
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+        self.lists: dict[str, List] = {}
+        for task_list in List.objects.order_by("pk"):
+            self.lists.setdefault(task_list.name, task_list)
+        self.sections: dict[tuple, Section] = {}
+        for section in Section.objects.order_by("pk"):
+            self.sections.setdefault((section.list_id, section.name), section)
+        self.tags = {tag.name: tag for tag in Tag.objects.all()}
+        self.new_section_keys: dict[tuple[str, str], int] = {}
+        self.loaded_sections: set[int] = set()
+        # (section key, parent key or None, title) -> task key
+        self.tasks: dict[tuple[int, int | None, str], int] = {}
+        self.paths: dict[int, str] = {}  # existing task pk -> path
+        self.new_lists: list[List] = []
+        self.new_sections: list[Section] = []
+        self.new_tags: list[Tag] = []
+        self.new_tasks: dict[int, Task] = {}  # negative key -> Task
+        self.new_task_parents: dict[int, int | None] = {}
+        self.new_task_tags: dict[int, list[str]] = {}
+        self.depths: dict[int, int] = {}
+
+    def get_or_create_list(self, name: str, emoji: str, position: int) -> List:
+        task_list = self.lists.get(name)
+        if task_list is None:
+            task_list = self.lists[name] = List(
+                name=name, emoji=emoji, position=position
+            )
+            self.new_lists.append(task_list)
+            self.stats["lists_created"] += 1
+        return task_list
+
+    def get_or_create_section(
+        self, task_list: List, name: str, emoji: str, position: int
+    ) -> int:
+        """Return the key of the section `name` in `task_list`."""
+        key = self.new_section_keys.get((task_list.name, name))
+        if key is not None:
+            return key
+        section = None
+        if task_list.pk is not None:
+            section = self.sections.get((task_list.pk, name))
+        if section is None:
+            self.new_sections.append(
+                Section(list=task_list, name=name, emoji=emoji, position=position)
+            )
+            self.stats["sections_created"] += 1
+            key = self.new_section_keys[(task_list.name, name)] = -len(
+                self.new_sections
+            )
+            return key
+        if section.pk not in self.loaded_sections:
+            self.loaded_sections.add(section.pk)
+            self._load_tasks(section.pk)
+        return section.pk
+
+    def _load_tasks(self, section_id: int) -> None:
+        # Ordered as `.first()` would have picked among duplicates.
+        for pk, parent_id, title, path in (
+            Task.objects.filter(section_id=section_id)
+            .order_by("position", "pk")
+            .values_list("id", "parent_id", "title", "path")
+        ):
+            self.tasks.setdefault((section_id, parent_id, title), pk)
+            self.paths[pk] = path
+
+    def find_task(self, section_key: int, parent_key: int | None, title: str):
+        """Return the key of the task a new one would duplicate, or None."""
+        return self.tasks.get((section_key, parent_key, title))
+
+    def add_task(
+        self,
+        section_key: int,
+        parent_key: int | None,
+        task: Task,
+        tag_names: list[str],
+    ) -> int:
+        """Queue `task` under `parent_key` and return its key."""
+        if section_key < 0:
+            task.section = self.new_sections[-section_key - 1]
+        else:
+            task.section_id = section_key
+        key = -len(self.new_tasks) - 1
+        self.new_tasks[key] = task
+        self.new_task_parents[key] = parent_key
+        self.depths[key] = (
+            self.depths[parent_key] + 1
+            if parent_key is not None and parent_key < 0
+            else 0
+        )
+        self.tasks[(section_key, parent_key, task.title)] = key
+        self.stats["tasks_created"] += 1
+        if parent_key is not None:
+            self.stats["parents_linked"] += 1
+
+        names = [name for name in tag_names if name]
+        self.new_task_tags[key] = names
+        for name in names:
+            if name not in self.tags:
+                self.tags[name] = Tag(name=name)
+                self.new_tags.append(self.tags[name])
+                self.stats["tags_created"] += 1
+        return key
+
+    def save(self) -> None:
+        """Write every queued row, one bulk insert per table and task depth."""
+        _create(self.new_lists)
+        _create(self.new_sections)
+        _create(self.new_tags)
+
+        levels = defaultdict(list)
+        for key, depth in self.depths.items():
+            levels[depth].append(key)
+        for depth in sorted(levels):
+            level = []
+            for key in levels[depth]:
+                task = self.new_tasks[key]
+                parent_key = self.new_task_parents[key]
+                if parent_key is not None:
+                    parent_id = (
+                        self.new_tasks[parent_key].pk if parent_key < 0 else parent_key
+                    )
+                    task.parent_id = parent_id
+                    task.path = f"{self.paths[parent_id]}{parent_id}/"
+                level.append(task)
+            _create(level)
+            for task in level:
+                self.paths[task.pk] = task.path
+
+        Task.tags.through.objects.bulk_create(
+            [
+                Task.tags.through(
+                    task_id=self.new_tasks[key].pk, tag_id=self.tags[name].pk
+                )
+                for key, names in self.new_task_tags.items()
+                for name in dict.fromkeys(names)
+            ],
+            batch_size=BATCH_SIZE,
+        )
 
 
 def _import_task_tree(
-    section: Section,
+    index: _ImportIndex,
+    section_key: int,
     task_data: dict,
-    parent: Task | None,
+    parent_key: int | None,
     position: int,
     stats: dict,
 ) -> None:
-    """Recursively create a task and its subtasks from JSON export data."""
+    """Recursively queue a task and its subtasks from JSON export data."""
     title = task_data.get("title", "").strip()
     if not title:
         stats["errors"] += 1
@@ -71,16 +203,12 @@ def _import_task_tree(
         return
 
     # Duplicate detection: title within (list, section)
-    existing = Task.objects.filter(
-        section=section,
-        title=title,
-        parent=parent,
-    ).first()
-    if existing:
+    existing = index.find_task(section_key, parent_key, title)
+    if existing is not None:
         stats["tasks_skipped"] += 1
         # Still recurse into subtasks for skip counting
         for i, sub in enumerate(task_data.get("subtasks", [])):
-            _import_task_tree(section, sub, existing, i * 10, stats)
+            _import_task_tree(index, section_key, sub, existing, i * 10, stats)
         return
 
     due_date_raw = task_data.get("due_date")
@@ -94,32 +222,33 @@ def _import_task_tree(
     completed_at_raw = task_data.get("completed_at")
     completed_at = None
     if completed_at_raw and completed_at_raw != "None":
-        from django.utils.dateparse import parse_datetime
-
         completed_at = parse_datetime(completed_at_raw)
 
-    task = Task.objects.create(
-        section=section,
-        title=title,
-        notes=task_data.get("notes", "") or "",
-        due_date=due_date,
-        is_completed=task_data.get("is_completed", False),
-        completed_at=completed_at,
-        position=position,
-        parent=parent,
+    task_key = index.add_task(
+        section_key,
+        parent_key,
+        Task(
+            title=title,
+            notes=task_data.get("notes", "") or "",
+            due_date=due_date,
+            is_completed=task_data.get("is_completed", False),
+            completed_at=completed_at,
+            position=position,
+        ),
+        task_data.get("tags", []),
     )
-    stats["tasks_created"] += 1
-    if parent:
-        stats["parents_linked"] += 1
-
-    _attach_tags(task, task_data.get("tags", []), stats)
 
     for i, sub in enumerate(task_data.get("subtasks", [])):
-        _import_task_tree(section, sub, task, i * 10, stats)
+        _import_task_tree(index, section_key, sub, task_key, i * 10, stats)
 
 
 def import_native_json(file) -> dict:
-    """Import tasks from the app's own JSON export format."""
+    """Import tasks from the app's own JSON export format.
+
+    Duplicates are found in an index loaded up front and new rows are
+    written in bulk, so the number of queries does not grow with the
+    number of tasks.
+    """
     stats = _make_stats()
 
     content = file.read()
@@ -143,6 +272,7 @@ def import_native_json(file) -> dict:
         return stats
 
     with transaction.atomic():
+        index = _ImportIndex(stats)
         for list_idx, list_data in enumerate(data):
             list_name = list_data.get("name", "").strip()
             if not list_name:
@@ -150,11 +280,10 @@ def import_native_json(file) -> dict:
                 stats["error_details"].append(f"List at index {list_idx}: missing name")
                 continue
 
-            task_list = _get_or_create_list(
+            task_list = index.get_or_create_list(
                 list_name,
                 list_data.get("emoji", ""),
                 list_data.get("position", list_idx * 10),
-                stats,
             )
 
             for sec_idx, sec_data in enumerate(list_data.get("sections", [])):
@@ -166,28 +295,33 @@ def import_native_json(file) -> dict:
                     )
                     continue
 
-                section = _get_or_create_section(
+                section_key = index.get_or_create_section(
                     task_list,
                     sec_name,
                     sec_data.get("emoji", ""),
                     sec_data.get("position", sec_idx * 10),
-                    stats,
                 )
 
                 for task_idx, task_data in enumerate(sec_data.get("tasks", [])):
                     _import_task_tree(
-                        section,
+                        index,
+                        section_key,
                         task_data,
                         None,
                         task_data.get("position", task_idx * 10),
                         stats,
                     )
+        index.save()
 
     return stats
 
 
 def import_native_csv(file) -> dict:
-    """Import tasks from the app's own CSV export format."""
+    """Import tasks from the app's own CSV export format.
+
+    Like import_native_json, rows are checked against an index loaded up
+    front and written in bulk.
+    """
     stats = _make_stats()
 
     content = file.read()
@@ -206,10 +340,11 @@ def import_native_csv(file) -> dict:
     # Track positions and parent resolution
     list_positions: dict[str, int] = {}
     section_positions: dict[tuple[str, str], int] = {}
-    # For parent linking: (section_id) -> list of (depth, title, task_pk)
+    # For parent linking: section key -> list of (depth, title, task key)
     section_task_stack: dict[int, list[tuple[int, str, int]]] = {}
 
     with transaction.atomic():
+        index = _ImportIndex(stats)
         for row_num, row in enumerate(reader, start=1):
             try:
                 title = (row.get("task") or "").strip()
@@ -221,44 +356,40 @@ def import_native_csv(file) -> dict:
                 list_name = (row.get("list") or "").strip() or "Imported"
                 if list_name not in list_positions:
                     list_positions[list_name] = len(list_positions) * 10
-                task_list = _get_or_create_list(
-                    list_name, "", list_positions[list_name], stats
+                task_list = index.get_or_create_list(
+                    list_name, "", list_positions[list_name]
                 )
 
                 section_name = (row.get("section") or "").strip() or "(default)"
-                section_key = (list_name, section_name)
-                if section_key not in section_positions:
-                    section_positions[section_key] = (
+                section_pos_key = (list_name, section_name)
+                if section_pos_key not in section_positions:
+                    section_positions[section_pos_key] = (
                         len([k for k in section_positions if k[0] == list_name]) * 10
                     )
-                section = _get_or_create_section(
-                    task_list, section_name, "", section_positions[section_key], stats
+                section_key = index.get_or_create_section(
+                    task_list, section_name, "", section_positions[section_pos_key]
                 )
 
                 # Parse depth and parent
                 depth = int(row.get("depth") or "0")
                 parent_task_title = (row.get("parent_task") or "").strip()
-                parent = None
+                parent_key = None
 
                 if depth > 0 and parent_task_title:
-                    stack = section_task_stack.get(section.pk, [])
+                    stack = section_task_stack.get(section_key, [])
                     # Walk stack backwards to find parent at depth-1
-                    for d, t, pk in reversed(stack):
+                    for d, t, key in reversed(stack):
                         if d == depth - 1 and t == parent_task_title:
-                            parent = Task.objects.filter(pk=pk).first()
+                            parent_key = key
                             break
 
                 # Duplicate detection
-                existing = Task.objects.filter(
-                    section=section,
-                    title=title,
-                    parent=parent,
-                ).first()
-                if existing:
+                existing = index.find_task(section_key, parent_key, title)
+                if existing is not None:
                     stats["tasks_skipped"] += 1
                     # Still add to stack for child resolution
-                    section_task_stack.setdefault(section.pk, []).append(
-                        (depth, title, existing.pk)
+                    section_task_stack.setdefault(section_key, []).append(
+                        (depth, title, existing)
                     )
                     continue
 
@@ -276,33 +407,31 @@ def import_native_csv(file) -> dict:
 
                 notes = row.get("notes") or ""
 
-                task = Task.objects.create(
-                    section=section,
-                    title=title,
-                    notes=notes,
-                    due_date=due_date,
-                    is_completed=is_completed,
-                    position=row_num * 10,
-                    parent=parent,
-                )
-                stats["tasks_created"] += 1
-                if parent:
-                    stats["parents_linked"] += 1
-
-                # Tags
                 tags_raw = (row.get("tags") or "").strip()
-                if tags_raw:
-                    tag_names = [t.strip() for t in tags_raw.split(",") if t.strip()]
-                    _attach_tags(task, tag_names, stats)
+                tag_names = [t.strip() for t in tags_raw.split(",") if t.strip()]
+
+                task_key = index.add_task(
+                    section_key,
+                    parent_key,
+                    Task(
+                        title=title,
+                        notes=notes,
+                        due_date=due_date,
+                        is_completed=is_completed,
+                        position=row_num * 10,
+                    ),
+                    tag_names,
+                )
 
                 # Add to stack for parent resolution
-                section_task_stack.setdefault(section.pk, []).append(
-                    (depth, title, task.pk)
+                section_task_stack.setdefault(section_key, []).append(
+                    (depth, title, task_key)
                 )
 
             except Exception as e:
                 stats["errors"] += 1
                 stats["error_details"].append(f"Row {row_num}: {e}")
+        index.save()
 
     return stats
 
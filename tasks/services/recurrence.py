@@ -1,96 +1,184 @@
 from __future__ import annotations
 
 import calendar
+import json
 import re
+from abc import ABC, abstractmethod
 from datetime import date, timedelta
+from functools import lru_cache
 
 
 class RecurrenceValidationError(Exception):
     pass
 
 
+ONE_DAY = timedelta(days=1)
+
+
+def _clamped(year: int, month: int, day: int) -> date:
+    """Return `day` of the month, or its last day if the month is shorter."""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+class Recurrence(ABC):
+    """A compiled recurrence rule.
+
+    Every method is arithmetic on the rule, so the cost does not depend on
+    how far apart the dates are. Get instances from compile_recurrence().
+    """
+
+    @abstractmethod
+    def next_after(self, day: date) -> date:
+        """Return the first occurrence strictly after `day`."""
+
+    @abstractmethod
+    def advance(self, due: date) -> date:
+        """Return the occurrence that follows a task due on `due`."""
+
+    def next_occurrences(self, after: date, count: int) -> list[date]:
+        """Return the `count` first occurrences strictly after `after`."""
+        occurrences = []
+        day = after
+        for _ in range(count):
+            day = self.next_after(day)
+            occurrences.append(day)
+        return occurrences
+
+    def occurrences_between(self, start: date, end: date) -> list[date]:
+        """Return every occurrence from `start` to `end`, both included."""
+        occurrences = []
+        day = self.next_after(start - ONE_DAY)
+        while day <= end:
+            occurrences.append(day)
+            day = self.next_after(day)
+        return occurrences
+
+
+class _Daily(Recurrence):
+    def next_after(self, day):
+        return day + ONE_DAY
+
+    def advance(self, due):
+        return due + ONE_DAY
+
+
+class _Weekly(Recurrence):
+    def __init__(self, weekdays):
+        # Days from each weekday to the next matching one. Validation rejects
+        # an empty list; stored rules without days land eight days out, as
+        # they always have.
+        self.gaps = [
+            min(((target - weekday - 1) % 7 + 1 for target in weekdays), default=8)
+            for weekday in range(7)
+        ]
+
+    def next_after(self, day):
+        return day + timedelta(days=self.gaps[day.weekday()])
+
+    def advance(self, due):
+        return self.next_after(due)
+
+
+class _Monthly(Recurrence):
+    def __init__(self, day_of_month):
+        self.day_of_month = day_of_month
+
+    def _following_month(self, day):
+        if day.month == 12:
+            return _clamped(day.year + 1, 1, self.day_of_month)
+        return _clamped(day.year, day.month + 1, self.day_of_month)
+
+    def next_after(self, day):
+        candidate = _clamped(day.year, day.month, self.day_of_month)
+        return candidate if candidate > day else self._following_month(day)
+
+    def advance(self, due):
+        # The next month's occurrence, even if `due` was earlier in its month.
+        return self._following_month(due)
+
+
+class _Yearly(Recurrence):
+    def __init__(self, month, day):
+        self.month, self.day = month, day
+
+    def next_after(self, day):
+        candidate = _clamped(day.year, self.month, self.day)
+        if candidate > day:
+            return candidate
+        return _clamped(day.year + 1, self.month, self.day)
+
+    def advance(self, due):
+        return _clamped(due.year + 1, self.month, self.day)
+
+
+class _CustomDates(Recurrence):
+    def __init__(self, month_days):
+        self.month_days = sorted(set(month_days))
+
+    def next_after(self, day):
+        for month, month_day in self.month_days:
+            candidate = _clamped(day.year, month, month_day)
+            if candidate > day:
+                return candidate
+        month, month_day = self.month_days[0]
+        return _clamped(day.year + 1, month, month_day)
+
+    def advance(self, due):
+        return self.next_after(due)
+
+
+@lru_cache(maxsize=256)
+def _compile(recurrence_type: str, rule_json: str) -> Recurrence:
+    rule = json.loads(rule_json)
+    if recurrence_type == "daily":
+        return _Daily()
+    if recurrence_type == "weekly":
+        return _Weekly(rule.get("days", []))
+    if recurrence_type == "monthly":
+        return _Monthly(rule.get("day_of_month", 1))
+    if recurrence_type == "yearly":
+        return _Yearly(rule.get("month", 1), rule.get("day", 1))
+    if recurrence_type == "custom_dates":
+        return _CustomDates([(int(d[:2]), int(d[3:5])) for d in rule.get("dates", [])])
+    raise ValueError(f"Unknown recurrence type: {recurrence_type}")
+
+
+def compile_recurrence(recurrence_type: str, recurrence_rule: dict) -> Recurrence:
+    """Return the Recurrence for a task's rule; compiled rules are cached."""
+    return _compile(recurrence_type, json.dumps(recurrence_rule, sort_keys=True))
+
+
 def compute_next_due_date(
     recurrence_type: str,
     recurrence_rule: dict,
     current_due_date: date | None,
 ) -> date:
-    today = date.today()
-    base = current_due_date or today
-
-    if recurrence_type == "daily":
-        next_date = base + timedelta(days=1)
-        while next_date <= today:
-            next_date += timedelta(days=1)
-        return next_date
-
-    if recurrence_type == "weekly":
-        days = sorted(recurrence_rule.get("days", []))
-        next_date = base + timedelta(days=1)
-        for _ in range(8):
-            if next_date.weekday() in days and next_date > today:
-                return next_date
-            next_date += timedelta(days=1)
-        # Wrap to next week
-        next_date = today + timedelta(days=1)
-        for _ in range(7):
-            if next_date.weekday() in days:
-                return next_date
-            next_date += timedelta(days=1)
-        return next_date
+    """Return the due date of the occurrence after `current_due_date`.
 
-    if recurrence_type == "monthly":
-        day_of_month = recurrence_rule.get("day_of_month", 1)
-        year, month = base.year, base.month
-        # Move to next month
-        month += 1
-        if month > 12:
-            month = 1
-            year += 1
-        clamped_day = min(day_of_month, calendar.monthrange(year, month)[1])
-        next_date = date(year, month, clamped_day)
-        while next_date <= today:
-            month += 1
-            if month > 12:
-                month = 1
-                year += 1
-            clamped_day = min(day_of_month, calendar.monthrange(year, month)[1])
-            next_date = date(year, month, clamped_day)
-        return next_date
-
-    if recurrence_type == "yearly":
-        target_month = recurrence_rule.get("month", 1)
-        target_day = recurrence_rule.get("day", 1)
-        year = base.year + 1
-        clamped_day = min(target_day, calendar.monthrange(year, target_month)[1])
-        next_date = date(year, target_month, clamped_day)
-        while next_date <= today:
-            year += 1
-            clamped_day = min(target_day, calendar.monthrange(year, target_month)[1])
-            next_date = date(year, target_month, clamped_day)
-        return next_date
+    The result is always after today: a task completed late skips the
+    occurrences it missed.
+    """
+    today = date.today()
+    recurrence = compile_recurrence(recurrence_type, recurrence_rule)
+    return max(
+        recurrence.advance(current_due_date or today), recurrence.next_after(today)
+    )
 
-    if recurrence_type == "custom_dates":
-        dates_strs = recurrence_rule.get("dates", [])
-        parsed = []
-        for d in dates_strs:
-            month_num, day_num = int(d[:2]), int(d[3:5])
-            parsed.append((month_num, day_num))
-
-        # Find next date after the current due date (or today if none)
-        threshold = max(base, today)
-        for year_offset in range(0, 3):
-            year = today.year + year_offset
-            for month_num, day_num in parsed:
-                clamped_day = min(day_num, calendar.monthrange(year, month_num)[1])
-                candidate = date(year, month_num, clamped_day)
-                if candidate > threshold:
-                    return candidate
-
-        # Fallback: first date next year
-        m, d = parsed[0]
-        return date(today.year + 1, m, d)
 
-    raise ValueError(f"Unknown recurrence type: {recurrence_type}")
+def project_occurrences(
+    recurrence_type: str,
+    recurrence_rule: dict,
+    current_due_date: date | None,
+    until: date,
+) -> list[date]:
+    """Return the due dates a recurring task will take, up to `until`.
+
+    The first is the one completing the task today would create; the rest
+    follow from the rule, so no rows need to exist for them.
+    """
+    first = compute_next_due_date(recurrence_type, recurrence_rule, current_due_date)
+    recurrence = compile_recurrence(recurrence_type, recurrence_rule)
+    return recurrence.occurrences_between(first, until)
 
 
 _MM_DD_PATTERN = re.compile(r"^\d{2}-\d{2}$")
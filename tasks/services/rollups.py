@@ -0,0 +1,149 @@
+"""Reading, checking and rebuilding the trigger-maintained rollups.
+
+ActivityCount (migration 0018) backs the dashboard and ProjectStats
+(migration 0019) the project cards. Triggers keep both current; the
+expressions here must count the same things as those triggers.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from django.db import connection, transaction
+
+from tasks.models import ActivityCount, ProjectStats
+
+# metric -> (table, column) whose values are counted.
+SOURCES = {
+    ActivityCount.METRIC_TASKS_COMPLETED: ("tasks_task", "completed_at"),
+    ActivityCount.METRIC_TASKS_CREATED: ("tasks_task", "created_at"),
+    ActivityCount.METRIC_INTERACTIONS: ("network_interaction", "date"),
+    ActivityCount.METRIC_TIME_ENTRIES: ("tasks_timeentry", "date"),
+}
+
+# period -> SQLite expression for the first day of the bucket holding {}.
+BUCKET_SQL = {
+    ActivityCount.PERIOD_DAY: "date({})",
+    ActivityCount.PERIOD_WEEK: "date({}, 'weekday 0', '-6 days')",
+    ActivityCount.PERIOD_MONTH: "date({}, 'start of month')",
+}
+
+
+PROJECT_STATS_COLUMNS = (
+    "time_entry_count",
+    "list_count",
+    "task_count",
+    "completed_task_count",
+)
+# One row per project: its id, then PROJECT_STATS_COLUMNS in order.
+PROJECT_STATS_SQL = """
+    SELECT p.id,
+        (SELECT COUNT(*) FROM tasks_timeentry e WHERE e.project_id = p.id),
+        (SELECT COUNT(*) FROM tasks_list l WHERE l.project_id = p.id),
+        (SELECT COUNT(*) FROM tasks_task t
+            JOIN tasks_section s ON s.id = t.section_id
+            JOIN tasks_list l ON l.id = s.list_id
+            WHERE l.project_id = p.id),
+        (SELECT COUNT(*) FROM tasks_task t
+            JOIN tasks_section s ON s.id = t.section_id
+            JOIN tasks_list l ON l.id = s.list_id
+            WHERE l.project_id = p.id AND t.is_completed)
+    FROM tasks_project p
+"""
+
+
+def _activity_sql() -> str:
+    return " UNION ALL ".join(
+        f"SELECT '{metric}', '{period}', {expression.format(column)}, COUNT(*) "
+        f"FROM {table} WHERE {column} IS NOT NULL GROUP BY 3"
+        for metric, (table, column) in SOURCES.items()
+        for period, expression in BUCKET_SQL.items()
+    )
+
+
+def rebuild_rollups() -> int:
+    """Recompute every ActivityCount from the source tables; return the row count."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {ActivityCount._meta.db_table}")
+        cursor.execute(
+            f"INSERT INTO {ActivityCount._meta.db_table} "
+            '(metric, period, start, "count") ' + _activity_sql()
+        )
+        return cursor.rowcount
+
+
+def rebuild_project_stats() -> int:
+    """Recompute every ProjectStats row; return the number of projects."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {ProjectStats._meta.db_table}")
+        cursor.execute(
+            f"INSERT INTO {ProjectStats._meta.db_table} "
+            f"(project_id, {', '.join(PROJECT_STATS_COLUMNS)}) " + PROJECT_STATS_SQL
+        )
+        return cursor.rowcount
+
+
+def stale_rollups() -> dict:
+    """Compare the stored rollups with a fresh count, without writing.
+
+    Returns {"activity": [(metric, period, start)], "projects": [project id]}
+    listing the rows that differ; both lists are empty when all is in step.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(_activity_sql())
+        expected = {(m, p, str(s)): count for m, p, s, count in cursor.fetchall()}
+        cursor.execute(PROJECT_STATS_SQL)
+        expected_projects = {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+
+    stored = {
+        (metric, period, start.isoformat()): count
+        for metric, period, start, count in ActivityCount.objects.exclude(
+            count=0
+        ).values_list("metric", "period", "start", "count")
+    }
+    stored_projects = {
+        row[0]: tuple(row[1:])
+        for row in ProjectStats.objects.values_list(
+            "project_id", *PROJECT_STATS_COLUMNS
+        )
+    }
+    return {
+        "activity": sorted(
+            key
+            for key in expected.keys() | stored.keys()
+            if expected.get(key) != stored.get(key)
+        ),
+        "projects": sorted(
+            project_id
+            for project_id in expected_projects.keys() | stored_projects.keys()
+            if expected_projects.get(project_id) != stored_projects.get(project_id)
+        ),
+    }
+
+
+def bucket_starts(period: str, count: int, today: date) -> list[date]:
+    """Return the first days of the last `count` buckets, ending with today's."""
+    if period == ActivityCount.PERIOD_DAY:
+        return [today - timedelta(days=i) for i in range(count - 1, -1, -1)]
+    if period == ActivityCount.PERIOD_WEEK:
+        monday = today - timedelta(days=today.weekday())
+        return [monday - timedelta(weeks=i) for i in range(count - 1, -1, -1)]
+    month_index = today.year * 12 + today.month - 1
+    return [
+        date(index // 12, index % 12 + 1, 1)
+        for index in range(month_index - count + 1, month_index + 1)
+    ]
+
+
+def activity_counts(metrics, period: str, starts: list[date]) -> dict:
+    """Return {metric: [count per bucket in `starts`]}, zero-filled."""
+    found = {
+        (metric, start): count
+        for metric, start, count in ActivityCount.objects.filter(
+            metric__in=metrics, period=period, start__gte=starts[0], start__lte=starts[-1]
+        ).values_list("metric", "start", "count")
+    }
+    return {
+        metric: [found.get((metric, start), 0) for start in starts]
+        for metric in metrics
+    }
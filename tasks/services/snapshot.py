@@ -0,0 +1,153 @@
+"""Page-level SQLite snapshots of the live database, and restoring them.
+
+A snapshot is a copy of the database file made with SQLite's online backup
+API: one read transaction, so it is consistent, and in WAL mode writers keep
+going while it runs. Restoring copies the pages back through the same API
+on Django's connection, so Litestream replicates the restore like any other
+write.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import zlib
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F, Max
+from django.db.migrations.loader import MigrationLoader
+
+from tasks.models import ChangeLogEntry, TableVersion
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+GZIP_MAGIC = b"\x1f\x8b"
+CHUNK_SIZE = 1024 * 1024
+
+
+class SnapshotError(ValueError):
+    """The file cannot be restored into this database."""
+
+
+def _open_read_only(path) -> sqlite3.Connection:
+    return sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def write_snapshot(path) -> None:
+    """Copy the live database into a new SQLite file at `path`."""
+    connection.ensure_connection()
+    target = sqlite3.connect(path)
+    try:
+        connection.connection.backup(target)
+    finally:
+        target.close()
+
+
+def open_snapshot():
+    """Return a snapshot as an open binary file; it is deleted once closed."""
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    try:
+        write_snapshot(path)
+        return open(path, "rb")
+    finally:
+        os.unlink(path)
+
+
+def iter_gzip(file):
+    """Yield `file`'s contents gzip-compressed, one chunk at a time."""
+    compressor = zlib.compressobj(wbits=31)
+    with file:
+        while chunk := file.read(CHUNK_SIZE):
+            if compressed := compressor.compress(chunk):
+                yield compressed
+    yield compressor.flush()
+
+
+def check_snapshot(path) -> None:
+    """Raise SnapshotError unless `path` is an intact snapshot this code can run.
+
+    Snapshots missing migrations are accepted (restore applies them); ones
+    carrying migrations this code does not have came from a newer version.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(SQLITE_HEADER)) != SQLITE_HEADER:
+            raise SnapshotError("Not a SQLite database.")
+
+    snapshot = _open_read_only(path)
+    try:
+        if snapshot.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+            raise SnapshotError("The snapshot is corrupt.")
+        try:
+            applied = set(snapshot.execute("SELECT app, name FROM django_migrations"))
+        except sqlite3.DatabaseError as exc:
+            raise SnapshotError(
+                "Not a Nexus snapshot: it has no migration history."
+            ) from exc
+    finally:
+        snapshot.close()
+
+    known = set(MigrationLoader(None, ignore_no_migrations=True).disk_migrations)
+    unknown = sorted(applied - known)
+    if unknown:
+        names = ", ".join(f"{app}.{name}" for app, name in unknown)
+        raise SnapshotError(
+            f"The snapshot was taken by a newer version of the app ({names}). "
+            "Update the code before restoring it."
+        )
+
+
+def restore_snapshot(path) -> None:
+    """Replace the live database with the snapshot (or gzipped snapshot) at `path`.
+
+    Unapplied migrations are run afterwards. Table versions and the change
+    log cursor only move forward, so cached responses and ETags from before
+    the restore never match again; open clients should reload.
+    """
+    with open(path, "rb") as file:
+        compressed = file.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+    if compressed:
+        fd, plain = tempfile.mkstemp(suffix=".sqlite3")
+        with os.fdopen(fd, "wb") as destination, gzip.open(path, "rb") as source:
+            shutil.copyfileobj(source, destination, CHUNK_SIZE)
+        try:
+            return restore_snapshot(plain)
+        finally:
+            os.unlink(plain)
+
+    check_snapshot(path)
+    versions = dict(TableVersion.objects.values_list("table", "version"))
+    last_change = ChangeLogEntry.objects.aggregate(last=Max("id"))["last"]
+
+    source = _open_read_only(path)
+    connection.ensure_connection()
+    try:
+        source.backup(connection.connection)
+    finally:
+        source.close()
+
+    call_command("migrate", interactive=False, verbosity=0)
+
+    offset = max(versions.values(), default=0) + 1
+    restored = set(TableVersion.objects.values_list("table", flat=True))
+    TableVersion.objects.bulk_create(
+        [TableVersion(table=table) for table in versions if table not in restored]
+    )
+    TableVersion.objects.update(version=F("version") + offset)
+    if last_change is not None:
+        # Keep new change ids above every cursor a client may already hold.
+        table = ChangeLogEntry._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM sqlite_sequence WHERE name = %s AND seq < %s",
+                [table, last_change],
+            )
+            cursor.execute(
+                "INSERT INTO sqlite_sequence (name, seq) SELECT %s, %s "
+                "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = %s)",
+                [table, last_change, table],
+            )
@@ -4,7 +4,7 @@ from datetime import datetime, date, time
 
 from django.utils import timezone
 
-from tasks.models import List, Section, Tag, Task
+from tasks.models import ChangeLogEntry, List, Section, Tag, Task
 
 
 def parse_ticktick_datetime(value):
@@ -50,9 +50,85 @@ def parse_tags(tags_str):
     return [t.strip() for t in tags_str.split(",") if t.strip()]
 
 
+# Rows per INSERT statement, well under SQLite's bound-variable limit.
+BATCH_SIZE = 500
+
+
+def _first_by_key(queryset, *fields):
+    """Map each key to the first matching row by pk, as `.first()` would."""
+    found = {}
+    for obj in queryset.order_by("pk"):
+        key = tuple(getattr(obj, field) for field in fields)
+        found.setdefault(key[0] if len(key) == 1 else key, obj)
+    return found
+
+
+def _create(objs):
+    """bulk_create `objs` and log them for sync, since no signals fire."""
+    if objs:
+        model = type(objs[0])
+        model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+        ChangeLogEntry.record(model, [obj.pk for obj in objs])
+
+
+def _check_length(model, field_name, value):
+    """Raise ValueError if `value` is too long for `model.field_name`."""
+    max_length = model._meta.get_field(field_name).max_length
+    if len(value) > max_length:
+        raise ValueError(
+            f"{model.__name__} {field_name} is longer than {max_length} characters"
+        )
+
+
+def _link_new_tasks(links, new_tasks, existing_paths, stats):
+    """Set parent and path on the new tasks of `links`, in memory.
+
+    Links apply in file order with the same rule Task.save() enforces: a
+    task cannot be nested under itself or one of its descendants. Parents
+    may be new tasks or tasks already in the database.
+    """
+    parents = {}
+    for child_id, parent_id, parent_external_id in links:
+        ancestor = parent_id
+        while ancestor is not None and ancestor != child_id:
+            ancestor = parents.get(ancestor)
+        if ancestor == child_id:
+            stats["errors"] += 1
+            stats["error_details"].append(
+                f"Task {parent_external_id}: Cannot nest a task under its own descendant."
+            )
+            continue
+        parents[child_id] = parent_id
+        stats["parents_linked"] += 1
+
+    paths = dict(existing_paths)
+
+    def path_of(task_id):
+        # Iterative: chains of subtasks can be deeper than the recursion limit.
+        chain = []
+        while task_id not in paths and parents.get(task_id) is not None:
+            chain.append(task_id)
+            task_id = parents[task_id]
+        path = paths.get(task_id, "")
+        for child_id in reversed(chain):
+            path = paths[child_id] = f"{path}{parents[child_id]}/"
+        return path
+
+    linked = [new_tasks[child_id] for child_id in parents]
+    for task in linked:
+        task.parent_id = parents[task.pk]
+        task.path = path_of(task.pk)
+    return linked
+
+
 def import_ticktick_csv(csv_file):
     """Import tasks from a TickTick CSV backup file.
 
+    The file is read in one pass. Lists, sections, tags and already-imported
+    tasks are resolved from maps loaded up front, new rows are written with
+    bulk_create, and parents are linked with one bulk_update, so the number
+    of queries does not grow with the number of rows.
+
     Returns a stats dict with counts of created/skipped items.
     """
     stats = {
@@ -69,14 +145,12 @@ def import_ticktick_csv(csv_file):
     content = csv_file.read()
     if isinstance(content, bytes):
         content = content.decode("utf-8-sig")
+    lines = io.StringIO(content)
 
     # TickTick CSVs have a metadata preamble (date, version, status legend)
     # before the real header row. Scan to find the header containing "Title".
-    raw_reader = csv.reader(io.StringIO(content))
     fieldnames = None
-    preamble_rows = 0
-    for row in raw_reader:
-        preamble_rows += 1
+    for row in csv.reader(lines):
         if "Title" in row and "taskId" in row:
             fieldnames = row
             break
@@ -88,20 +162,34 @@ def import_ticktick_csv(csv_file):
         )
         return stats
 
-    # Continue reading from where raw_reader left off — remaining rows are data
-    reader = csv.DictReader(io.StringIO(content), fieldnames=fieldnames)
-    # Skip the preamble + header rows we already consumed
-    for _ in range(preamble_rows):
-        next(reader)
+    # The remaining lines are data; the reader above consumed exactly the
+    # preamble and the header.
+    reader = csv.DictReader(lines, fieldnames=fieldnames)
+
+    lists = _first_by_key(List.objects.all(), "name")
+    sections = _first_by_key(Section.objects.all(), "list_id", "name")
+    tags = {tag.name: tag for tag in Tag.objects.all()}
+    existing_tasks = {}  # taskId -> (pk, parent_id, path)
+    new_lists, new_sections, new_tags = [], [], []
+    new_sections_by_key = {}  # (list_name, section_name) -> unsaved Section
 
     # Track first-seen order for position assignment
     list_positions = {}  # name -> position
     section_positions = {}  # (list_name, section_name) -> position
-    task_group_counters = {}  # (section_id, parent_external_id) -> counter
+    task_group_counters = {}  # ((list_name, section_name), parent_external_id) -> counter
+
+    for pk, external_id, parent_id, path in (
+        Task.objects.exclude(external_id=None)
+        .values_list("id", "external_id", "parent_id", "path")
+        .iterator(chunk_size=2000)
+    ):
+        existing_tasks[external_id] = (pk, parent_id, path)
 
-    # Maps for parent linking
-    external_id_to_pk = {}  # taskId -> django pk
-    rows_with_parents = []  # (child_pk, parent_external_id)
+    external_id_to_pk = {}  # taskId -> django pk, for rows that imported
+    new_tasks = []  # Task objects, in file order
+    task_tag_names = []  # tag names per new task
+    seen = {}  # taskId -> index into new_tasks
+    rows_with_parents = []  # (child taskId, parent taskId), in file order
 
     for row_num, row in enumerate(reader, start=1):
         try:
@@ -119,98 +207,154 @@ def import_ticktick_csv(csv_file):
                 )
                 continue
 
-            # Idempotency: skip if already imported
-            existing = Task.objects.filter(external_id=task_id).first()
-            if existing:
-                external_id_to_pk[task_id] = existing.pk
-                parent_id = row.get("parentId", "").strip()
-                if parent_id:
-                    rows_with_parents.append((existing.pk, parent_id))
+            # Idempotency: skip if already imported. Only the first row for a
+            # taskId links its parent, just as only that row creates it.
+            if task_id in existing_tasks or task_id in seen:
+                if task_id not in seen and task_id not in external_id_to_pk:
+                    external_id_to_pk[task_id] = existing_tasks[task_id][0]
+                    parent_id = row.get("parentId", "").strip()
+                    if parent_id:
+                        rows_with_parents.append((task_id, parent_id))
                 stats["tasks_skipped"] += 1
                 continue
 
-            # Get or create List
+            # Parse and check every field before the row is queued: the bulk
+            # writes below cannot report which row a bad value came from.
             list_name = row.get("List Name", "").strip() or "Imported"
+            section_name = row.get("Column Name", "").strip() or "(default)"
+            parent_external_id = row.get("parentId", "").strip() or None
+            notes = row.get("Content", "").strip()
+            status = int(row.get("Status", "0") or "0")
+            is_completed = status in (1, 2)  # 0=Normal, 1=Completed, 2=Archived
+
+            due_d, due_t = parse_due_date(
+                row.get("Due Date", ""), row.get("Is All Day", "")
+            )
+            created_at = parse_ticktick_datetime(row.get("Created Time", ""))
+            completed_at = parse_ticktick_datetime(row.get("Completed Time", ""))
+            tag_names = parse_tags(row.get("Tags", ""))
+
+            _check_length(Task, "title", title)
+            _check_length(Task, "external_id", task_id)
+            _check_length(List, "name", list_name)
+            _check_length(Section, "name", section_name)
+            for tag_name in tag_names:
+                _check_length(Tag, "name", tag_name)
+
+            # Get or create List
             if list_name not in list_positions:
                 list_positions[list_name] = len(list_positions) * 10
-            task_list, list_created = List.objects.get_or_create(
-                name=list_name,
-                defaults={"position": list_positions[list_name]},
-            )
-            if list_created:
+            task_list = lists.get(list_name)
+            if task_list is None:
+                task_list = lists[list_name] = List(
+                    name=list_name, position=list_positions[list_name]
+                )
+                new_lists.append(task_list)
                 stats["lists_created"] += 1
 
             # Get or create Section
-            section_name = row.get("Column Name", "").strip() or "(default)"
             section_key = (list_name, section_name)
             if section_key not in section_positions:
                 section_positions[section_key] = len(
                     [k for k in section_positions if k[0] == list_name]
                 ) * 10
-            section, section_created = Section.objects.get_or_create(
-                list=task_list,
-                name=section_name,
-                defaults={"position": section_positions[section_key]},
-            )
-            if section_created:
+            section = new_sections_by_key.get(section_key)
+            if section is None and task_list.pk is not None:
+                section = sections.get((task_list.pk, section_name))
+            if section is None:
+                section = new_sections_by_key[section_key] = Section(
+                    list=task_list,
+                    name=section_name,
+                    position=section_positions[section_key],
+                )
+                new_sections.append(section)
                 stats["sections_created"] += 1
 
             # Position within (section, parent) group
-            parent_external_id = row.get("parentId", "").strip() or None
-            group_key = (section.pk, parent_external_id)
+            group_key = (section_key, parent_external_id)
             if group_key not in task_group_counters:
                 task_group_counters[group_key] = 0
             task_group_counters[group_key] += 1
             position = task_group_counters[group_key] * 10
 
-            # Parse fields
-            notes = row.get("Content", "").strip()
-            status = int(row.get("Status", "0") or "0")
-            is_completed = status in (1, 2)  # 0=Normal, 1=Completed, 2=Archived
-
-            due_d, due_t = parse_due_date(
-                row.get("Due Date", ""), row.get("Is All Day", "")
-            )
-            created_at = parse_ticktick_datetime(row.get("Created Time", ""))
-            completed_at = parse_ticktick_datetime(row.get("Completed Time", ""))
-
-            task = Task.objects.create(
-                section=section,
-                title=title,
-                notes=notes,
-                due_date=due_d,
-                due_time=due_t,
-                is_completed=is_completed,
-                completed_at=completed_at,
-                created_at=created_at or timezone.now(),
-                position=position,
-                external_id=task_id,
+            seen[task_id] = len(new_tasks)
+            new_tasks.append(
+                Task(
+                    section=section,
+                    title=title,
+                    notes=notes,
+                    due_date=due_d,
+                    due_time=due_t,
+                    is_completed=is_completed,
+                    completed_at=completed_at,
+                    created_at=created_at or timezone.now(),
+                    position=position,
+                    external_id=task_id,
+                    path="",
+                )
             )
-
-            external_id_to_pk[task_id] = task.pk
+            task_tag_names.append(tag_names)
             stats["tasks_created"] += 1
 
             # Queue parent linking
             if parent_external_id:
-                rows_with_parents.append((task.pk, parent_external_id))
+                rows_with_parents.append((task_id, parent_external_id))
 
-            # Parse and attach tags
-            tag_names = parse_tags(row.get("Tags", ""))
             for tag_name in tag_names:
-                tag, tag_created = Tag.objects.get_or_create(name=tag_name)
-                if tag_created:
+                if tag_name not in tags:
+                    tags[tag_name] = Tag(name=tag_name)
+                    new_tags.append(tag_name)
                     stats["tags_created"] += 1
-                task.tags.add(tag)
 
         except Exception as e:
             stats["errors"] += 1
             stats["error_details"].append(f"Row {row_num}: {e}")
 
-    # Pass 2: Link parents
-    for child_pk, parent_external_id in rows_with_parents:
+    _create(new_lists)
+    _create(new_sections)
+    _create([tags[name] for name in new_tags])
+    _create(new_tasks)
+    external_id_to_pk.update({task.external_id: task.pk for task in new_tasks})
+    Task.tags.through.objects.bulk_create(
+        [
+            Task.tags.through(task_id=task.pk, tag_id=tags[name].pk)
+            for task, names in zip(new_tasks, task_tag_names)
+            for name in dict.fromkeys(names)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    # Pass 2: Link parents. Links between tasks created above are resolved
+    # in memory and written with one bulk_update; re-linking a task from an
+    # earlier import still goes through save(), which also moves its subtree.
+    new_links, existing_links = [], []
+    for child_external_id, parent_external_id in rows_with_parents:
         parent_pk = external_id_to_pk.get(parent_external_id)
-        if parent_pk:
-            Task.objects.filter(pk=child_pk).update(parent_id=parent_pk)
-            stats["parents_linked"] += 1
+        if not parent_pk:
+            continue
+        child_pk = external_id_to_pk[child_external_id]
+        if child_external_id in seen:
+            new_links.append((child_pk, parent_pk, parent_external_id))
+        else:
+            existing_links.append((child_pk, parent_pk, parent_external_id))
+
+    existing_paths = {pk: path for pk, _parent_id, path in existing_tasks.values()}
+    by_pk = {task.pk: task for task in new_tasks}
+    linked = _link_new_tasks(new_links, by_pk, existing_paths, stats)
+    Task.objects.bulk_update(linked, ["parent", "path"], batch_size=BATCH_SIZE)
+
+    current_parents = {pk: parent_id for pk, parent_id, _path in existing_tasks.values()}
+    for child_pk, parent_pk, parent_external_id in existing_links:
+        if current_parents[child_pk] != parent_pk:
+            child = Task.objects.get(pk=child_pk)
+            child.parent_id = parent_pk
+            try:
+                child.save(update_fields=["parent"])
+            except ValueError as e:
+                stats["errors"] += 1
+                stats["error_details"].append(f"Task {parent_external_id}: {e}")
+                continue
+            current_parents[child_pk] = parent_pk
+        stats["parents_linked"] += 1
 
     return stats
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+
+from django.db import transaction
+
+from tasks.services.full_import import (
+    apply_increment,
+    import_full_database,
+    read_full_export_ndjson,
+)
+from tasks.services.native_import import (
+    detect_csv_format,
+    import_native_csv,
+    import_native_json,
+)
+from tasks.services.ticktick_import import import_ticktick_csv
+
+SUPPORTED_EXTENSIONS = {".json", ".ndjson", ".csv"}
+
+
+class UnsupportedUpload(ValueError):
+    """The upload is not a file any importer understands."""
+
+
+def check_upload_name(name: str) -> str:
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise UnsupportedUpload(
+            "Unsupported file type. Please upload a .json, .ndjson or .csv file."
+        )
+    return ext
+
+
+def import_upload(name: str, content) -> dict:
+    """Import an uploaded file with the importer its name and content call for.
+
+    Full backups (JSON or NDJSON), native list JSON/CSV and TickTick CSV are
+    recognised. `content` is bytes or str; an NDJSON backup may also be an
+    open binary file, which is then read one line at a time. Returns that
+    importer's stats; raises UnsupportedUpload otherwise.
+    """
+    ext = check_upload_name(name)
+
+    if ext == ".ndjson":
+        if isinstance(content, (bytes, str)):
+            content = content.splitlines()
+        try:
+            data = read_full_export_ndjson(content)
+        except ValueError as e:  # includes json.JSONDecodeError
+            raise UnsupportedUpload(f"Invalid NDJSON backup: {e}")
+        return import_full_database(data)
+
+    if ext == ".json":
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise UnsupportedUpload(f"Invalid JSON: {e}")
+        if isinstance(data, dict) and data.get("format") == "nexus-full-backup":
+            if "since" in data:
+                return apply_increment(data)
+            return import_full_database(data)
+        # Fall through to native list import
+        return import_native_json(io.BytesIO(content.encode("utf-8")))
+
+    if isinstance(content, bytes):
+        content = content.decode("utf-8-sig")
+
+    fmt = detect_csv_format(content)
+    if fmt == "native":
+        return import_native_csv(io.BytesIO(content.encode("utf-8")))
+    if fmt == "ticktick":
+        uploaded = io.BytesIO(content.encode("utf-8-sig"))
+        uploaded.name = "reimport.csv"
+        with transaction.atomic():
+            return import_ticktick_csv(uploaded)
+    raise UnsupportedUpload(
+        "Unrecognized CSV format. Expected either the app's native export "
+        "columns (list, section, task) or TickTick columns (taskId, Title)."
+    )
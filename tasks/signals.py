@@ -0,0 +1,29 @@
+"""Feed ChangeLogEntry from model signals across the tasks, network and notebook apps."""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from tasks.models import ChangeLogEntry
+
+
+@receiver(post_save, dispatch_uid="changelog_post_save")
+def log_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        ChangeLogEntry.record(sender, [instance.pk])
+
+
+@receiver(post_delete, dispatch_uid="changelog_post_delete")
+def log_delete(sender, instance, **kwargs):
+    ChangeLogEntry.record(sender, [instance.pk], ChangeLogEntry.ACTION_DELETE)
+
+
+@receiver(m2m_changed, dispatch_uid="changelog_m2m_changed")
+def log_m2m_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    # A relation belongs to the model declaring the field (task tags,
+    # interaction people), so only that side is logged as changed.
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        ChangeLogEntry.record(type(instance), [instance.pk])
+    elif pk_set:
+        ChangeLogEntry.record(model, pk_set)
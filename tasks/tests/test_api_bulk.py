@@ -0,0 +1,124 @@
+import json
+
+from django.test import Client, TestCase
+
+from tasks.models import List, Section, Tag, Task
+
+
+class BulkTaskAPITests(TestCase):
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.get("/api/health/")
+        self.csrf = self.client.cookies["csrftoken"].value
+        self.task_list = List.objects.create(name="A", emoji="", position=10)
+        self.section = Section.objects.create(list=self.task_list, name="Todo", emoji="", position=10)
+
+    def _headers(self):
+        return {"HTTP_X_CSRFTOKEN": self.csrf}
+
+    def _bulk(self, operations):
+        return self.client.post(
+            "/api/tasks/bulk/",
+            data=json.dumps({"operations": operations}),
+            content_type="application/json",
+            **self._headers(),
+        )
+
+    def test_complete_and_tag_in_one_request(self):
+        parent = Task.objects.create(section=self.section, title="Parent", position=10)
+        child = Task.objects.create(section=self.section, parent=parent, title="Child", position=10)
+        other = Task.objects.create(section=self.section, title="Other", position=20)
+
+        response = self._bulk(
+            [
+                {"action": "complete", "task_ids": [parent.id, other.id]},
+                {"action": "add_tag", "task_ids": [parent.id, other.id], "tag_name": "done"},
+            ]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([task["id"] for task in data["tasks"]], [parent.id, other.id])
+        self.assertEqual(data["tasks"][0]["tags"][0]["name"], "done")
+        self.assertEqual(Task.objects.filter(is_completed=True).count(), 3)
+        child.refresh_from_db()
+        self.assertIsNotNone(child.completed_at)
+
+    def test_move_to_section_carries_subtrees(self):
+        target = Section.objects.create(list=self.task_list, name="Done", emoji="", position=20)
+        root = Task.objects.create(section=self.section, title="Root", position=10)
+        nested = Task.objects.create(section=self.section, parent=root, title="Nested", position=10)
+        leaf = Task.objects.create(section=self.section, parent=nested, title="Leaf", position=10)
+
+        response = self._bulk([{"action": "move", "task_ids": [nested.id], "section_id": target.id}])
+
+        self.assertEqual(response.status_code, 200)
+        nested.refresh_from_db()
+        leaf.refresh_from_db()
+        self.assertEqual((nested.section_id, nested.parent_id, nested.path), (target.id, None, ""))
+        self.assertEqual((leaf.section_id, leaf.path), (target.id, f"{nested.id}/"))
+        self.assertEqual(list(root.descendants()), [])
+
+    def test_remove_tag_and_delete(self):
+        tag = Tag.objects.create(name="urgent")
+        keep = Task.objects.create(section=self.section, title="Keep", position=10)
+        drop = Task.objects.create(section=self.section, title="Drop", position=20)
+        child = Task.objects.create(section=self.section, parent=drop, title="Child", position=10)
+        keep.tags.add(tag)
+
+        response = self._bulk(
+            [
+                {"action": "remove_tag", "task_ids": [keep.id], "tag_id": tag.id},
+                {"action": "delete", "task_ids": [drop.id]},
+            ]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(sorted(data["deleted_ids"]), sorted([drop.id, child.id]))
+        self.assertEqual(data["tasks"][0]["tags"], [])
+        self.assertFalse(Task.objects.filter(pk__in=[drop.id, child.id]).exists())
+
+    def test_failure_rolls_back_earlier_operations(self):
+        task = Task.objects.create(section=self.section, title="Task", position=10)
+
+        response = self._bulk(
+            [
+                {"action": "complete", "task_ids": [task.id]},
+                {"action": "complete", "task_ids": [task.id + 999]},
+            ]
+        )
+
+        self.assertEqual(response.status_code, 422)
+        task.refresh_from_db()
+        self.assertFalse(task.is_completed)
+
+    def test_pin_respects_list_limit(self):
+        tasks = [Task.objects.create(section=self.section, title=str(i), position=i) for i in range(4)]
+
+        response = self._bulk([{"action": "pin", "task_ids": [task.id for task in tasks]}])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Task.objects.filter(is_pinned=True).exists())
+
+    def test_move_respects_target_list_pin_limit(self):
+        other_list = List.objects.create(name="B", emoji="", position=20)
+        target = Section.objects.create(list=other_list, name="Todo", emoji="", position=10)
+        for i in range(3):
+            Task.objects.create(section=target, title=f"Pinned {i}", position=i, is_pinned=True)
+        root = Task.objects.create(section=self.section, title="Root", position=10)
+        Task.objects.create(section=self.section, parent=root, title="Pinned child", position=10, is_pinned=True)
+
+        response = self._bulk([{"action": "move", "task_ids": [root.id], "section_id": target.id}])
+
+        self.assertEqual(response.status_code, 409)
+        root.refresh_from_db()
+        self.assertEqual(root.section_id, self.section.id)
+
+    def test_unknown_action_is_rejected_by_schema(self):
+        task = Task.objects.create(section=self.section, title="Task", position=10)
+
+        response = self._bulk([{"action": "archive", "task_ids": [task.id]}])
+
+        self.assertEqual(response.status_code, 422)
+        self.assertIn("action", json.dumps(response.json()["detail"]))
@@ -0,0 +1,104 @@
+import json
+
+from django.test import Client, TestCase
+
+from network.models import Interaction, InteractionType, Person
+from tasks.models import ChangeLogEntry, List, Project, Section, Tag, Task
+
+
+class ChangesAPITests(TestCase):
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.get("/api/health/")
+        self.csrf = self.client.cookies["csrftoken"].value
+        self.task_list = List.objects.create(name="A", emoji="", position=10)
+        self.section = Section.objects.create(list=self.task_list, name="Todo", emoji="", position=10)
+        self.cursor = self.client.get("/api/changes/").json()["cursor"]
+
+    def _headers(self):
+        return {"HTTP_X_CSRFTOKEN": self.csrf}
+
+    def _changes(self, since, **params):
+        query = "&".join(f"{key}={value}" for key, value in {"since": since, **params}.items())
+        return self.client.get(f"/api/changes/?{query}").json()
+
+    def test_compacts_repeated_writes_into_one_upsert(self):
+        task = Task.objects.create(section=self.section, title="Draft", position=10)
+        task.title = "Final"
+        task.save()
+        task.tags.add(Tag.objects.create(name="home"))
+
+        data = self._changes(self.cursor)
+
+        task_changes = [change for change in data["changes"] if change["entity_type"] == "task"]
+        self.assertEqual(len(task_changes), 1)
+        self.assertEqual(task_changes[0]["action"], "upsert")
+        self.assertEqual(task_changes[0]["data"]["title"], "Final")
+        self.assertEqual(task_changes[0]["data"]["tags"][0]["name"], "home")
+        self.assertEqual(self._changes(data["cursor"])["changes"], [])
+
+    def test_delete_cascades_are_logged_across_apps(self):
+        parent = Task.objects.create(section=self.section, title="Parent", position=10)
+        child = Task.objects.create(section=self.section, parent=parent, title="Child", position=10)
+        person = Person.objects.create(first_name="Ada", last_name="Lovelace")
+        expected = {("task", parent.id), ("task", child.id), ("person", person.id)}
+        start = self._changes(self.cursor)["cursor"]
+
+        parent.delete()
+        person.delete()
+
+        changes = {(c["entity_type"], c["id"]): c for c in self._changes(start)["changes"]}
+        self.assertEqual(set(changes), expected)
+        self.assertTrue(all(c["action"] == "delete" and c["data"] is None for c in changes.values()))
+
+    def test_bulk_endpoint_writes_are_logged(self):
+        tasks = [Task.objects.create(section=self.section, title=str(i), position=i) for i in range(2)]
+        start = self._changes(self.cursor)["cursor"]
+
+        self.client.post(
+            "/api/tasks/bulk/",
+            data=json.dumps({"operations": [{"action": "pin", "task_ids": [t.id for t in tasks]}]}),
+            content_type="application/json",
+            **self._headers(),
+        )
+
+        changes = self._changes(start)["changes"]
+        self.assertEqual({c["id"] for c in changes}, {t.id for t in tasks})
+        self.assertTrue(all(c["data"]["is_pinned"] for c in changes))
+
+    def test_limit_pages_through_the_log(self):
+        for i in range(3):
+            Task.objects.create(section=self.section, title=str(i), position=i)
+
+        first = self._changes(self.cursor, limit=2)
+        second = self._changes(first["cursor"], limit=2)
+
+        self.assertTrue(first["has_more"])
+        self.assertFalse(second["has_more"])
+        self.assertEqual(len(first["changes"]) + len(second["changes"]), 3)
+        self.assertEqual(second["cursor"], ChangeLogEntry.objects.latest("id").id)
+
+    def test_derived_person_and_project_fields_are_logged(self):
+        person = Person.objects.create(first_name="Ada", last_name="Lovelace")
+        project = Project.objects.create(name="Engine")
+        self.task_list.project = project
+        self.task_list.save()
+        task = Task.objects.create(section=self.section, title="Build", position=10)
+        start = self._changes(self.cursor)["cursor"]
+
+        call = InteractionType.objects.create(name="Call")
+        interaction = Interaction.objects.create(interaction_type=call, date="2026-03-02")
+        interaction.people.add(person)
+        Task.objects.filter(pk=task.pk).update(is_completed=True)
+
+        changes = {(c["entity_type"], c["id"]): c for c in self._changes(start)["changes"]}
+        person_data = changes[("person", person.id)]["data"]
+        self.assertEqual(person_data["last_interaction_date"], "2026-03-02")
+        self.assertEqual(person_data["last_interaction_type"], "Call")
+        self.assertEqual(changes[("project", project.id)]["data"]["completed_tasks"], 1)
+
+        start = self._changes(start)["cursor"]
+        call.name = "Phone call"
+        call.save()
+        changes = {(c["entity_type"], c["id"]): c for c in self._changes(start)["changes"]}
+        self.assertEqual(changes[("person", person.id)]["data"]["last_interaction_type"], "Phone call")
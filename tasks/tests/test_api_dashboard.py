@@ -1,12 +1,18 @@
 import json
 from datetime import date, timedelta
 
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from network.models import InteractionType, Person
 from network.models.interaction import Interaction
-from tasks.models import List, Section, Task
+from tasks.models import ActivityCount, List, Project, Section, Task, TimeEntry
+from tasks.services.rollups import rebuild_rollups
 
 
 class DashboardTrendsAPITests(TestCase):
@@ -50,6 +56,16 @@ class DashboardTrendsAPITests(TestCase):
         total = sum(w["count"] for w in data["tasks_completed_per_week"])
         self.assertEqual(total, 1)
 
+    def test_trends_weeks_param(self):
+        response = self.client.get("/api/dashboard/trends/?weeks=52")
+        data = response.json()
+        self.assertEqual(len(data["interactions_per_week"]), 52)
+        monday = timezone.now().date() - timedelta(days=timezone.now().weekday())
+        self.assertEqual(data["interactions_per_week"][-1]["week_start"], monday.isoformat())
+
+        response = self.client.get("/api/dashboard/trends/?weeks=0")
+        self.assertEqual(response.status_code, 400)
+
     def test_trends_compliance_no_people(self):
         response = self.client.get("/api/dashboard/trends/")
         data = response.json()
@@ -101,6 +117,98 @@ class DashboardTrendsAPITests(TestCase):
         self.assertEqual(data["follow_up_compliance"]["total"], 1)
 
 
+class DashboardActivityAPITests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        lst = List.objects.create(name="Test")
+        self.section = Section.objects.create(list=lst, name="Default")
+        self.itype = InteractionType.objects.create(name="Call")
+
+    def _snapshot(self):
+        return sorted(
+            ActivityCount.objects.filter(count__gt=0).values_list(
+                "metric", "period", "start", "count"
+            )
+        )
+
+    def test_monthly_buckets(self):
+        today = timezone.now().date()
+        Interaction.objects.create(interaction_type=self.itype, date=today)
+        Task.objects.create(section=self.section, title="New")
+        project = Project.objects.create(name="Client")
+        TimeEntry.objects.create(project=project, date=today)
+
+        response = self.client.get("/api/dashboard/activity/?period=month&count=3")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["period"], "month")
+        self.assertEqual(len(data["buckets"]), 3)
+        current = data["buckets"][-1]
+        self.assertEqual(current["start"], today.replace(day=1).isoformat())
+        self.assertEqual(current["interactions"], 1)
+        self.assertEqual(current["tasks_created"], 1)
+        self.assertEqual(current["time_entries"], 1)
+        self.assertEqual(current["tasks_completed"], 0)
+
+    def test_rejects_unknown_period(self):
+        response = self.client.get("/api/dashboard/activity/?period=year")
+        self.assertEqual(response.status_code, 400)
+
+    def test_rollups_follow_bulk_and_queryset_writes(self):
+        today = timezone.now().date()
+        tasks = Task.objects.bulk_create(
+            Task(section=self.section, title=f"T{i}", path="") for i in range(3)
+        )
+        Task.objects.filter(pk__in=[t.pk for t in tasks[:2]]).update(
+            is_completed=True, completed_at=timezone.now()
+        )
+        interactions = Interaction.objects.bulk_create(
+            Interaction(interaction_type=self.itype, date=today - timedelta(days=d))
+            for d in (0, 40, 400)
+        )
+        Interaction.objects.filter(pk=interactions[0].pk).update(
+            date=today - timedelta(days=3)
+        )
+        Interaction.objects.filter(pk=interactions[1].pk).delete()
+        Task.objects.filter(pk=tasks[2].pk).delete()
+
+        week = ActivityCount.objects.get(
+            metric=ActivityCount.METRIC_TASKS_COMPLETED,
+            period=ActivityCount.PERIOD_WEEK,
+            start=today - timedelta(days=today.weekday()),
+        )
+        self.assertEqual(week.count, 2)
+
+        incremental = self._snapshot()
+        rebuild_rollups()
+        self.assertEqual(self._snapshot(), incremental)
+
+    def test_rebuild_moves_activity_off_the_cached_response(self):
+        Interaction.objects.create(interaction_type=self.itype, date=timezone.now().date())
+        ActivityCount.objects.all().delete()
+        stale = self.client.get("/api/dashboard/activity/").json()
+        self.assertEqual(stale["buckets"][-1]["interactions"], 0)
+
+        rebuild_rollups()
+        response = self.client.get("/api/dashboard/activity/").json()
+        self.assertEqual(response["buckets"][-1]["interactions"], 1)
+
+    def test_rebuild_command(self):
+        Interaction.objects.create(interaction_type=self.itype, date=date(2024, 5, 8))
+        ActivityCount.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_rollups", stdout=out)
+        self.assertIn("Rebuilt 3", out.getvalue())
+        self.assertEqual(
+            ActivityCount.objects.get(
+                metric=ActivityCount.METRIC_INTERACTIONS,
+                period=ActivityCount.PERIOD_WEEK,
+                start=date(2024, 5, 6),
+            ).count,
+            1,
+        )
+
+
 class DashboardFollowUpsDueAPITests(TestCase):
     def setUp(self):
         self.client = Client()
@@ -184,3 +292,76 @@ class DashboardFollowUpsDueAPITests(TestCase):
         self.assertEqual(len(data), 2)
         self.assertEqual(data[0]["first_name"], "Bob")  # more overdue
         self.assertEqual(data[1]["first_name"], "Alice")
+
+
+class PersonFollowUpDatesTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.itype = InteractionType.objects.create(name="Call")
+        self.person = Person.objects.create(
+            first_name="Ada", last_name="L", follow_up_cadence_days=7
+        )
+
+    def _dates(self):
+        self.person.refresh_from_db()
+        return self.person.last_interaction_date, self.person.next_follow_up_due
+
+    def test_new_person_is_due_a_cadence_after_creation(self):
+        created = self.person.created_at.date()
+        self.assertEqual(self._dates(), (None, created + timedelta(days=7)))
+
+        Person.objects.create(first_name="No", last_name="Cadence")
+        self.assertIsNone(Person.objects.get(first_name="No").next_follow_up_due)
+
+    def test_follows_interaction_writes(self):
+        first = Interaction.objects.create(interaction_type=self.itype, date=date(2025, 3, 1))
+        first.people.add(self.person)
+        self.assertEqual(self._dates(), (date(2025, 3, 1), date(2025, 3, 8)))
+
+        second = Interaction.objects.create(interaction_type=self.itype, date=date(2025, 4, 1))
+        second.people.add(self.person)
+        self.assertEqual(self._dates(), (date(2025, 4, 1), date(2025, 4, 8)))
+
+        Interaction.objects.filter(pk=second.pk).update(date=date(2025, 2, 1))
+        self.assertEqual(self._dates(), (date(2025, 3, 1), date(2025, 3, 8)))
+
+        other = Person.objects.create(first_name="Bo", last_name="B")
+        first.people.set([other])
+        self.assertEqual(self._dates(), (date(2025, 2, 1), date(2025, 2, 8)))
+
+        second.delete()
+        created = self.person.created_at.date()
+        self.assertEqual(self._dates(), (None, created + timedelta(days=7)))
+
+    def test_cadence_change_and_stale_save(self):
+        stale = Person.objects.get(pk=self.person.pk)
+        interaction = Interaction.objects.create(
+            interaction_type=self.itype, date=date(2025, 3, 1)
+        )
+        interaction.people.add(self.person)
+
+        stale.follow_up_cadence_days = 30
+        stale.save()
+        self.assertEqual(self._dates(), (date(2025, 3, 1), date(2025, 3, 31)))
+
+        Person.objects.filter(pk=self.person.pk).update(follow_up_cadence_days=None)
+        self.assertEqual(self._dates(), (date(2025, 3, 1), None))
+
+    def test_follow_ups_due_is_one_query(self):
+        for i in range(5):
+            person = Person.objects.create(
+                first_name=f"P{i}", last_name="X", follow_up_cadence_days=1
+            )
+            interaction = Interaction.objects.create(
+                interaction_type=self.itype,
+                date=timezone.now().date() - timedelta(days=10 + i),
+            )
+            interaction.people.add(person)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/dashboard/follow-ups-due/")
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            [row["first_name"] for row in response.json()],
+            ["P4", "P3", "P2", "P1", "P0"],
+        )
@@ -1,7 +1,15 @@
+import gzip
 import json
+import os
+import sqlite3
+import tempfile
+from datetime import timedelta
 
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from network.models import (
     Interaction,
@@ -17,7 +25,19 @@ from network.models import (
     TaskOrganization,
     TaskPerson,
 )
-from tasks.models import List, Project, ProjectLink, Section, Tag, Task, TimeEntry
+from tasks.models import (
+    List,
+    Project,
+    ProjectLink,
+    Section,
+    TableVersion,
+    Tag,
+    Task,
+    TimeEntry,
+)
+from tasks.services.full_export import FORMAT, export_full_database
+from tasks.services.full_import import apply_increment, import_full_database
+from tasks.services.snapshot import SnapshotError, restore_snapshot, write_snapshot
 
 
 class FullBackupExportTests(TestCase):
@@ -135,6 +155,56 @@ class FullBackupExportTests(TestCase):
         self.assertEqual(data["tasks"], [])
         self.assertEqual(data["people"], [])
 
+    def test_ndjson_export_matches_json_export(self):
+        document = json.loads(self.client.get("/api/export/full/").content)
+
+        resp = self.client.get("/api/export/full/?format=ndjson")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+        self.assertIn("nexus-backup.ndjson", resp["Content-Disposition"])
+
+        lines = [json.loads(line) for line in b"".join(resp.streaming_content).splitlines()]
+        self.assertEqual(lines[0]["format"], "nexus-full-backup")
+        self.assertEqual(lines[0]["version"], 1)
+        rows = {}
+        for line in lines[1:]:
+            rows.setdefault(line["table"], []).append(line["data"])
+        for key, value in document.items():
+            if isinstance(value, list) and value:
+                self.assertEqual(rows[key], value, key)
+
+    def test_export_m2m_ids_do_not_query_per_row(self):
+        for index in range(5):
+            task = Task.objects.create(section=self.section, title=f"Extra {index}", position=index + 1)
+            task.tags.add(self.tag)
+            interaction = Interaction.objects.create(
+                interaction_type=self.interaction_type, date="2026-02-28"
+            )
+            interaction.people.add(self.person)
+
+        # One query per table plus one per prefetched relation.
+        with self.assertNumQueries(24):
+            resp = self.client.get("/api/export/full/?format=ndjson")
+            b"".join(resp.streaming_content)
+
+    def test_export_rejects_unknown_format(self):
+        resp = self.client.get("/api/export/full/?format=xml")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_incremental_export_since_timestamp(self):
+        since = self.client.get("/api/export/full/").json()["exported_at"]
+        Task.objects.filter(pk=self.task.pk).update(title="Edited")
+
+        resp = self.client.get("/api/export/full/", {"since": since})
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["since"], since)
+        self.assertEqual([row["title"] for row in data["tasks"]], ["Edited"])
+        self.assertEqual(data["lists"], [])
+        self.assertEqual(self.client.get("/api/export/full/?since=yesterday").status_code, 400)
+
 
 class FullBackupRoundTripTests(TestCase):
     def setUp(self):
@@ -224,6 +294,9 @@ class FullBackupRoundTripTests(TestCase):
 
     def test_round_trip(self):
         counts = self._populate_db()
+        created = timezone.now() - timedelta(days=30)
+        Task.objects.filter(title="Write report").update(created_at=created)
+        Person.objects.update(created_at=created)
 
         # Export
         resp = self.client.get("/api/export/full/")
@@ -255,6 +328,9 @@ class FullBackupRoundTripTests(TestCase):
         task = Task.objects.get(title="Write report")
         subtask = Task.objects.get(title="Draft")
         self.assertEqual(subtask.parent_id, task.id)
+        self.assertEqual(task.created_at, created)
+        people_created = Person.objects.values_list("created_at", flat=True)
+        self.assertEqual(set(people_created), {created})
         self.assertTrue(task.tags.filter(name="urgent").exists())
         self.assertEqual(task.section.name, "Todo")
         self.assertEqual(task.section.list.name, "Work")
@@ -269,6 +345,38 @@ class FullBackupRoundTripTests(TestCase):
             InteractionTask.objects.filter(task=task).exists()
         )
 
+    def test_ndjson_round_trip(self):
+        counts = self._populate_db()
+        resp = self.client.get("/api/export/full/?format=ndjson")
+        content = b"".join(resp.streaming_content)
+        self._clear_all()
+
+        upload = SimpleUploadedFile(
+            "nexus-backup.ndjson", content, content_type="application/x-ndjson"
+        )
+        resp = self.client.post("/api/import/", {"file": upload}, **self._headers())
+        self.assertEqual(resp.status_code, 200)
+        stats = resp.json()
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(stats["tasks_created"], counts["tasks"])
+        self.assertEqual(stats["interactions_created"], counts["interactions"])
+        self.assertEqual(Task.objects.get(title="Draft").parent.title, "Write report")
+        self.assertTrue(TaskPerson.objects.filter(task__title="Write report").exists())
+
+    def test_ndjson_rejects_other_content(self):
+        upload = SimpleUploadedFile("backup.ndjson", b'{"table": "tasks"}\n')
+        resp = self.client.post("/api/import/", {"file": upload}, **self._headers())
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("Invalid NDJSON backup", resp.json()["detail"])
+
+    def test_ndjson_rejects_lines_that_are_not_objects(self):
+        header = json.dumps({"format": FORMAT}).encode()
+        for line in (b"[1, 2]", b"3", b'{"table": "tasks"}'):
+            upload = SimpleUploadedFile("backup.ndjson", header + b"\n" + line + b"\n")
+            resp = self.client.post("/api/import/", {"file": upload}, **self._headers())
+            self.assertEqual(resp.status_code, 400)
+            self.assertIn("Line 2: expected an object.", resp.json()["detail"])
+
     def test_format_detection_full_backup(self):
         """Full-backup JSON routes to full import."""
         data = {
@@ -334,3 +442,184 @@ class FullBackupRoundTripTests(TestCase):
         self.assertEqual(stats["organizations_skipped"], 1)
         self.assertEqual(stats["organizations_created"], 0)
         self.assertEqual(stats["errors"], 0)
+
+    def test_import_resolves_in_backup_duplicates_and_paths_in_bulk(self):
+        section = {"id": 1, "list_id": 1, "name": "Todo", "position": 0}
+        tasks = [{
+            "id": 1, "section_id": 1, "parent_id": None, "title": "Root",
+            "created_at": "2026-02-27T00:00:00+00:00", "tag_ids": [1],
+        }]
+        for task_id in range(2, 42):
+            tasks.append({
+                "id": task_id, "section_id": 1, "parent_id": task_id - 1,
+                "title": f"Depth {task_id - 1}",
+                "created_at": "2026-02-27T00:00:00+00:00", "tag_ids": [1, 2],
+            })
+        # Same section, title and parent as task 2: resolves to that row.
+        tasks.append({
+            "id": 99, "section_id": 1, "parent_id": 1, "title": "Depth 1",
+            "created_at": "2026-02-27T00:00:00+00:00",
+        })
+        data = {
+            "format": "nexus-full-backup",
+            "version": 1,
+            "tags": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3, "name": "a"}],
+            "lists": [{"id": 1, "name": "Deep", "position": 0}],
+            "sections": [section],
+            "tasks": tasks,
+        }
+
+        resp = self._upload_json(data)
+        stats = resp.json()
+
+        self.assertEqual((stats["tags_created"], stats["tags_skipped"]), (2, 1))
+        self.assertEqual((stats["tasks_created"], stats["tasks_skipped"]), (41, 1))
+        deepest = Task.objects.get(title="Depth 40")
+        chain = [Task.objects.get(title="Root")]
+        chain += [Task.objects.get(title=f"Depth {depth}") for depth in range(1, 40)]
+        self.assertEqual(deepest.path, "".join(f"{task.pk}/" for task in chain))
+        self.assertEqual(set(deepest.tags.values_list("name", flat=True)), {"a", "b"})
+        self.assertEqual(deepest.descendants().count(), 0)
+        self.assertEqual(chain[0].descendants().count(), 40)
+
+    def test_import_query_count_does_not_grow_with_rows(self):
+        def backup(people):
+            return {
+                "format": "nexus-full-backup",
+                "version": 1,
+                "people": [
+                    {"id": index, "first_name": "P", "last_name": str(index)}
+                    for index in range(people)
+                ],
+            }
+
+        def lookups(queries):
+            # INSERTs are split into batches to respect SQLite's variable limit.
+            return [q for q in queries if not q["sql"].startswith("INSERT")]
+
+        with CaptureQueriesContext(connection) as small:
+            import_full_database(backup(2))
+        with CaptureQueriesContext(connection) as large:
+            import_full_database(backup(300))
+
+        self.assertEqual(len(lookups(large)), len(lookups(small)))
+        self.assertEqual(Person.objects.count(), 300)
+
+
+class SnapshotTests(TransactionTestCase):
+    # Restoring copies pages into the live connection, which cannot happen
+    # inside a test transaction. Keep the migration-seeded TableVersion rows.
+    serialized_rollback = True
+
+    def setUp(self):
+        self.client = Client()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "snapshot.sqlite3")
+        self.section = Section.objects.create(
+            list=List.objects.create(name="Work", position=0), name="Todo", position=0
+        )
+        Task.objects.create(section=self.section, title="Keep me", position=0)
+
+    def _task_titles(self, path):
+        snapshot = sqlite3.connect(path)
+        self.addCleanup(snapshot.close)
+        return [row[0] for row in snapshot.execute("SELECT title FROM tasks_task")]
+
+    def test_snapshot_endpoint_downloads_database_file(self):
+        response = self.client.get("/api/export/snapshot/?compress=gzip")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("nexus-snapshot.sqlite3.gz", response["Content-Disposition"])
+        with open(self.path, "wb") as file:
+            file.write(gzip.decompress(b"".join(response.streaming_content)))
+        self.assertEqual(self._task_titles(self.path), ["Keep me"])
+
+    def test_restore_replaces_data_and_moves_versions_forward(self):
+        write_snapshot(self.path)
+        Task.objects.all().delete()
+        Task.objects.create(section=self.section, title="After snapshot", position=1)
+        version = TableVersion.objects.get(table="tasks_task").version
+
+        restore_snapshot(self.path)
+
+        self.assertEqual(list(Task.objects.values_list("title", flat=True)), ["Keep me"])
+        self.assertGreater(TableVersion.objects.get(table="tasks_task").version, version)
+
+    def test_restore_rejects_snapshot_from_newer_schema(self):
+        write_snapshot(self.path)
+        snapshot = sqlite3.connect(self.path)
+        with snapshot:
+            snapshot.execute(
+                "INSERT INTO django_migrations (app, name, applied) "
+                "VALUES ('tasks', '9999_future', '2030-01-01')"
+            )
+        snapshot.close()
+
+        with self.assertRaisesMessage(SnapshotError, "tasks.9999_future"):
+            restore_snapshot(self.path)
+        self.assertEqual(Task.objects.count(), 1)
+
+
+class IncrementalBackupTests(TransactionTestCase):
+    serialized_rollback = True
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.snapshot = os.path.join(directory.name, "base.sqlite3")
+        self.tag = Tag.objects.create(name="urgent")
+        self.project = Project.objects.create(name="Alpha", position=0)
+        self.lst = List.objects.create(name="Work", position=0, project=self.project)
+        self.section = Section.objects.create(list=self.lst, name="Todo", position=0)
+        self.parent = Task.objects.create(section=self.section, title="Parent", position=0)
+        self.child = Task.objects.create(
+            section=self.section, parent=self.parent, title="Child", position=0
+        )
+        self.other = Task.objects.create(section=self.section, title="Other", position=1)
+        self.person = Person.objects.create(first_name="Ada", last_name="Lovelace")
+
+    @staticmethod
+    def _comparable(export):
+        volatile = {"created_at", "updated_at"}
+        return {
+            key: [{k: v for k, v in row.items() if k not in volatile} for row in rows]
+            for key, rows in export.items()
+            if isinstance(rows, list)
+        }
+
+    def test_increment_carries_only_changes_and_deletes(self):
+        since = timezone.now()
+        Task.objects.filter(pk=self.other.pk).update(title="Renamed in bulk")
+        person_id = self.person.pk
+        self.person.delete()
+
+        increment = export_full_database(since=since)
+
+        self.assertEqual([row["title"] for row in increment["tasks"]], ["Renamed in bulk"])
+        self.assertEqual(increment["lists"], [])
+        self.assertEqual([row["name"] for row in increment["tags"]], ["urgent"])
+        self.assertEqual(increment["deleted"], {"people": [person_id]})
+
+    def test_increment_applied_to_base_snapshot_reproduces_database(self):
+        write_snapshot(self.snapshot)
+        since = timezone.now()
+        self.other.tags.add(self.tag)
+        self.other.parent = self.child
+        self.other.save()
+        Task.objects.filter(pk=self.parent.pk).update(is_pinned=True)
+        added = Person.objects.create(first_name="Grace", last_name="Hopper")
+        Section.objects.create(list=self.lst, name="Done", position=1)
+        ProjectLink.objects.create(project=self.project, url="https://x.test", descriptor="X")
+        self.person.delete()
+        expected = self._comparable(export_full_database())
+        increment = export_full_database(since=since)
+
+        restore_snapshot(self.snapshot)
+        stats = apply_increment(json.loads(json.dumps(increment)))
+
+        self.assertEqual(stats["people_deleted"], 1)
+        self.assertEqual(self._comparable(export_full_database()), expected)
+        moved = Task.objects.get(pk=self.other.pk)
+        self.assertEqual(moved.path, f"{self.parent.pk}/{self.child.pk}/")
+        self.assertEqual(Person.objects.get(pk=added.pk).created_at, added.created_at)
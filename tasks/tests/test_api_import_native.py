@@ -1,9 +1,13 @@
+import io
 import json
 
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 
 from tasks.models import List, Section, Tag, Task
+from tasks.services.ticktick_import import import_ticktick_csv
 
 
 class NativeJSONImportTests(TestCase):
@@ -205,6 +209,70 @@ class NativeJSONImportTests(TestCase):
         self.assertEqual(body["tasks_skipped"], 1)
         self.assertEqual(Task.objects.filter(title="Same task").count(), 1)
 
+    def test_reimport_nests_new_subtasks_under_existing_tasks(self):
+        def tree(*subtasks):
+            return {
+                "name": "Nest",
+                "sections": [
+                    {
+                        "name": "Sec",
+                        "tasks": [
+                            {
+                                "title": "Root",
+                                "tags": ["shared"],
+                                "subtasks": [
+                                    {"title": "Mid", "subtasks": list(subtasks)}
+                                ],
+                            }
+                        ],
+                    }
+                ],
+            }
+
+        self._upload_json(tree())
+        body = self._upload_json(
+            tree({"title": "Leaf", "tags": ["shared", "new"]}, {"title": "Leaf"})
+        ).json()
+
+        self.assertEqual(body["tasks_created"], 1)
+        self.assertEqual(body["tasks_skipped"], 3)
+        self.assertEqual(body["tags_created"], 1)
+        root = Task.objects.get(title="Root")
+        mid = Task.objects.get(title="Mid")
+        leaf = Task.objects.get(title="Leaf")
+        self.assertEqual(leaf.parent, mid)
+        self.assertEqual(leaf.path, f"{root.pk}/{mid.pk}/")
+        self.assertEqual(sorted(leaf.tags.values_list("name", flat=True)), ["new", "shared"])
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        def tree(name, count):
+            return {
+                "name": name,
+                "sections": [
+                    {
+                        "name": "Sec",
+                        "tasks": [
+                            {
+                                "title": f"Task {i}",
+                                "tags": [f"{name}{i % 3}"],
+                                "subtasks": [{"title": "Sub", "tags": [name]}],
+                            }
+                            for i in range(count)
+                        ],
+                    }
+                ],
+            }
+
+        with CaptureQueriesContext(connection) as small:
+            self._upload_json(tree("a", 3))
+        with CaptureQueriesContext(connection) as large:
+            body = self._upload_json(tree("b", 50)).json()
+
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(body["tasks_created"], 100)
+        self.assertEqual(body["parents_linked"], 50)
+        self.assertEqual(Task.objects.filter(title="Sub", path__endswith="/").count(), 53)
+
     def test_summary_stats_shape(self):
         data = {"name": "Stats", "emoji": "", "position": 0, "sections": []}
         resp = self._upload_json(data)
@@ -306,6 +374,24 @@ class NativeCSVImportTests(TestCase):
         self.assertEqual(body["tasks_created"], 0)
         self.assertEqual(body["tasks_skipped"], 1)
 
+    def test_parents_resolve_within_the_same_file(self):
+        csv_text = (
+            "list,section,task,parent_task,depth,notes,due_date,tags,is_completed\n"
+            "Work,Todo,Parent,,0,,,,False\n"
+            "Work,Todo,Child,Parent,1,,,,False\n"
+            "Work,Todo,Child,Parent,1,,,,False\n"
+            "Work,Todo,Grandchild,Child,2,,,,False\n"
+            "Work,Todo,Bad depth,,x,,,,False\n"
+        )
+        body = self._upload_csv(csv_text).json()
+
+        self.assertEqual(body["tasks_created"], 3)
+        self.assertEqual(body["tasks_skipped"], 1)
+        self.assertEqual(body["errors"], 1)
+        parent = Task.objects.get(title="Parent")
+        child = Task.objects.get(title="Child")
+        self.assertEqual(Task.objects.get(title="Grandchild").path, f"{parent.pk}/{child.pk}/")
+
     def test_summary_stats_shape(self):
         csv_text = "list,section,task,parent_task,depth,notes,due_date,tags,is_completed\n"
         resp = self._upload_csv(csv_text)
@@ -363,3 +449,81 @@ class FormatAutoDetectionTests(TestCase):
         upload = SimpleUploadedFile("data.xml", b"<data/>", content_type="text/xml")
         resp = self.client.post("/api/import/", {"file": upload}, **self._headers())
         self.assertEqual(resp.status_code, 400)
+
+
+class TickTickImportTests(TestCase):
+    HEADER = "Title,taskId,List Name,Column Name,Status,Tags,parentId\n"
+
+    def _import(self, rows):
+        csv_text = 'Date: 2026-01-01\n"Status: ",0 Normal\n' + self.HEADER + "".join(rows)
+        return import_ticktick_csv(io.BytesIO(csv_text.encode("utf-8")))
+
+    def test_links_parents_and_shares_tags(self):
+        stats = self._import([
+            "Child,c1,Work,Todo,0,urgent,p1\n",
+            "Parent,p1,Work,Todo,0,urgent;home,\n",
+            "Grandchild,g1,Work,Todo,1,,c1\n",
+            "Duplicate,p1,Work,Todo,0,,g1\n",
+        ])
+
+        self.assertEqual(stats["tasks_created"], 3)
+        self.assertEqual(stats["tasks_skipped"], 1)
+        self.assertEqual(stats["tags_created"], 2)
+        self.assertEqual(stats["parents_linked"], 2)
+        self.assertEqual(stats["errors"], 0)
+        parent = Task.objects.get(external_id="p1")
+        child = Task.objects.get(external_id="c1")
+        grandchild = Task.objects.get(external_id="g1")
+        self.assertEqual(child.parent, parent)
+        self.assertEqual(grandchild.path, f"{parent.pk}/{child.pk}/")
+        self.assertTrue(grandchild.is_completed)
+        self.assertEqual(sorted(parent.tags.values_list("name", flat=True)), ["home", "urgent"])
+        self.assertEqual(Section.objects.get(name="Todo").list.name, "Work")
+
+    def test_rejects_parent_loops(self):
+        stats = self._import([
+            "A,a1,Work,Todo,0,,b1\n",
+            "B,b1,Work,Todo,0,,a1\n",
+        ])
+
+        self.assertEqual(stats["parents_linked"], 1)
+        self.assertEqual(stats["errors"], 1)
+        self.assertIn("own descendant", stats["error_details"][0])
+        self.assertIsNone(Task.objects.get(external_id="b1").parent_id)
+
+    def test_rows_with_values_too_long_are_errors(self):
+        stats = self._import([
+            f"{'T' * 501},t1,Work,Todo,0,,\n",
+            f"Tagged,t2,Work,Todo,0,{'x' * 101},\n",
+            f"Listed,t3,{'L' * 256},Todo,0,,\n",
+            "Kept,t4,Work,Todo,0,ok,\n",
+        ])
+
+        self.assertEqual(stats["tasks_created"], 1)
+        self.assertEqual(stats["tags_created"], 1)
+        self.assertEqual(stats["lists_created"], 1)
+        self.assertEqual(stats["errors"], 3)
+        self.assertIn("Row 1: Task title is longer than 500", stats["error_details"][0])
+        self.assertEqual(list(Task.objects.values_list("external_id", flat=True)), ["t4"])
+        self.assertEqual(list(Tag.objects.values_list("name", flat=True)), ["ok"])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def rows(prefix, count):
+            return [
+                f"Task {i},{prefix}{i},{prefix},Todo,0,{prefix}{i % 3},{f'{prefix}0' if i else ''}\n"
+                for i in range(count)
+            ]
+
+        with CaptureQueriesContext(connection) as small:
+            self._import(rows("a", 5))
+        with CaptureQueriesContext(connection) as large:
+            stats = self._import(rows("b", 60))
+
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(stats["tasks_created"], 60)
+        self.assertEqual(stats["parents_linked"], 59)
+        self.assertEqual(Task.objects.filter(parent__external_id="b0").count(), 59)
+
+        stats = self._import(rows("b", 60))
+        self.assertEqual(stats["tasks_skipped"], 60)
+        self.assertEqual(stats["parents_linked"], 59)
@@ -0,0 +1,148 @@
+import json
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from tasks.jobs import (
+    fail_interrupted,
+    jobs_dir,
+    prune_finished,
+    run_pending,
+    submit_import,
+)
+from tasks.models import Job, List, Section, Task
+
+
+class JobsAPITests(TestCase):
+    def setUp(self):
+        jobs_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(jobs_dir.cleanup)
+        settings_override = override_settings(JOBS_DIR=jobs_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.get("/api/health/")
+        self.csrf = self.client.cookies["csrftoken"].value
+
+    def _headers(self):
+        return {"HTTP_X_CSRFTOKEN": self.csrf}
+
+    def _upload(self, name, payload):
+        return self.client.post(
+            "/api/jobs/import/",
+            {"file": SimpleUploadedFile(name, payload)},
+            **self._headers(),
+        )
+
+    def test_import_job_runs_in_worker_and_reports_stats(self):
+        payload = json.dumps(
+            {"name": "Inbox", "sections": [{"name": "Todo", "tasks": [{"title": "Pay rent"}]}]}
+        ).encode()
+
+        response = self._upload("lists.json", payload)
+
+        self.assertEqual(response.status_code, 202)
+        job = response.json()
+        self.assertEqual(job["status"], "queued")
+        self.assertFalse(Task.objects.exists())
+
+        self.assertEqual(run_pending(), 1)
+
+        job = self.client.get(f"/api/jobs/{job['id']}/").json()
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["result"]["tasks_created"], 1)
+        self.assertIsNone(job["download_url"])
+        self.assertTrue(Task.objects.filter(title="Pay rent").exists())
+        self.assertEqual(list(jobs_dir().iterdir()), [])
+
+    def test_ndjson_export_job_restores_through_import_job(self):
+        task_list = List.objects.create(name="Work", position=0)
+        section = Section.objects.create(list=task_list, name="Todo", position=0)
+        Task.objects.create(section=section, title="Ship it", position=0)
+        export_id = self.client.post(
+            "/api/jobs/export/?format=ndjson", **self._headers()
+        ).json()["id"]
+        run_pending()
+        download = self.client.get(f"/api/jobs/{export_id}/download/")
+        backup = b"".join(download.streaming_content)
+        Task.objects.all().delete()
+
+        import_id = self._upload("nexus-backup.ndjson", backup).json()["id"]
+        run_pending()
+
+        job = self.client.get(f"/api/jobs/{import_id}/").json()
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["result"]["tasks_created"], 1)
+        self.assertTrue(Task.objects.filter(title="Ship it").exists())
+
+    def test_import_job_rejects_unsupported_upload(self):
+        response = self._upload("notes.txt", b"hello")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+    def test_interrupted_upload_leaves_no_job_or_file(self):
+        upload = SimpleUploadedFile("lists.json", b"[]")
+        with patch.object(upload, "chunks", side_effect=OSError("connection reset")):
+            with self.assertRaises(OSError):
+                submit_import(upload)
+
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(list(jobs_dir().iterdir()), [])
+
+    def test_failed_import_records_error(self):
+        job_id = self._upload("broken.json", b"{not json").json()["id"]
+
+        run_pending()
+
+        job = self.client.get(f"/api/jobs/{job_id}/").json()
+        self.assertEqual(job["status"], "failed")
+        self.assertIn("Invalid JSON", job["error"])
+
+    def test_export_job_result_is_downloadable(self):
+        task_list = List.objects.create(name="Work", position=0)
+        section = Section.objects.create(list=task_list, name="Todo", position=0)
+        Task.objects.create(section=section, title="Ship it", position=0)
+
+        response = self.client.post("/api/jobs/export/?format=ndjson", **self._headers())
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["id"]
+        self.assertEqual(self.client.get(f"/api/jobs/{job_id}/download/").status_code, 404)
+
+        run_pending()
+
+        job = self.client.get(f"/api/jobs/{job_id}/").json()
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["progress_done"], job["progress_total"])
+        download = self.client.get(job["download_url"])
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(download["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in b"".join(download.streaming_content).splitlines()]
+        self.assertEqual(lines[0]["format"], "nexus-full-backup")
+        titles = [line["data"]["title"] for line in lines[1:] if line["table"] == "tasks"]
+        self.assertEqual(titles, ["Ship it"])
+
+    def test_export_job_rejects_unknown_format(self):
+        response = self.client.post("/api/jobs/export/?format=xml", **self._headers())
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_interrupted_jobs_fail_and_old_jobs_are_pruned(self):
+        running = Job.objects.create(kind=Job.KIND_EXPORT, status=Job.STATUS_RUNNING)
+        old = Job.objects.create(
+            kind=Job.KIND_EXPORT,
+            status=Job.STATUS_SUCCEEDED,
+            finished_at=timezone.now() - timedelta(days=30),
+        )
+
+        self.assertEqual(fail_interrupted(), 1)
+        self.assertEqual(prune_finished(), 1)
+
+        running.refresh_from_db()
+        self.assertEqual(running.status, Job.STATUS_FAILED)
+        self.assertFalse(Job.objects.filter(pk=old.pk).exists())
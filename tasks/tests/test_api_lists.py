@@ -1,6 +1,7 @@
 import json
 
-from django.test import Client, TestCase
+from django.conf import settings
+from django.test import Client, TestCase, override_settings
 
 from tasks.models import List, Section, Tag, Task
 
@@ -55,6 +56,51 @@ class ListAPITests(TestCase):
         self.assertEqual(data["sections"][0]["tasks"][0]["subtasks"][0]["id"], child.id)
         self.assertEqual(data["sections"][0]["tasks"][0]["tags"][0]["name"], "urgent")
 
+    @override_settings(
+        CACHES={
+            **settings.CACHES,
+            "responses": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        }
+    )
+    def test_get_list_detail_query_count_independent_of_tree_size(self):
+        task_list = List.objects.create(name="Big", emoji="", position=10)
+        tag = Tag.objects.create(name="deep")
+        for section_pos in (10, 20):
+            section = Section.objects.create(list=task_list, name=f"S{section_pos}", position=section_pos)
+            for root_pos in range(3):
+                parent = Task.objects.create(section=section, title=f"Root {root_pos}", position=root_pos)
+                for depth in range(4):
+                    parent = Task.objects.create(section=section, parent=parent, title=f"Depth {depth}", position=10)
+                    parent.tags.add(tag)
+
+        # One version lookup for the ETag, then the tree itself.
+        with self.assertNumQueries(5):
+            response = self.client.get(f"/api/lists/{task_list.id}/")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        node = data["sections"][1]["tasks"][2]
+        for _ in range(4):
+            node = node["subtasks"][0]
+        self.assertEqual(node["title"], "Depth 3")
+        self.assertEqual(node["tags"], [{"id": tag.id, "name": "deep"}])
+
+    def test_get_list_detail_revalidates_with_etag(self):
+        task_list = List.objects.create(name="Home", emoji="", position=10)
+        section = Section.objects.create(list=task_list, name="", position=10)
+        task = Task.objects.create(section=section, title="Laundry", position=10)
+        etag = self.client.get(f"/api/lists/{task_list.id}/")["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/lists/{task_list.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Task.objects.filter(pk=task.pk).update(title="Ironing")
+        response = self.client.get(f"/api/lists/{task_list.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["sections"][0]["tasks"][0]["title"], "Ironing")
+
     def test_update_list(self):
         task_list = List.objects.create(name="Old", emoji="O", position=10)
 
@@ -1,8 +1,14 @@
+import csv
+import io
 import json
 
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 
+from network.models import Organization, OrgType, Person
+from notebook.models import Page
 from tasks.models import List, Section, Tag, Task
 
 
@@ -50,6 +56,103 @@ class MiscAPITests(TestCase):
         self.assertEqual(data["results"][0]["list"]["id"], self.task_list.id)
         self.assertEqual(data["results"][0]["tasks"][0]["id"], self.task.id)
 
+    def test_search_ranks_prefix_matches_and_highlights(self):
+        notes_hit = Task.objects.create(
+            section=self.section, title="Quarterly review", notes="Prepare the invoice <draft>", position=20
+        )
+        title_hit = Task.objects.create(section=self.section, title="Invoice customers", position=30)
+
+        response = self.client.get("/api/search/?q=invo")
+        data = response.json()
+        tasks = data["results"][0]["tasks"]
+        self.assertEqual(data["total_count"], 2)
+        self.assertIsNone(data["next_offset"])
+        self.assertEqual([task["id"] for task in tasks], [title_hit.id, notes_hit.id])
+        self.assertEqual(tasks[0]["title_highlight"], "<mark>Invoice</mark> customers")
+        self.assertEqual(tasks[1]["snippet"], "Prepare the <mark>invoice</mark> &lt;draft&gt;")
+
+        first = self.client.get("/api/search/?q=invo&limit=1").json()
+        self.assertEqual(first["results"][0]["tasks"][0]["id"], title_hit.id)
+        self.assertEqual(first["next_offset"], 1)
+        page = self.client.get(f"/api/search/?q=invo&limit=1&offset={first['next_offset']}").json()
+        self.assertEqual(page["total_count"], 2)
+        self.assertEqual(page["results"][0]["tasks"][0]["id"], notes_hit.id)
+        self.assertIsNone(page["next_offset"])
+
+    def test_search_escapes_imported_title_markup(self):
+        csv_text = (
+            "Title,taskId,List Name,Column Name,Status,Tags,parentId\n"
+            "<img src=x onerror=alert(1)> Invoice,ext-1,Inbox,Todo,0,,\n"
+        )
+        upload = SimpleUploadedFile("ticktick.csv", csv_text.encode("utf-8"), content_type="text/csv")
+        self.assertEqual(self.client.post("/api/import/", {"file": upload}, **self._headers()).status_code, 200)
+
+        task = self.client.get("/api/search/?q=invoice").json()["results"][0]["tasks"][0]
+
+        self.assertEqual(
+            task["title_highlight"], "&lt;img src=x onerror=alert(1)&gt; <mark>Invoice</mark>"
+        )
+
+    def test_search_index_follows_edits_and_tag_changes(self):
+        tag = Tag.objects.create(name="errand")
+        self.task.tags.add(tag)
+        self.assertEqual(self.client.get("/api/search/?q=errand").json()["total_count"], 1)
+
+        tag.name = "chore"
+        tag.save()
+        self.task.title = "Renamed"
+        self.task.save()
+        self.assertEqual(self.client.get("/api/search/?q=errand").json()["total_count"], 0)
+        self.assertEqual(self.client.get("/api/search/?q=chore renamed").json()["total_count"], 1)
+
+        self.task.tags.remove(tag)
+        self.assertEqual(self.client.get("/api/search/?q=chore").json()["total_count"], 0)
+        self.task.delete()
+        self.assertEqual(self.client.get("/api/search/?q=renamed").json()["total_count"], 0)
+
+    def test_search_treats_operators_literally(self):
+        response = self.client.get('/api/search/?q=" OR NEAR(')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["total_count"], 0)
+
+    def test_search_all_groups_hits_by_entity_type(self):
+        org_type = OrgType.objects.create(name="Company")
+        person = Person.objects.create(first_name="Ada", last_name="Lovelace", notes="Met at the analytics meetup")
+        org = Organization.objects.create(name="Analytical Engines", org_type=org_type)
+        page = Page.objects.create(title="Reading list", content="Notes on analysis <b>engines</b>")
+
+        data = self.client.get("/api/search/all/?q=analy").json()
+
+        self.assertEqual(data["total_count"], 3)
+        self.assertEqual(data["facets"], {"person": 1, "organization": 1, "page": 1})
+        self.assertEqual(data["groups"][0]["entity_type"], "organization")
+        hits = {group["entity_type"]: group["hits"][0] for group in data["groups"]}
+        self.assertEqual(hits["organization"]["id"], org.id)
+        self.assertEqual(hits["organization"]["title_highlight"], "<mark>Analytical</mark> Engines")
+        self.assertEqual(hits["person"]["id"], person.id)
+        self.assertEqual(hits["page"]["snippet"], "Notes on <mark>analysis</mark> &lt;b&gt;engines&lt;/b&gt;")
+
+        filtered = self.client.get("/api/search/all/?q=analy&types=page,person").json()
+        self.assertEqual([group["entity_type"] for group in filtered["groups"]], ["person", "page"])
+
+    def test_search_all_escapes_task_title_markup(self):
+        Task.objects.create(section=self.section, title="<b>Invoice</b> run", position=20)
+
+        hit = self.client.get("/api/search/all/?q=invoice&types=task").json()["groups"][0]["hits"][0]
+
+        self.assertEqual(hit["title_highlight"], "&lt;b&gt;<mark>Invoice</mark>&lt;/b&gt; run")
+
+    def test_search_all_index_follows_edits(self):
+        org_type = OrgType.objects.create(name="Company")
+        org = Organization.objects.create(name="Initech", org_type=org_type)
+        org.name = "Globex"
+        org.save()
+
+        self.assertEqual(self.client.get("/api/search/all/?q=initech").json()["total_count"], 0)
+        self.assertEqual(self.client.get("/api/search/all/?q=globex").json()["facets"], {"organization": 1})
+        org.delete()
+        self.assertEqual(self.client.get("/api/search/all/?q=globex").json()["total_count"], 0)
+
     def test_export_endpoints(self):
         json_response = self.client.get("/api/export/json/")
         self.assertEqual(json_response.status_code, 200)
@@ -63,6 +166,41 @@ class MiscAPITests(TestCase):
         bad_format_response = self.client.get("/api/export/xml/")
         self.assertEqual(bad_format_response.status_code, 400)
 
+    def test_list_exports_stream_with_queries_per_list(self):
+        tag = Tag.objects.create(name="urgent")
+        child = Task.objects.create(section=self.section, title="Child", parent=self.task, position=5)
+        grandchild = Task.objects.create(section=self.section, title="Grandchild", parent=child)
+        grandchild.tags.add(tag)
+        other = List.objects.create(name="Other", position=20)
+        Section.objects.create(list=other, name="Later", position=10)
+
+        def export(path):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(path)
+                content = b"".join(response.streaming_content).decode()
+            return content, len(queries)
+
+        content, few = export("/api/export/csv/")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(content.count("list,section,task"), 1)
+        self.assertEqual(
+            [(row["task"], row["parent_task"], row["depth"], row["tags"]) for row in rows],
+            [
+                ("Find urgent issue", "", "0", ""),
+                ("Child", "Find urgent issue", "1", ""),
+                ("Grandchild", "Child", "2", "urgent"),
+            ],
+        )
+
+        for i in range(20):
+            Task.objects.create(section=self.section, title=f"Extra {i}", parent=child)
+        content, many = export("/api/export/json/")
+        self.assertEqual(many, few)
+        main = next(data for data in json.loads(content) if data["name"] == "Main")
+        subtasks = main["sections"][0]["tasks"][0]["subtasks"][0]["subtasks"]
+        self.assertEqual(len(subtasks), 21)
+        self.assertEqual(subtasks[0]["tags"], ["urgent"])
+
     def test_import_endpoint_and_duplicate_skip(self):
         csv_content = (
             "Title,taskId,List Name,Column Name,Content,Priority,Status,Due Date,Is All Day,Created Time,Completed Time,Tags,parentId\n"
@@ -1,9 +1,21 @@
 import json
 from datetime import date
+from io import StringIO
 
+from django.core.management import CommandError, call_command
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 
-from tasks.models import List, Project, ProjectLink, Section, Task, TimeEntry
+from tasks.models import (
+    List,
+    Project,
+    ProjectLink,
+    ProjectStats,
+    Section,
+    Task,
+    TimeEntry,
+)
 
 
 class ProjectAndTimesheetAPITests(TestCase):
@@ -63,6 +75,24 @@ class ProjectAndTimesheetAPITests(TestCase):
         self.assertEqual(delete_response.status_code, 204)
         self.assertFalse(Project.objects.filter(pk=project_id).exists())
 
+    def test_move_project_before_anchor(self):
+        first = Project.objects.create(name="First", position=1024)
+        second = Project.objects.create(name="Second", position=2048)
+        third = Project.objects.create(name="Third", position=3072)
+
+        response = self.client.patch(
+            f"/api/projects/{third.id}/move/",
+            data=json.dumps({"before_id": first.id}),
+            content_type="application/json",
+            **self._headers(),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        ids = list(Project.objects.order_by("position").values_list("id", flat=True))
+        self.assertEqual(ids, [third.id, first.id, second.id])
+        second.refresh_from_db()
+        self.assertEqual(second.position, 2048)
+
     def test_get_project_tasks_returns_incomplete_only(self):
         project = Project.objects.create(name="Proj", description="", position=10)
         task_list = List.objects.create(name="Work", emoji="", position=10, project=project)
@@ -192,6 +222,20 @@ class ProjectAndTimesheetAPITests(TestCase):
         project_data = resp.json()[0]
         self.assertEqual(project_data["links"], [])
 
+    def test_project_list_served_from_response_cache_until_a_write(self):
+        project = Project.objects.create(name="Proj", description="", position=10)
+        first = self.client.get("/api/projects/").json()
+
+        # Version lookup plus cache read; the annotated query never runs.
+        with self.assertNumQueries(2):
+            cached = self.client.get("/api/projects/")
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.json(), first)
+
+        Project.objects.filter(pk=project.pk).update(name="Renamed")
+        response = self.client.get("/api/projects/")
+        self.assertEqual(response.json()[0]["name"], "Renamed")
+
     def test_timesheet_get_post_delete(self):
         project = Project.objects.create(name="Proj", description="", position=10)
         task_list = List.objects.create(name="Work", emoji="", position=10, project=project)
@@ -331,3 +375,87 @@ class ProjectAndTimesheetAPITests(TestCase):
         self.assertIn("2026-02-17", payload["entries_by_date"])
         self.assertEqual(payload["entries_by_date"]["2026-02-17"][0]["id"], entry.id)
         self.assertIn("created_at", payload["entries_by_date"]["2026-02-17"][0])
+
+
+class ProjectStatsTests(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(name="Alpha")
+        self.other = Project.objects.create(name="Beta")
+        self.task_list = List.objects.create(name="Work", project=self.project)
+        self.section = Section.objects.create(list=self.task_list, name="Todo")
+
+    def _counts(self, project):
+        stats = ProjectStats.objects.get(project=project)
+        return (
+            stats.time_entry_count,
+            stats.list_count,
+            stats.task_count,
+            stats.completed_task_count,
+        )
+
+    def test_follows_task_and_time_entry_writes(self):
+        tasks = Task.objects.bulk_create(
+            Task(section=self.section, title=f"T{i}", path="") for i in range(4)
+        )
+        Task.objects.filter(pk__in=[t.pk for t in tasks[:3]]).update(is_completed=True)
+        tasks[2].uncomplete()
+        tasks[3].delete()
+        entry = TimeEntry.objects.create(project=self.project, date=date(2026, 2, 17))
+        self.assertEqual(self._counts(self.project), (1, 1, 3, 2))
+
+        TimeEntry.objects.filter(pk=entry.pk).update(project=self.other)
+        other_list = List.objects.create(name="Other", project=self.other)
+        other_section = Section.objects.create(list=other_list, name="Todo")
+        Task.objects.filter(pk=tasks[0].pk).update(section=other_section)
+        self.assertEqual(self._counts(self.project), (0, 1, 2, 1))
+        self.assertEqual(self._counts(self.other), (1, 1, 1, 1))
+
+    def test_moving_lists_and_sections_carries_their_tasks(self):
+        Task.objects.create(section=self.section, title="Done", is_completed=True)
+        Task.objects.create(section=self.section, title="Open")
+
+        self.task_list.project = self.other
+        self.task_list.save()
+        self.assertEqual(self._counts(self.project), (0, 0, 0, 0))
+        self.assertEqual(self._counts(self.other), (0, 1, 2, 1))
+
+        home = List.objects.create(name="Home", project=self.project)
+        Section.objects.filter(pk=self.section.pk).update(list=home)
+        self.assertEqual(self._counts(self.project), (0, 1, 2, 1))
+        self.assertEqual(self._counts(self.other), (0, 1, 0, 0))
+
+        home.delete()
+        self.assertEqual(self._counts(self.project), (0, 0, 0, 0))
+
+    def test_matches_rebuild_and_check_command(self):
+        Task.objects.create(section=self.section, title="Done", is_completed=True)
+        TimeEntry.objects.create(project=self.other, date=date(2026, 2, 17))
+        incremental = list(ProjectStats.objects.order_by("pk").values_list())
+        call_command("rebuild_rollups", "--check", stdout=StringIO())
+
+        ProjectStats.objects.filter(project=self.project).update(task_count=99)
+        with self.assertRaisesMessage(CommandError, f"projects: [{self.project.pk}]"):
+            call_command("rebuild_rollups", "--check", stdout=StringIO())
+
+        out = StringIO()
+        call_command("rebuild_rollups", stdout=out)
+        self.assertIn("statistics for 2 project(s)", out.getvalue())
+        self.assertEqual(list(ProjectStats.objects.order_by("pk").values_list()), incremental)
+
+    def test_rebuild_moves_project_list_off_the_cached_response(self):
+        client = Client()
+        ProjectStats.objects.filter(project=self.project).update(list_count=99)
+        stale = {p["id"]: p for p in client.get("/api/projects/").json()}
+        self.assertEqual(stale[self.project.pk]["linked_lists_count"], 99)
+
+        call_command("rebuild_rollups", stdout=StringIO())
+        fresh = {p["id"]: p for p in client.get("/api/projects/").json()}
+        self.assertEqual(fresh[self.project.pk]["linked_lists_count"], 1)
+
+    def test_project_list_queries_do_not_grow_with_tasks(self):
+        client = Client()
+        with CaptureQueriesContext(connection) as queries:
+            client.get("/api/projects/")
+        for query in queries:
+            self.assertNotIn('"tasks_task"', query["sql"])
+        self.assertEqual(client.get("/api/projects/").json()[0]["total_tasks"], 0)
@@ -4,6 +4,7 @@ from unittest.mock import patch
 
 from django.test import Client, TestCase
 
+from tasks.api.task_tree import _task_node
 from tasks.models import List, Section, Task
 
 
@@ -69,6 +70,52 @@ class TaskAPITests(TestCase):
         self.assertEqual(data["title"], "Parent")
         self.assertEqual(data["subtasks"][0]["id"], child.id)
 
+    def test_get_task_detail_query_count_independent_of_depth(self):
+        root = Task.objects.create(section=self.section_a, title="Root", position=10)
+        parent = root
+        for depth in range(6):
+            parent = Task.objects.create(section=self.section_a, parent=parent, title=f"Depth {depth}", position=10)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/tasks/{root.id}/")
+
+        node = response.json()
+        for _ in range(6):
+            node = node["subtasks"][0]
+        self.assertEqual(node["id"], parent.id)
+
+    def test_get_task_detail_loads_only_its_subtree(self):
+        parent = Task.objects.create(section=self.section_a, title="Parent", position=10)
+        Task.objects.create(section=self.section_a, parent=parent, title="Child", position=10)
+        sibling = Task.objects.create(section=self.section_a, title="Sibling", position=20)
+        Task.objects.create(section=self.section_a, parent=sibling, title="Nephew", position=10)
+
+        with patch("tasks.api.task_tree._task_node", wraps=_task_node) as task_node:
+            response = self.client.get(f"/api/tasks/{parent.id}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [call.args[0].title for call in task_node.call_args_list], ["Parent", "Child"]
+        )
+
+    def test_move_to_another_list_respects_its_pin_limit(self):
+        list_b = List.objects.create(name="B", emoji="", position=20)
+        section_b = Section.objects.create(list=list_b, name="Todo", emoji="", position=10)
+        for i in range(3):
+            Task.objects.create(section=section_b, title=f"Pinned {i}", position=i, is_pinned=True)
+        task = Task.objects.create(section=self.section_a, title="Pinned", position=10, is_pinned=True)
+
+        response = self.client.patch(
+            f"/api/tasks/{task.id}/move/",
+            data=json.dumps({"list_id": list_b.id}),
+            content_type="application/json",
+            **self._headers(),
+        )
+
+        self.assertEqual(response.status_code, 409)
+        task.refresh_from_db()
+        self.assertEqual(task.section_id, self.section_a.id)
+
     def test_update_task_fields(self):
         task = Task.objects.create(section=self.section_a, title="Old", position=10)
 
@@ -178,6 +225,89 @@ class TaskAPITests(TestCase):
         task.refresh_from_db()
         self.assertEqual(task.section_id, section_c.id)
 
+    def test_move_task_between_anchors_writes_only_moved_row(self):
+        one = Task.objects.create(section=self.section_a, title="1", position=1024)
+        two = Task.objects.create(section=self.section_a, title="2", position=2048)
+        three = Task.objects.create(section=self.section_a, title="3", position=3072)
+
+        response = self.client.patch(
+            f"/api/tasks/{three.id}/move/",
+            data=json.dumps({"after_id": one.id, "before_id": two.id}),
+            content_type="application/json",
+            **self._headers(),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        positions = dict(Task.objects.values_list("id", "position"))
+        self.assertEqual(positions[one.id], 1024)
+        self.assertEqual(positions[two.id], 2048)
+        self.assertEqual(positions[three.id], 1536)
+
+    def test_move_task_rebalances_when_gap_exhausted(self):
+        one = Task.objects.create(section=self.section_a, title="1", position=10)
+        two = Task.objects.create(section=self.section_a, title="2", position=11)
+        three = Task.objects.create(section=self.section_a, title="3", position=12)
+
+        response = self.client.patch(
+            f"/api/tasks/{three.id}/move/",
+            data=json.dumps({"before_id": two.id}),
+            content_type="application/json",
+            **self._headers(),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        ids = list(Task.objects.filter(section=self.section_a).order_by("position").values_list("id", flat=True))
+        self.assertEqual(ids, [one.id, three.id, two.id])
+
+    def test_move_task_rejects_anchor_outside_siblings(self):
+        task = Task.objects.create(section=self.section_a, title="Task", position=10)
+        parent = Task.objects.create(section=self.section_a, title="Parent", position=20)
+        child = Task.objects.create(section=self.section_a, parent=parent, title="Child", position=10)
+
+        response = self.client.patch(
+            f"/api/tasks/{task.id}/move/",
+            data=json.dumps({"after_id": child.id}),
+            content_type="application/json",
+            **self._headers(),
+        )
+
+        self.assertEqual(response.status_code, 422)
+
+    def test_move_task_rejects_inverted_or_identical_anchors(self):
+        one = Task.objects.create(section=self.section_a, title="1", position=1024)
+        two = Task.objects.create(section=self.section_a, title="2", position=2048)
+        three = Task.objects.create(section=self.section_a, title="3", position=3072)
+
+        for anchors in ({"after_id": two.id, "before_id": one.id}, {"after_id": one.id, "before_id": one.id}):
+            response = self.client.patch(
+                f"/api/tasks/{three.id}/move/",
+                data=json.dumps(anchors),
+                content_type="application/json",
+                **self._headers(),
+            )
+            self.assertEqual(response.status_code, 422)
+        three.refresh_from_db()
+        self.assertEqual(three.position, 3072)
+
+    def test_move_task_next_to_anchor_tied_with_a_sibling(self):
+        # Recurring copies keep their original's position, so ties are common.
+        one = Task.objects.create(section=self.section_a, title="1", position=1024)
+        two = Task.objects.create(section=self.section_a, title="2", position=1024)
+        three = Task.objects.create(section=self.section_a, title="3", position=2048)
+
+        for anchors in ({"after_id": one.id}, {"before_id": two.id}):
+            response = self.client.patch(
+                f"/api/tasks/{three.id}/move/",
+                data=json.dumps(anchors),
+                content_type="application/json",
+                **self._headers(),
+            )
+            self.assertEqual(response.status_code, 200)
+            order = Task.objects.filter(section=self.section_a).order_by("position", "pk")
+            self.assertEqual([task.title for task in order], ["1", "3", "2"])
+            Task.objects.filter(pk=three.pk).update(position=2048)
+            Task.objects.filter(pk__in=[one.pk, two.pk]).update(position=1024)
+
     def test_pin_toggle_and_limit(self):
         one = Task.objects.create(section=self.section_a, title="1", position=10)
         two = Task.objects.create(section=self.section_a, title="2", position=20)
@@ -1,4 +1,4 @@
-from datetime import date, time
+from datetime import date, time, timedelta
 
 from django.test import Client, TestCase
 
@@ -119,3 +119,35 @@ class UpcomingAPITests(TestCase):
         data = response.json()
         self.assertEqual(data[0]["title"], "Has time")
         self.assertEqual(data[1]["title"], "No time")
+
+    def test_until_projects_recurring_occurrences(self):
+        today = date.today()
+        Task.objects.create(
+            section=self.section_a, title="Standup", position=10,
+            due_date=today, recurrence_type=Task.RECURRENCE_DAILY,
+        )
+        Task.objects.create(
+            section=self.section_b, title="Once", position=10,
+            due_date=today + timedelta(days=1),
+        )
+
+        data = self.client.get(
+            "/api/upcoming/", {"until": (today + timedelta(days=2)).isoformat()}
+        ).json()
+
+        self.assertEqual(
+            [(row["title"], row["due_date"], row["is_projected"]) for row in data],
+            [
+                ("Standup", today.isoformat(), False),
+                ("Standup", (today + timedelta(days=1)).isoformat(), True),
+                ("Once", (today + timedelta(days=1)).isoformat(), False),
+                ("Standup", (today + timedelta(days=2)).isoformat(), True),
+            ],
+        )
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_until_must_be_within_a_year(self):
+        response = self.client.get(
+            "/api/upcoming/", {"until": (date.today() + timedelta(days=400)).isoformat()}
+        )
+        self.assertEqual(response.status_code, 400)
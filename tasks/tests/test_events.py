@@ -0,0 +1,49 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+
+from network.models import Person
+from tasks.models import List, Section, Task
+from tasks.views.events import parse_topics, pending_events
+
+
+class EventStreamTests(TestCase):
+    def setUp(self):
+        self.home = List.objects.create(name="Home", emoji="", position=10)
+        self.work = List.objects.create(name="Work", emoji="", position=20)
+        self.home_section = Section.objects.create(list=self.home, name="", position=10)
+        self.work_section = Section.objects.create(list=self.work, name="", position=10)
+        self.cursor = pending_events(0, set())[1]
+
+    def _events(self, topics):
+        frames, _cursor = pending_events(self.cursor, parse_topics(topics))
+        return [json.loads(frame.split("data: ", 1)[1]) for frame in frames]
+
+    def test_list_topic_covers_its_sections_and_tasks(self):
+        home_task = Task.objects.create(section=self.home_section, title="Laundry", position=10)
+        Task.objects.create(section=self.work_section, title="Report", position=10)
+        person = Person.objects.create(first_name="Ada", last_name="Lovelace")
+
+        self.assertEqual(
+            self._events(f"list:{self.home.id}"),
+            [{"entity_type": "task", "id": home_task.id, "action": "upsert"}],
+        )
+        self.assertEqual([e["id"] for e in self._events(f"person:{person.id}")], [person.id])
+        self.assertEqual(len(self._events("")), 3)
+
+    async def test_stream_emits_committed_changes(self):
+        task = await Task.objects.acreate(section=self.home_section, title="Laundry", position=10)
+
+        response = await self.async_client.get(f"/api/events/?since={self.cursor}&topics=task")
+        chunks = aiter(response.streaming_content)
+        frames = [await anext(chunks), await anext(chunks)]
+        await sync_to_async(response.close)()
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(frames[0].startswith(b"retry:"))
+        self.assertIn(f'"id": {task.id}'.encode(), frames[1])
+
+    def test_wsgi_requests_are_told_to_poll(self):
+        response = self.client.get("/api/events/")
+        self.assertEqual(response.status_code, 501)
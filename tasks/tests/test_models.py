@@ -274,6 +274,56 @@ class TaskModelTests(ModelTestBase):
         self.assertEqual(child_row["depth"], "1")
 
 
+class TaskHierarchyTests(ModelTestBase):
+    def _chain(self, depth):
+        parent = self.task
+        chain = []
+        for i in range(depth):
+            parent = Task.objects.create(
+                section=self.section, title=f"Level {i}", parent=parent, position=10
+            )
+            chain.append(parent)
+        return chain
+
+    def test_path_records_ancestors(self):
+        child, grandchild = self._chain(2)
+        self.assertEqual(self.task.path, "")
+        self.assertEqual(child.path, f"{self.task.id}/")
+        self.assertEqual(grandchild.path, f"{self.task.id}/{child.id}/")
+
+    def test_descendants_is_single_query(self):
+        chain = self._chain(5)
+        sibling = Task.objects.create(section=self.section, title="Sibling", position=20)
+        with self.assertNumQueries(1):
+            ids = set(self.task.descendants().values_list("id", flat=True))
+        self.assertEqual(ids, {t.id for t in chain})
+        self.assertNotIn(sibling.id, ids)
+
+    def test_reparent_rewrites_descendant_paths(self):
+        child, grandchild = self._chain(2)
+        other = Task.objects.create(section=self.section, title="Other", position=20)
+
+        child.parent = other
+        child.save()
+
+        grandchild.refresh_from_db()
+        self.assertEqual(grandchild.path, f"{other.id}/{child.id}/")
+        self.assertEqual(list(self.task.descendants()), [])
+        self.assertEqual(set(other.descendants()), {child, grandchild})
+
+    def test_nesting_under_descendant_rejected(self):
+        child, grandchild = self._chain(2)
+        self.task.parent = grandchild
+        with self.assertRaises(ValueError):
+            self.task.save()
+
+    def test_complete_uses_set_based_update(self):
+        self._chain(8)
+        with self.assertNumQueries(6):
+            self.task.complete()
+        self.assertFalse(self.task.descendants().filter(is_completed=False).exists())
+
+
 class ProjectModelTests(TestCase):
     def test_project_create(self):
         """Project can be created with name and description."""
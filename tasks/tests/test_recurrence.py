@@ -1,13 +1,22 @@
-from datetime import date
+from datetime import date, timedelta
+from io import StringIO
 from unittest.mock import patch
 
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
+from tasks.models import List, Section, Tag, Task
 from tasks.services.recurrence import (
+    Recurrence,
     RecurrenceValidationError,
+    compile_recurrence,
     compute_next_due_date,
+    project_occurrences,
     validate_recurrence_rule,
 )
+from tasks.services.recurring import catch_up_recurring_tasks
 
 
 class ComputeNextDueDateTests(TestCase):
@@ -77,6 +86,82 @@ class ComputeNextDueDateTests(TestCase):
         result = compute_next_due_date("custom_dates", rule, date(2026, 6, 15))
         self.assertEqual(result, date(2027, 3, 15))
 
+    def test_recurrence_without_advance_cannot_be_created(self):
+        class NextOnly(Recurrence):
+            def next_after(self, day):
+                return day + timedelta(days=1)
+
+        with self.assertRaises(TypeError):
+            NextOnly()
+
+
+class CatchUpRecurringTests(TestCase):
+    def setUp(self):
+        self.today = date.today()
+        task_list = List.objects.create(name="Chores", position=10)
+        self.section = Section.objects.create(list=task_list, name="Home", position=10)
+        self.tag = Tag.objects.create(name="home")
+
+    def _task(self, title, days_ago, recurrence_type=Task.RECURRENCE_DAILY, **kwargs):
+        task = Task.objects.create(
+            section=self.section,
+            title=title,
+            due_date=self.today - timedelta(days=days_ago),
+            recurrence_type=recurrence_type,
+            **kwargs,
+        )
+        task.tags.add(self.tag)
+        return task
+
+    def test_advances_overdue_tasks_in_place(self):
+        daily = self._task("Dishes", 900)
+        weekly = self._task(
+            "Bins", 30, Task.RECURRENCE_WEEKLY, recurrence_rule={"days": [self.today.weekday()]}
+        )
+        due_today = self._task("Plants", 0)
+        plain = self._task("Once", 5, Task.RECURRENCE_NONE)
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = catch_up_recurring_tasks()
+
+        self.assertEqual(stats, {"overdue": 2, "advanced": 2, "created": 0})
+        self.assertLess(len(queries), 10)
+        self.assertEqual(Task.objects.count(), 4)
+        for task, expected in [
+            (daily, self.today + timedelta(days=1)),
+            (weekly, self.today + timedelta(days=7)),
+            (due_today, self.today),
+            (plain, self.today - timedelta(days=5)),
+        ]:
+            task.refresh_from_db()
+            self.assertEqual(task.due_date, expected)
+            self.assertFalse(task.is_completed)
+
+    def test_regenerate_completes_and_creates_next_occurrences(self):
+        parent = self._task("Weekly review", 3)
+        child = Task.objects.create(section=self.section, title="Inbox zero", parent=parent)
+        nested = self._task("Nested", 2, parent=parent)
+
+        stats = catch_up_recurring_tasks(regenerate=True)
+
+        self.assertEqual(stats, {"overdue": 2, "advanced": 0, "created": 2})
+        for task in (parent, child, nested):
+            task.refresh_from_db()
+            self.assertTrue(task.is_completed)
+        next_parent = Task.objects.get(title="Weekly review", is_completed=False)
+        next_nested = Task.objects.get(title="Nested", is_completed=False)
+        self.assertEqual(next_parent.due_date, self.today + timedelta(days=1))
+        self.assertIsNone(next_parent.parent)
+        self.assertEqual(next_nested.parent, parent)
+        self.assertEqual(next_nested.path, f"{parent.pk}/")
+        self.assertEqual(list(next_nested.tags.values_list("name", flat=True)), ["home"])
+
+    def test_command_reports_counts(self):
+        self._task("Dishes", 2)
+        out = StringIO()
+        call_command("catch_up_recurring", stdout=out)
+        self.assertIn("Advanced 1 overdue recurring task(s).", out.getvalue())
+
 
 class ValidateRecurrenceRuleTests(TestCase):
     def test_none_always_valid(self):
@@ -0,0 +1,76 @@
+"""Conditional GET and response caching for read endpoints, keyed on TableVersion.
+
+An endpoint declares the models its payload is built from; its ETag hashes
+their table versions with the request path and query string. A matching
+If-None-Match is answered with 304 after a single lookup query, before the
+view runs any of its own queries.
+
+With `cache=True` the rendered body is also stored in the shared "responses"
+cache under that ETag, so other clients and other workers skip the ORM and
+the serializer until one of the tables changes. Writes never delete entries:
+bumping a version moves readers to a new key and the old entry ages out.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from ninja.decorators import decorate_view
+
+from tasks.models import TableVersion
+
+RESPONSE_CACHE = "responses"
+
+
+def _tables(models):
+    return sorted({model._meta.db_table for model in models})
+
+
+def _cached(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        cache = caches[RESPONSE_CACHE]
+        key = f"response:{request._table_etag}"
+        hit = cache.get(key)
+        if hit is not None:
+            content, content_type = hit
+            return HttpResponse(content, content_type=content_type)
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            cache.set(key, (response.content, response["Content-Type"]))
+        return response
+
+    return wrapper
+
+
+def conditional_on(*models, extra=None, cache=False):
+    """Decorate a Ninja operation so it serves strong ETags and 304s.
+
+    `models` may include auto-created m2m through models. `extra(request,
+    **kwargs)` returns anything else the payload depends on, such as the
+    current date. `cache=True` also serves full bodies from the response
+    cache; only use it when the body depends on nothing but those tables,
+    `extra` and the URL, and the view sets no headers of its own.
+    """
+    tables = _tables(models)
+
+    def etag(request, *args, **kwargs):
+        versions = TableVersion.current(tables)
+        parts = [request.path, request.META.get("QUERY_STRING", "")]
+        parts += [f"{table}={versions.get(table, 0)}" for table in tables]
+        if extra is not None:
+            parts.append(str(extra(request, **kwargs)))
+        request._table_etag = hashlib.sha1("|".join(parts).encode()).hexdigest()
+        return request._table_etag
+
+    decorators = [_cached] if cache else []
+    # no-cache makes browsers revalidate every time instead of guessing a
+    # freshness lifetime, so the HTTP cache handles If-None-Match for clients.
+    decorators += [
+        cache_control(private=True, no_cache=True),
+        condition(etag_func=etag),
+    ]
+    return decorate_view(*decorators)
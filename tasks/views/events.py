@@ -0,0 +1,131 @@
+"""Server-Sent Events stream of committed entity changes.
+
+Every worker process tails the ChangeLogEntry table, so an event reaches
+all subscribers no matter which worker handled the write, and only after
+the writing transaction has committed.
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+
+from tasks.models import ChangeLogEntry, Section, Task
+
+POLL_INTERVAL = 1.0
+HEARTBEAT_INTERVAL = 15.0
+BATCH_SIZE = 500
+
+# Entity types scoped to a task list, for "list:<id>" subscriptions.
+_LIST_SCOPED = {"list", "section", "task"}
+
+
+def parse_topics(raw):
+    """Parse "task,list:3,person:7" into {(entity_type, id or None)}.
+
+    "list:<id>" also covers that list's sections and tasks. No topics
+    means every change.
+    """
+    topics = set()
+    for part in (raw or "").split(","):
+        entity_type, _, entity_id = part.strip().partition(":")
+        if not entity_type:
+            continue
+        topics.add((entity_type, int(entity_id) if entity_id.isdigit() else None))
+    return topics
+
+
+def _list_ids(rows):
+    """Map list-scoped upserts in `rows` to the id of the list they belong to now."""
+    section_ids = {row[2] for row in rows if row[1] == "section" and row[3] == ChangeLogEntry.ACTION_UPSERT}
+    task_ids = {row[2] for row in rows if row[1] == "task" and row[3] == ChangeLogEntry.ACTION_UPSERT}
+    scope = {("list", row[2]): row[2] for row in rows if row[1] == "list"}
+    for section_id, list_id in Section.objects.filter(pk__in=section_ids).values_list("id", "list_id"):
+        scope[("section", section_id)] = list_id
+    for task_id, list_id in Task.objects.filter(pk__in=task_ids).values_list("id", "section__list_id"):
+        scope[("task", task_id)] = list_id
+    return scope
+
+
+def _matches(topics, entity_type, entity_id, list_id):
+    if not topics:
+        return True
+    for topic_type, topic_id in topics:
+        if topic_type == entity_type and topic_id in (None, entity_id):
+            return True
+        # A deleted section or task no longer knows its list, so its delete
+        # goes to every list subscriber; ids a client does not hold are no-ops.
+        if topic_type == "list" and topic_id is not None and entity_type in _LIST_SCOPED:
+            if list_id in (None, topic_id):
+                return True
+    return False
+
+
+def pending_events(cursor, topics):
+    """Return (frames, new_cursor) for changes committed after `cursor`."""
+    rows = list(
+        ChangeLogEntry.objects.filter(id__gt=cursor)
+        .order_by("id")
+        .values_list("id", "entity_type", "entity_id", "action")[:BATCH_SIZE]
+    )
+    if not rows:
+        return [], cursor
+    needs_scope = any(topic_type == "list" for topic_type, _ in topics)
+    scope = _list_ids(rows) if needs_scope else {}
+    frames = []
+    for change_id, entity_type, entity_id, action in rows:
+        if _matches(topics, entity_type, entity_id, scope.get((entity_type, entity_id))):
+            data = json.dumps({"entity_type": entity_type, "id": entity_id, "action": action})
+            frames.append(f"id: {change_id}\nevent: change\ndata: {data}\n\n")
+    return frames, rows[-1][0]
+
+
+def _latest_cursor():
+    return ChangeLogEntry.objects.order_by("-id").values_list("id", flat=True).first() or 0
+
+
+async def _event_stream(cursor, topics):
+    yield f"retry: {int(POLL_INTERVAL * 3000)}\n\n"
+    idle = 0.0
+    while True:
+        frames, cursor = await sync_to_async(pending_events)(cursor, topics)
+        for frame in frames:
+            yield frame
+        if frames:
+            idle = 0.0
+        elif idle >= HEARTBEAT_INTERVAL:
+            yield ": keep-alive\n\n"
+            idle = 0.0
+        await asyncio.sleep(POLL_INTERVAL)
+        idle += POLL_INTERVAL
+
+
+async def stream_events(request):
+    """GET /api/events/?topics=list:3,person — stream change events as SSE.
+
+    Resumes after the Last-Event-ID header (sent by EventSource on
+    reconnect) or the `since` parameter; otherwise starts at the newest
+    change. Long-lived streams need the ASGI entry point (nexus.asgi).
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(
+            "Live updates need the ASGI server; poll /api/changes/ instead.",
+            status=501,
+            content_type="text/plain",
+        )
+    raw_cursor = request.headers.get("Last-Event-ID") or request.GET.get("since")
+    if raw_cursor is not None and raw_cursor.isdigit():
+        cursor = int(raw_cursor)
+    else:
+        cursor = await sync_to_async(_latest_cursor)()
+
+    response = StreamingHttpResponse(
+        _event_stream(cursor, parse_topics(request.GET.get("topics"))),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -1,24 +1,57 @@
 import csv
-import io
 import json
+from collections import defaultdict
 
-from django.http import HttpResponse, HttpResponseBadRequest
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
 
 from tasks.models import List, Task
 
-
-def _get_task_depth(task):
-    """Calculate nesting depth of a task."""
-    depth = 0
-    current = task
-    while current.parent is not None:
-        depth += 1
-        current = current.parent
-    return depth
-
-
-def _build_task_tree(task):
-    """Recursively build a dict for a task and its subtasks."""
+CSV_FIELDNAMES = [
+    "list", "section", "task", "parent_task", "depth",
+    "notes", "due_date", "tags", "is_completed", "recurrence",
+]
+
+
+class _ListData:
+    """A list's sections, tasks and tag names, loaded in three queries.
+
+    Subtasks are grouped by parent in memory, so walking the tree, its
+    depths and its parent titles needs no further queries.
+    """
+
+    def __init__(self, task_list):
+        self.list = task_list
+        self.sections = list(task_list.sections.order_by("position", "pk"))
+        self.roots = defaultdict(list)  # section id -> top-level tasks
+        self.subtasks = defaultdict(list)  # task id -> child tasks
+        tasks = Task.objects.filter(section__list=task_list).order_by("position", "pk")
+        for task in tasks:
+            if task.parent_id is None:
+                self.roots[task.section_id].append(task)
+            else:
+                self.subtasks[task.parent_id].append(task)
+        self.tags = defaultdict(list)  # task id -> tag names
+        links = (
+            Task.tags.through.objects.filter(task__section__list=task_list)
+            .order_by("tag_id")
+            .values_list("task_id", "tag__name")
+        )
+        for task_id, name in links:
+            self.tags[task_id].append(name)
+
+    def walk(self, section):
+        """Yield (task, depth, parent) for a section's tasks, depth first."""
+        stack = [(task, 0, None) for task in reversed(self.roots[section.pk])]
+        while stack:
+            task, depth, parent = stack.pop()
+            yield task, depth, parent
+            stack.extend(
+                (sub, depth + 1, task) for sub in reversed(self.subtasks[task.pk])
+            )
+
+
+def _build_task_tree(data, task):
+    """Build a dict for a task and its subtasks."""
     return {
         "title": task.title,
         "notes": task.notes,
@@ -26,18 +59,15 @@ def _build_task_tree(task):
         "is_completed": task.is_completed,
         "completed_at": str(task.completed_at) if task.completed_at else None,
         "position": task.position,
-        "tags": list(task.tags.values_list("name", flat=True)),
+        "tags": data.tags[task.pk],
         "recurrence_type": task.recurrence_type,
         "recurrence_rule": task.recurrence_rule,
-        "subtasks": [
-            _build_task_tree(sub)
-            for sub in task.subtasks.all().order_by("position")
-        ],
+        "subtasks": [_build_task_tree(data, sub) for sub in data.subtasks[task.pk]],
     }
 
 
-def serialize_list_to_json(task_list):
-    """Build nested dict: list > sections > tasks > subtasks."""
+def _list_to_json(data):
+    task_list = data.list
     return {
         "name": task_list.name,
         "emoji": task_list.emoji,
@@ -48,104 +78,86 @@ def serialize_list_to_json(task_list):
                 "emoji": section.emoji,
                 "position": section.position,
                 "tasks": [
-                    _build_task_tree(task)
-                    for task in section.tasks.filter(parent=None).order_by("position")
+                    _build_task_tree(data, task) for task in data.roots[section.pk]
                 ],
             }
-            for section in task_list.sections.all().order_by("position")
+            for section in data.sections
         ],
     }
 
 
-def _flatten_tasks(task_list, section, task, rows):
-    """Recursively flatten a task and its subtasks into CSV rows."""
-    depth = _get_task_depth(task)
-    recurrence = ""
-    if task.recurrence_type and task.recurrence_type != "none":
-        recurrence = task.recurrence_type
-    rows.append({
-        "list": task_list.name,
-        "section": section.name,
-        "task": task.title,
-        "parent_task": task.parent.title if task.parent else "",
-        "depth": str(depth),
-        "notes": task.notes,
-        "due_date": str(task.due_date) if task.due_date else "",
-        "tags": ",".join(task.tags.values_list("name", flat=True)),
-        "is_completed": str(task.is_completed),
-        "recurrence": recurrence,
-    })
-    for sub in task.subtasks.all().order_by("position"):
-        _flatten_tasks(task_list, section, sub, rows)
+def serialize_list_to_json(task_list):
+    """Build nested dict: list > sections > tasks > subtasks."""
+    return _list_to_json(_ListData(task_list))
+
+
+def _csv_rows(data):
+    """Yield one CSV row dict per task, parents before their subtasks."""
+    for section in data.sections:
+        for task, depth, parent in data.walk(section):
+            recurrence = ""
+            if task.recurrence_type and task.recurrence_type != "none":
+                recurrence = task.recurrence_type
+            yield {
+                "list": data.list.name,
+                "section": section.name,
+                "task": task.title,
+                "parent_task": parent.title if parent else "",
+                "depth": str(depth),
+                "notes": task.notes,
+                "due_date": str(task.due_date) if task.due_date else "",
+                "tags": ",".join(data.tags[task.pk]),
+                "is_completed": str(task.is_completed),
+                "recurrence": recurrence,
+            }
 
 
-def serialize_list_to_csv(task_list):
-    """Flatten tasks to rows with specified columns."""
-    output = io.StringIO()
-    fieldnames = [
-        "list", "section", "task", "parent_task", "depth",
-        "notes", "due_date", "tags", "is_completed", "recurrence",
-    ]
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
+class _Echo:
+    """File-like object whose write() returns the line, for streaming csv."""
 
-    for section in task_list.sections.all().order_by("position"):
-        for task in section.tasks.filter(parent=None).order_by("position"):
-            _flatten_tasks(task_list, section, task, [])
+    def write(self, value):
+        return value
 
-    # Rebuild properly with all rows
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
 
-    rows = []
-    for section in task_list.sections.all().order_by("position"):
-        for task in section.tasks.filter(parent=None).order_by("position"):
-            _flatten_tasks(task_list, section, task, rows)
+def serialize_list_to_csv(task_list):
+    """Flatten tasks to rows with specified columns."""
+    writer = csv.DictWriter(_Echo(), fieldnames=CSV_FIELDNAMES)
+    lines = [writer.writeheader()]
+    lines.extend(writer.writerow(row) for row in _csv_rows(_ListData(task_list)))
+    return "".join(lines)
 
-    for row in rows:
-        writer.writerow(row)
 
-    return output.getvalue()
+def _list_to_markdown(data):
+    lines = [f"# {data.list.name}", ""]
 
+    for section in data.sections:
+        lines.append(f"## {section.name}")
+        lines.append("")
 
-def _render_task_markdown(task, depth=0):
-    """Render a task as markdown with indentation."""
-    indent = "  " * depth
-    checkbox = "[x]" if task.is_completed else "[ ]"
-    lines = [f"{indent}- {checkbox} {task.title}"]
+        for task, depth, _parent in data.walk(section):
+            indent = "  " * depth
+            checkbox = "[x]" if task.is_completed else "[ ]"
+            lines.append(f"{indent}- {checkbox} {task.title}")
 
-    if task.notes:
-        for line in task.notes.split("\n"):
-            lines.append(f"{indent}  {line}")
+            if task.notes:
+                for line in task.notes.split("\n"):
+                    lines.append(f"{indent}  {line}")
 
-    if task.due_date:
-        lines.append(f"{indent}  Due: {task.due_date}")
+            if task.due_date:
+                lines.append(f"{indent}  Due: {task.due_date}")
 
-    tag_names = list(task.tags.values_list("name", flat=True))
-    if tag_names:
-        lines.append(f"{indent}  Tags: {', '.join(tag_names)}")
+            tag_names = data.tags[task.pk]
+            if tag_names:
+                lines.append(f"{indent}  Tags: {', '.join(tag_names)}")
 
-    for sub in task.subtasks.all().order_by("position"):
-        lines.extend(_render_task_markdown(sub, depth + 1))
+        lines.append("")
 
-    return lines
+    return "\n".join(lines)
 
 
 def serialize_list_to_markdown(task_list):
     """Render list as markdown document."""
-    lines = [f"# {task_list.name}", ""]
-
-    for section in task_list.sections.all().order_by("position"):
-        lines.append(f"## {section.name}")
-        lines.append("")
-
-        for task in section.tasks.filter(parent=None).order_by("position"):
-            lines.extend(_render_task_markdown(task))
-
-        lines.append("")
-
-    return "\n".join(lines)
+    return _list_to_markdown(_ListData(task_list))
 
 
 def export_list_view(request, list_id, fmt):
@@ -165,43 +177,53 @@ def export_all_view(request, fmt):
     return _export_response("all-lists", fmt, lists)
 
 
+def _iter_json(lists):
+    if len(lists) == 1:
+        yield json.dumps(_list_to_json(_ListData(lists[0])), indent=2)
+        return
+    if not lists:
+        yield "[]"
+        return
+    # Same text as json.dumps(all_lists, indent=2), one list at a time.
+    for i, task_list in enumerate(lists):
+        document = json.dumps(_list_to_json(_ListData(task_list)), indent=2)
+        yield ("[\n  " if i == 0 else ",\n  ") + document.replace("\n", "\n  ")
+    yield "\n]"
+
+
+def _iter_csv(lists):
+    writer = csv.DictWriter(_Echo(), fieldnames=CSV_FIELDNAMES)
+    yield writer.writeheader()
+    for task_list in lists:
+        for row in _csv_rows(_ListData(task_list)):
+            yield writer.writerow(row)
+
+
+def _iter_markdown(lists):
+    for i, task_list in enumerate(lists):
+        yield ("\n" if i else "") + _list_to_markdown(_ListData(task_list))
+
+
+EXPORTERS = {
+    "json": (_iter_json, "application/json"),
+    "csv": (_iter_csv, "text/csv"),
+    "md": (_iter_markdown, "text/markdown"),
+}
+
+
 def _export_response(filename_base, fmt, lists):
-    """Build the HTTP response for an export."""
-    if fmt == "json":
-        if len(lists) == 1:
-            data = serialize_list_to_json(lists[0])
-        else:
-            data = [serialize_list_to_json(lst) for lst in lists]
-        content = json.dumps(data, indent=2)
-        content_type = "application/json"
-        ext = "json"
-    elif fmt == "csv":
-        parts = []
-        for lst in lists:
-            parts.append(serialize_list_to_csv(lst))
-        content = "".join(parts)
-        # If multiple lists concatenated, only keep headers from first
-        if len(parts) > 1:
-            lines = []
-            header_seen = False
-            for part in parts:
-                for i, line in enumerate(part.split("\n")):
-                    if i == 0 and header_seen:
-                        continue
-                    lines.append(line)
-                header_seen = True
-            content = "\n".join(lines)
-        content_type = "text/csv"
-        ext = "csv"
-    elif fmt == "md":
-        parts = [serialize_list_to_markdown(lst) for lst in lists]
-        content = "\n".join(parts)
-        content_type = "text/markdown"
-        ext = "md"
-    else:
+    """Build the HTTP response for an export, streamed one list at a time.
+
+    Each list is loaded with one flat fetch of its sections, tasks and tag
+    names, so the number of queries grows with lists, not tasks.
+    """
+    if fmt not in EXPORTERS:
         return HttpResponseBadRequest(f"Unsupported export format: {fmt}")
+    iter_export, content_type = EXPORTERS[fmt]
 
-    response = HttpResponse(content, content_type=content_type)
+    response = StreamingHttpResponse(
+        iter_export(list(lists)), content_type=content_type
+    )
     safe_name = filename_base.replace(" ", "-").lower()
-    response["Content-Disposition"] = f'attachment; filename="{safe_name}.{ext}"'
+    response["Content-Disposition"] = f'attachment; filename="{safe_name}.{fmt}"'
     return response
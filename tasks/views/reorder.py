@@ -1,8 +1,109 @@
-def reorder_siblings(instance, queryset, new_index):
-    """Move `instance` to `new_index` within `queryset` and renumber all with gap-based positions."""
-    siblings = list(queryset.exclude(pk=instance.pk).order_by("position"))
-    new_index = max(0, min(len(siblings), new_index))
-    siblings.insert(new_index, instance)
+from django.db.models import Max, Q
+
+from tasks.models import ChangeLogEntry
+
+# Spacing between neighbouring positions. A move takes the midpoint of its
+# neighbours, so each gap absorbs about log2(POSITION_GAP) moves into the
+# same slot before the siblings need respacing.
+POSITION_GAP = 1024
+
+
+class InvalidAnchorError(ValueError):
+    pass
+
+
+def _anchor_position(siblings, anchor_id):
+    position = siblings.filter(pk=anchor_id).values_list("position", flat=True).first()
+    if position is None:
+        raise InvalidAnchorError(f"Anchor {anchor_id} is not a sibling of the moved item.")
+    return position
+
+
+def _neighbour_position(siblings, anchor_id, position, after):
+    """Position of the sibling right after (or before) the anchor, or None.
+
+    Siblings are ordered by (position, pk), so a sibling tied with the anchor
+    can be its neighbour; the move then finds no gap and respaces first.
+    """
+    if after:
+        beyond = Q(position__gt=position) | Q(position=position, pk__gt=anchor_id)
+        order = ("position", "pk")
+    else:
+        beyond = Q(position__lt=position) | Q(position=position, pk__lt=anchor_id)
+        order = ("-position", "-pk")
+    return siblings.filter(beyond).order_by(*order).values_list("position", flat=True).first()
+
+
+def _bounds(siblings, after_id, before_id):
+    lower = upper = None
+    if after_id is not None:
+        lower = _anchor_position(siblings, after_id)
+    if before_id is not None:
+        upper = _anchor_position(siblings, before_id)
+    if after_id is not None and before_id is not None:
+        # Siblings are ordered by (position, pk); the anchors must be in order.
+        if after_id == before_id or (lower, after_id) > (upper, before_id):
+            raise InvalidAnchorError(
+                f"Anchor {after_id} must come before anchor {before_id}."
+            )
+    if after_id is not None and before_id is None:
+        upper = _neighbour_position(siblings, after_id, lower, after=True)
+    elif before_id is not None and after_id is None:
+        lower = _neighbour_position(siblings, before_id, upper, after=False)
+    elif after_id is None and before_id is None:
+        lower = siblings.aggregate(p=Max("position"))["p"]
+    return lower, upper
+
+
+def _midpoint(lower, upper):
+    if lower is None and upper is None:
+        return POSITION_GAP
+    if lower is None:
+        return upper - POSITION_GAP
+    if upper is None:
+        return lower + POSITION_GAP
+    if upper - lower < 2:
+        return None
+    return (lower + upper) // 2
+
+
+def rebalance_positions(queryset):
+    """Respace `queryset` at POSITION_GAP intervals, keeping the current order."""
+    siblings = list(queryset.order_by("position", "pk").only("pk", "position"))
     for i, obj in enumerate(siblings):
-        obj.position = (i + 1) * 10
-        obj.save(update_fields=["position"])
+        obj.position = (i + 1) * POSITION_GAP
+    queryset.model.objects.bulk_update(siblings, ["position"], batch_size=500)
+    ChangeLogEntry.record(queryset.model, [obj.pk for obj in siblings])
+
+
+def place_between(instance, queryset, after_id=None, before_id=None):
+    """Move `instance` between the `after_id` and `before_id` siblings.
+
+    Only `instance` is written, unless the gap between its new neighbours is
+    exhausted; the siblings are then respaced once before retrying.
+    With no anchors the instance moves to the end.
+    """
+    siblings = queryset.exclude(pk=instance.pk)
+    position = _midpoint(*_bounds(siblings, after_id, before_id))
+    if position is None:
+        rebalance_positions(siblings)
+        position = _midpoint(*_bounds(siblings, after_id, before_id))
+    instance.position = position
+    instance.save(update_fields=["position"])
+
+
+def reorder_siblings(instance, queryset, new_index):
+    """Move `instance` to `new_index` within `queryset`, writing only `instance`."""
+    sibling_ids = list(queryset.exclude(pk=instance.pk).order_by("position", "pk").values_list("pk", flat=True))
+    new_index = max(0, min(len(sibling_ids), new_index))
+    after_id = sibling_ids[new_index - 1] if new_index > 0 else None
+    before_id = sibling_ids[new_index] if new_index < len(sibling_ids) else None
+    place_between(instance, queryset, after_id=after_id, before_id=before_id)
+
+
+def move_to(instance, queryset, position=None, after_id=None, before_id=None):
+    """Apply a move given either sibling anchors or a target index."""
+    if after_id is not None or before_id is not None:
+        place_between(instance, queryset, after_id=after_id, before_id=before_id)
+    elif position is not None:
+        reorder_siblings(instance, queryset, position)